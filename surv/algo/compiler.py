@@ -0,0 +1,96 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+from surv.algo.constraints import EqConstraint, GtConstraint, LtConstraint
+from surv.algo.evaluator import Evaluator
+from surv.algo.result import Continue, Terminal, Unknown
+from surv.algo.session import Session
+from surv.algo.survey_tree import (
+    GREATER_THAN,
+    LESS_THAN,
+    ContinueNode,
+    SurveyNode,
+    SurveyQuestion,
+    SurveyTree,
+    TerminalNode,
+    UnknownNode,
+)
+from surv.dataset.dataset import Dataset
+from surv.dataset.feature import Feature
+from surv.dataset.feature_types import Categorical, Numeric
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Compiler:
+    """Survey decision tree compiler.
+
+    Walks every answer path of a survey up front so that respondents can be served from the compiled tree.
+
+    Attributes:
+        evaluator (Evaluator): Evaluator used to select the question at each node.
+        max_depth (Optional[int]): Maximum number of questions asked on any path.
+        information_gain_threshold (float): Questions with a lower information gain are not asked.
+    """
+
+    evaluator: Evaluator = field(default_factory=Evaluator)
+    max_depth: Optional[int] = None
+    information_gain_threshold: float = 0.0
+
+    def compile(self, dataset: Dataset) -> SurveyTree:
+        """Compile the survey decision tree for a dataset.
+
+        Args:
+            dataset (Dataset): Dataset to compile.
+
+        Returns:
+            SurveyTree: The compiled survey tree.
+        """
+        root = self._compile_node(Session(dataset), depth=0)
+        return SurveyTree(root=root, target_feature_name=dataset.feature_info.target_feature_name)
+
+    def _compile_node(self, session: Session, depth: int) -> SurveyNode:
+        max_depth = session.dataset.n_training_features
+        if self.max_depth is not None:
+            max_depth = min(max_depth, self.max_depth)
+        result = self.evaluator.evaluate_session(session).apply_stopping_rule(
+            depth, max_depth, self.information_gain_threshold
+        )
+        match result:
+            case Terminal(category=category):
+                return TerminalNode(category=category)
+            case Unknown():
+                return UnknownNode()
+            case Continue(feature=feature, information_gain=information_gain, threshold=threshold):
+                question = self._get_question(feature)
+                children = {}
+                if threshold is None:
+                    for category in question.categories:
+                        child_session = session.branch(EqConstraint(feature=feature, value=category))
+                        children[category] = self._compile_node(child_session, depth + 1)
+                else:
+                    less_than_session = session.branch(LtConstraint(feature=feature, value=threshold))
+                    children[LESS_THAN] = self._compile_node(less_than_session, depth + 1)
+                    greater_than_session = session.branch(GtConstraint(feature=feature, value=threshold))
+                    children[GREATER_THAN] = self._compile_node(greater_than_session, depth + 1)
+                return ContinueNode(
+                    question=question,
+                    information_gain=information_gain,
+                    children=children,
+                    threshold=threshold,
+                )
+            case _:
+                raise NotImplementedError
+
+    @staticmethod
+    def _get_question(feature: Feature) -> SurveyQuestion:
+        question = feature.metadata.question if feature.metadata is not None else None
+        match feature.type:
+            case Categorical(categories=categories):
+                return SurveyQuestion(feature_name=feature.name, question=question, categories=tuple(categories))
+            case Numeric():
+                return SurveyQuestion(feature_name=feature.name, question=question, categories=())
+            case _:
+                raise NotImplementedError
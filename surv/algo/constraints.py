@@ -1,27 +1,79 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
 
 from surv.dataset.feature import Feature
+from surv.dataset.feature_types import Categorical
 
 
-class Constraint(BaseModel):
-    """Constraint to split the data on."""
+@dataclass(frozen=True, slots=True)
+class Constraint:
+    """Constraint to split the data on.
+
+    Constraints are immutable and hashable, so sets of constraints can be compared and used as keys directly. The
+    feature is the dataset's own feature object, shared by reference rather than copied.
+
+    Attributes:
+        feature (Feature): Feature the constraint applies to.
+    """
 
     feature: Feature
 
 
+@dataclass(frozen=True, slots=True)
 class EqConstraint(Constraint):
-    """Equals constraint."""
+    """Equals constraint.
+
+    Attributes:
+        value (str): Value of the feature.
+    """
 
     value: str
 
 
+@dataclass(frozen=True, slots=True)
+class InConstraint(Constraint):
+    """In constraint, for answers that could be any of several values.
+
+    Attributes:
+        values (tuple[str, ...]): Values the feature could have, without duplicates and in category order, so that
+            the same answer always gives the same constraint.
+    """
+
+    values: tuple[str, ...]
+
+    def __post_init__(self) -> None:
+        """Put the values in a canonical order, categories first in their feature order and other values sorted."""
+        values = sorted(set(self.values))
+        if isinstance(self.feature.type, Categorical):
+            category_indices = {category: i for i, category in enumerate(self.feature.type.categories)}
+            values.sort(key=lambda value: category_indices.get(value, len(category_indices)))
+        object.__setattr__(self, "values", tuple(values))
+
+
+@dataclass(frozen=True, slots=True)
+class SkipConstraint(Constraint):
+    """Skip constraint.
+
+    The question was skipped, so the feature is not asked about again but no rows are filtered out.
+    """
+
+
+@dataclass(frozen=True, slots=True)
 class LtConstraint(Constraint):
-    """Less than constraint."""
+    """Less than constraint.
+
+    Attributes:
+        value (float): Threshold the feature is less than.
+    """
 
     value: float
 
 
+@dataclass(frozen=True, slots=True)
 class GtConstraint(Constraint):
-    """Greater than constraint."""
+    """Greater than constraint.
+
+    Attributes:
+        value (float): Threshold the feature is greater than.
+    """
 
     value: float
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from pydantic import TypeAdapter
+
+from surv.algo.constraints import Constraint
+from surv.algo.evaluator import Evaluator
+from surv.algo.result import Continue, Result, Terminal, Unknown
+from surv.algo.session import Session
+from surv.dataset.dataset import Dataset
+
+logger = logging.getLogger(__name__)
+
+RESULT_TYPES: dict[str, type[Result]] = {
+    "continue": Continue,
+    "terminal": Terminal,
+    "unknown": Unknown,
+}
+
+# Results are plain dataclasses, validated and serialized by pydantic only when they are read from or written to disk.
+RESULT_ADAPTERS: dict[str, TypeAdapter[Any]] = {
+    name: TypeAdapter(result_type) for name, result_type in RESULT_TYPES.items()
+}
+
+
+@dataclass
+class CacheStats:
+    """Evaluation cache statistics.
+
+    Attributes:
+        hits (int): Number of evaluations served from the cache.
+        misses (int): Number of evaluations that had to be computed.
+        evictions (int): Number of entries evicted from the in-memory cache.
+        disk_hits (int): Number of hits served from the on-disk store.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    disk_hits: int = 0
+
+
+@dataclass
+class EvaluationCache:
+    """Size bounded least recently used cache of evaluation results.
+
+    Results are keyed by the dataset fingerprint and the set of constraints, independent of the order in which the
+    constraints were collected. An optional on-disk store can be shared by several processes.
+
+    Attributes:
+        evaluator (Evaluator): Evaluator used on cache misses.
+        max_size (int): Maximum number of results kept in memory.
+        cache_dirpath (Optional[Path]): Directory of the on-disk store. Disabled if not set.
+        stats (CacheStats): Cache statistics.
+    """
+
+    evaluator: Evaluator = field(default_factory=Evaluator)
+    max_size: int = 1024
+    cache_dirpath: Optional[Path] = None
+    stats: CacheStats = field(default_factory=CacheStats)
+    _entries: OrderedDict[str, Result] = field(default_factory=OrderedDict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Create the on-disk store directory."""
+        if self.max_size < 1:
+            msg = "Evaluation cache size must be at least 1."
+            raise ValueError(msg)
+        if self.cache_dirpath is not None:
+            self.cache_dirpath.mkdir(parents=True, exist_ok=True)
+
+    def evaluate(self, dataset: Dataset, constraints: list[Constraint]) -> Result:
+        """Evaluate a dataset, reusing cached results for the same set of constraints.
+
+        Args:
+            dataset (Dataset): Dataset to evaluate.
+            constraints (list[Constraint]): Known constraints.
+        """
+        key = self.get_key(dataset, constraints)
+        result = self.get(key)
+        if result is None:
+            result = self.evaluator.evaluate(dataset, constraints)
+            self.put(key, result)
+        return result
+
+    def evaluate_session(self, session: Session) -> Result:
+        """Evaluate a survey session, reusing cached results for the same set of constraints.
+
+        Args:
+            session (Session): Survey session to evaluate.
+        """
+        key = self.get_key(session.dataset, session.constraints)
+        result = self.get(key)
+        if result is None:
+            result = self.evaluator.evaluate_session(session)
+            self.put(key, result)
+        return result
+
+    def get_key(self, dataset: Dataset, constraints: list[Constraint]) -> str:
+        """Get the canonical cache key for a dataset and a set of constraints.
+
+        The key also covers the evaluator settings that change results, so that differently configured evaluators
+        never share results, while evaluators that only differ in how results are computed, for example in their
+        executor or number of workers, do.
+
+        Args:
+            dataset (Dataset): Dataset to evaluate.
+            constraints (list[Constraint]): Known constraints.
+
+        Returns:
+            str: Cache key.
+        """
+        # Constraints are hashable, so duplicates collapse in a set, and their reprs name the constraint type, the
+        # feature and the values.
+        canonical_constraints = {repr(constraint) for constraint in set(constraints)}
+        digest = hashlib.sha256()
+        digest.update(dataset.fingerprint.encode())
+        digest.update(type(self.evaluator).__qualname__.encode())
+        digest.update(repr(self.evaluator.result_settings).encode())
+        for canonical_constraint in sorted(canonical_constraints):
+            digest.update(canonical_constraint.encode())
+        return digest.hexdigest()
+
+    def clear(self) -> None:
+        """Clear the in-memory cache and reset statistics."""
+        self._entries.clear()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        """Number of results in the in-memory cache."""
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Result]:
+        """Get a cached result.
+
+        Args:
+            key (str): Cache key from get_key.
+
+        Returns:
+            Optional[Result]: The cached result, or None on a cache miss.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return self._entries[key]
+
+        result = self._load(key)
+        if result is not None:
+            self.stats.hits += 1
+            self.stats.disk_hits += 1
+            self._insert(key, result)
+            return result
+
+        self.stats.misses += 1
+        return None
+
+    def put(self, key: str, result: Result) -> None:
+        """Add a result to the cache.
+
+        Args:
+            key (str): Cache key from get_key.
+            result (Result): Evaluation result.
+        """
+        self._insert(key, result)
+        self._store(key, result)
+
+    def _insert(self, key: str, result: Result) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            evicted_key, _ = self._entries.popitem(last=False)
+            logger.debug("Evicted evaluation result: %s", evicted_key)
+            self.stats.evictions += 1
+
+    def _load(self, key: str) -> Optional[Result]:
+        if self.cache_dirpath is None:
+            return None
+        filepath = self.cache_dirpath / f"{key}.json"
+        try:
+            with filepath.open("r") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return None
+        return RESULT_ADAPTERS[data["type"]].validate_python(data["result"])
+
+    def _store(self, key: str, result: Result) -> None:
+        if self.cache_dirpath is None:
+            return
+        result_type_names = {result_type: name for name, result_type in RESULT_TYPES.items()}
+        result_type_name = result_type_names[type(result)]
+        data = {"type": result_type_name, "result": RESULT_ADAPTERS[result_type_name].dump_python(result, mode="json")}
+
+        # Write to a temporary file first so that other processes never read a partially written result.
+        fd, tmp_filepath = tempfile.mkstemp(dir=self.cache_dirpath, suffix=".tmp")
+        with os.fdopen(fd, "w") as file:
+            json.dump(data, file)
+        Path(tmp_filepath).replace(self.cache_dirpath / f"{key}.json")
@@ -1,21 +1,156 @@
 import logging
-from dataclasses import dataclass
+import math
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field, fields, replace
+from typing import TYPE_CHECKING, Any, Literal, Optional
 
 import numpy as np
 
-from surv.algo.constraints import Constraint, EqConstraint, GtConstraint, LtConstraint
+from surv.algo.constraints import Constraint, EqConstraint, GtConstraint, InConstraint, LtConstraint, SkipConstraint
+from surv.algo.parallel import ProcessSplitPool
+from surv.algo.profiler import Profiler
 from surv.algo.result import Continue, Result, Terminal, Unknown
+from surv.algo.split import Split, Targets
 from surv.dataset.dataset import Dataset
 from surv.dataset.feature import Feature
-from surv.dataset.feature_purpose import Training
-from surv.dataset.feature_types import Categorical, FeatureType
+from surv.dataset.feature_types import Categorical, Numeric
+
+if TYPE_CHECKING:
+    from surv.algo.session import Session
+
+ExecutorName = Literal["serial", "thread", "process"]
+
+# Counting rows with bitmaps costs about a third of counting them by index per bitmap word and pair of categories.
+BITMAP_ROWS_PER_WORD = 3
+
+# Contingency tables are counted densely with one bincount over their cells while they have at most this many cells
+# per row, beyond that only their nonzero cells are counted by sorting the pair codes of the rows.
+DENSE_CONTINGENCY_CELLS_PER_ROW = 4
+
+# Process pools are kept for this many datasets, the least recently used pool is retired beyond that.
+MAX_PROCESS_POOLS = 4
+
+# Evaluator settings that only change how results are computed, not the results.
+EXECUTION_SETTINGS = frozenset({"executor", "n_workers", "use_bitmap_index", "profiler"})
+
+# Shared context manager for spans when profiling is disabled, a nullcontext can be entered any number of times.
+NO_SPAN: AbstractContextManager[Any] = nullcontext()
 
 logger = logging.getLogger(__name__)
 
+# Survey paths are identified by the answers given along them, in any order.
+Path = frozenset[Hashable]
+
+
+@dataclass
+class LookaheadState:
+    """Search state of one lookahead question selection.
+
+    Attributes:
+        splits (dict[Path, list[Split]]): Splits of the candidate features of each node reached, reused when the
+            node is expanded after its parent question was scored.
+        node_costs (dict[tuple[Path, int], float]): Expected number of remaining questions of each node expanded,
+            by lookahead depth.
+        n_expanded (int): Number of questions scored.
+        n_pruned (int): Number of questions skipped because they could not beat the incumbent question.
+    """
+
+    splits: dict[Path, list[Split]] = field(default_factory=dict)
+    node_costs: dict[tuple[Path, int], float] = field(default_factory=dict)
+    n_expanded: int = 0
+    n_pruned: int = 0
+
 
 @dataclass
 class Evaluator:
-    """Feature evaluator."""
+    """Feature evaluator.
+
+    Attributes:
+        numeric_max_bins (Optional[int]): Maximum number of quantile bins to group numeric feature values into
+            before searching for the best threshold. By default every distinct value is a candidate.
+        executor (ExecutorName): How training features are scored. Features are scored one at a time with "serial",
+            concurrently on a thread pool with "thread", or on a process pool that shares the dataset columns through
+            shared memory with "process". All executors select the same feature.
+        n_workers (Optional[int]): Number of workers of the thread or process pool. Defaults to the number of CPUs.
+        use_bitmap_index (bool): Whether to count categorical features with popcounts over the dataset bitmap index
+            when that is cheaper than counting the surviving rows one by one. Only applies to unweighted datasets on
+            the serial and thread executors.
+        lookahead_depth (int): Number of questions looked ahead when selecting a question. With 1 the question with
+            the highest information gain is selected. With more, the question that minimizes the expected number of
+            remaining questions over that many questions is selected, see _select_lookahead.
+        lookahead_width (int): Number of candidate questions with the highest information gain expanded at each node
+            of the lookahead search.
+        stop_posterior (Optional[float]): If set, the survey ends with the most probable target as soon as its
+            posterior probability reaches this value, instead of only when every matching row has the same target.
+        stop_entropy (Optional[float]): If set, the survey ends with the most probable target as soon as the entropy
+            of the posterior falls below this value. The entropy bounds the information that all remaining questions
+            together can still gain.
+        posterior_prior (float): Pseudo-count added to every target category when estimating the posterior, so that
+            a few matching rows do not give a confident posterior. 0 uses the observed frequencies.
+        profiler (Optional[Profiler]): Records the timings of the phases of each evaluation, the rows surviving each
+            constraint, and optionally allocations. Evaluation is not instrumented without a profiler.
+    """
+
+    numeric_max_bins: Optional[int] = None
+    executor: ExecutorName = "serial"
+    n_workers: Optional[int] = None
+    use_bitmap_index: bool = True
+    lookahead_depth: int = 1
+    lookahead_width: int = 3
+    stop_posterior: Optional[float] = None
+    stop_entropy: Optional[float] = None
+    posterior_prior: float = 0.0
+    profiler: Optional[Profiler] = field(default=None, repr=False, compare=False)
+    _thread_pool: Optional[ThreadPoolExecutor] = field(default=None, init=False, repr=False, compare=False)
+    _process_pools: OrderedDict[str, ProcessSplitPool] = field(
+        default_factory=OrderedDict, init=False, repr=False, compare=False
+    )
+    _pool_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Validate the lookahead and stopping settings."""
+        if self.lookahead_depth < 1:
+            msg = f"Lookahead depth must be at least 1, got {self.lookahead_depth}."
+            raise ValueError(msg)
+        if self.lookahead_width < 1:
+            msg = f"Lookahead width must be at least 1, got {self.lookahead_width}."
+            raise ValueError(msg)
+        if self.stop_posterior is not None and not 0 < self.stop_posterior <= 1:
+            msg = f"Stopping posterior must be in (0, 1], got {self.stop_posterior}."
+            raise ValueError(msg)
+        if self.stop_entropy is not None and self.stop_entropy < 0:
+            msg = f"Stopping entropy must not be negative, got {self.stop_entropy}."
+            raise ValueError(msg)
+        if self.posterior_prior < 0:
+            msg = f"Posterior prior must not be negative, got {self.posterior_prior}."
+            raise ValueError(msg)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the state to pickle, without the pools and their lock, which belong to the process that made them."""
+        state = self.__dict__.copy()
+        for name in ("_thread_pool", "_process_pools", "_pool_lock"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore a pickled evaluator, without any pools."""
+        self.__dict__.update(state)
+        self._thread_pool = None
+        self._process_pools = OrderedDict()
+        self._pool_lock = threading.Lock()
+
+    @property
+    def result_settings(self) -> dict[str, Any]:
+        """Settings that the evaluation results depend on, without those that only change how they are computed."""
+        return {
+            setting.name: getattr(self, setting.name)
+            for setting in fields(self)
+            if setting.repr and setting.name not in EXECUTION_SETTINGS
+        }
 
     def evaluate(self, dataset: Dataset, constraints: list[Constraint]) -> Result:
         """Evaluate a dataset for the optimal feature data to collect.
@@ -26,103 +161,781 @@ class Evaluator:
         """
         logger.info("-----")
         logger.info("Evaluating dataset with %i constraints.", len(constraints))
-        feature_info = dataset.feature_info
+        with self._span("evaluate", n_constraints=len(constraints)):
+            with self._span("filter"):
+                rows = self.filter_rows(dataset, constraints, profiler=self.profiler)
+            return self._evaluate_rows(dataset, rows, constraints)
+
+    def evaluate_session(self, session: "Session") -> Result:
+        """Evaluate a survey session for the optimal feature data to collect.
+
+        The rows that match the session constraints are taken from the session instead of being recomputed.
 
-        information_gain_map: dict[str, float] = {}
-        for feature in feature_info.features:
-            if not isinstance(feature.purpose, Training):
-                logger.debug("Skipping non-training feature %s with purpose %s", feature.name, feature.purpose.name)
+        Args:
+            session (Session): Survey session to evaluate.
+        """
+        logger.info("-----")
+        logger.info("Evaluating session with %i constraints.", len(session.constraints))
+        with self._span("evaluate", n_constraints=len(session.constraints)):
+            return self._evaluate_rows(session.dataset, session.rows, session.constraints)
+
+    def _span(self, name: str, **attributes: Any) -> AbstractContextManager[Any]:
+        """Get a profiler span, or a shared no-op context manager if profiling is disabled."""
+        if self.profiler is None:
+            return NO_SPAN
+        return self.profiler.span(name, **attributes)
+
+    def _evaluate_rows(self, dataset: Dataset, rows: np.ndarray, constraints: list[Constraint]) -> Result:
+        targets = self._get_targets(dataset, rows)
+        target_counts = self._count_codes(targets.codes, targets.n_categories, targets.weights)
+        if np.count_nonzero(target_counts) <= 1 or self._is_confident(target_counts):
+            # No question can change the outcome, so the splits are not computed.
+            return self._end_survey(dataset, target_counts)
+
+        constrained_feature_names = {constraint.feature.name for constraint in constraints}
+
+        candidate_features: list[Feature] = []
+        for feature in dataset.feature_info.training_features:
+            if feature.name in constrained_feature_names:
+                logger.debug("Skipping feature %s with known constraint", feature.name)
                 continue
-            logger.debug("Computing information gain for feature: %s", feature.name)
-            information_gain = self._compute_information_gain(dataset, feature, constraints)
-            logger.info("Information gain - %s: %f", feature.name, information_gain)
-            information_gain_map[feature.name] = information_gain
+            candidate_features.append(feature)
+
+        splits = self._compute_splits(dataset, candidate_features, rows, targets)
+        with self._span("selection", n_rows=rows.shape[0], n_features=len(candidate_features)):
+            return self._select_split(dataset, rows, candidate_features, splits, target_counts)
+
+    @staticmethod
+    def _get_targets(dataset: Dataset, rows: np.ndarray) -> Targets:
+        """Get the target values of the rows."""
+        target_feature_name = dataset.feature_info.target_feature_name
+        return Targets(
+            codes=dataset.get_codes(target_feature_name)[rows],
+            n_categories=len(dataset.get_categories(target_feature_name)),
+            weights=dataset.weights[rows] if dataset.weights is not None else None,
+        )
+
+    def _select_split(
+        self,
+        dataset: Dataset,
+        rows: np.ndarray,
+        features: list[Feature],
+        splits: list[Split],
+        target_counts: np.ndarray,
+    ) -> Result:
+        """Select the split with the highest information gain, or end the survey if no split has any."""
+        split_map: dict[str, Split] = {}
+        for feature, split in zip(features, splits, strict=True):
+            logger.info("Information gain - %s: %f", feature.name, split.information_gain)
+            split_map[feature.name] = split
 
         max_information_gain = 0.0
         best_feature_name = None
-        for feature_name, information_gain in information_gain_map.items():
-            if information_gain > max_information_gain:
-                max_information_gain = information_gain
+        for feature_name, split in split_map.items():
+            if split.information_gain > max_information_gain:
+                max_information_gain = split.information_gain
                 best_feature_name = feature_name
 
         if best_feature_name is None:
-            mask_column = self._filter_dataset(dataset, constraints)
-            target_column = dataset.get_column(dataset.feature_info.target_feature_name)
-            target_column = target_column[mask_column]
-            unique_targets = np.unique(target_column)
-            if unique_targets.shape[0] == 1:
-                category = unique_targets[0]
-                logger.info("Terminal node reached with category: %s", category)
-                return Terminal(category=category)
-            logger.info(f"Unknown node reached with targets: {unique_targets}")
-            return Unknown()
+            return self._end_survey(dataset, target_counts)
+
+        if self.lookahead_depth > 1:
+            with self._span("lookahead", depth=self.lookahead_depth, width=self.lookahead_width):
+                best_feature_name = features[self._select_lookahead(dataset, rows, features, splits)].name
 
         best_feature = dataset.get_feature(best_feature_name)
-        return Continue(feature=best_feature, information_gain=max_information_gain)
+        best_split = split_map[best_feature_name]
+        return Continue(
+            feature=best_feature,
+            information_gain=best_split.information_gain,
+            threshold=best_split.threshold,
+            posterior=self._get_posterior(dataset, target_counts),
+        )
+
+    def _end_survey(self, dataset: Dataset, target_counts: np.ndarray) -> Result:
+        """End the survey with the most probable target, or without a prediction if no rows match.
+
+        The survey ends when every matching row has the same target, when a stopping rule is confident, or when no
+        question is left that has any information gain. In every case the most probable target is predicted, like
+        Result.apply_stopping_rule does when a question is not worth asking.
+        """
+        posterior = self._get_posterior(dataset, target_counts)
+        if target_counts.sum() <= 0:
+            logger.info("Unknown node reached without matching rows.")
+            return Unknown(posterior=posterior)
+        category = dataset.get_categories(dataset.feature_info.target_feature_name)[int(np.argmax(target_counts))]
+        logger.info("Terminal node reached with category: %s", category)
+        return Terminal(category=category, posterior=posterior)
+
+    def _get_posterior(self, dataset: Dataset, target_counts: np.ndarray) -> dict[str, float]:
+        """Estimate the probability of each target category from the weighted target counts of the matching rows."""
+        counts = target_counts + self.posterior_prior
+        total = counts.sum()
+        if total <= 0:
+            return {}
+        categories = dataset.get_categories(dataset.feature_info.target_feature_name)
+        return {category: float(count / total) for category, count in zip(categories, counts, strict=True)}
+
+    def _is_confident(self, target_counts: np.ndarray) -> bool:
+        """Check whether a stopping rule ends the survey with the most probable target."""
+        if self.stop_posterior is None and self.stop_entropy is None:
+            return False
+        counts = target_counts + self.posterior_prior
+        total = counts.sum()
+        if total <= 0:
+            return False
+        if self.stop_posterior is not None and counts.max() / total >= self.stop_posterior:
+            return True
+        return self.stop_entropy is not None and self._compute_entropy(counts) < self.stop_entropy
+
+    def _select_lookahead(
+        self,
+        dataset: Dataset,
+        rows: np.ndarray,
+        features: list[Feature],
+        splits: list[Split],
+    ) -> int:
+        """Select the question that minimizes the expected number of remaining questions.
+
+        The cost of a node is the expected number of questions still asked there. A node ends the survey, at no cost,
+        when its rows all have the same target. When no question has any information gain the survey ends with the most
+        probable target, which costs the entropy left unresolved, as if every bit was another question. When the
+        lookahead depth is used up, the remaining questions are estimated as the entropy of the node divided by the
+        highest information gain of its questions.
+
+        The search is a depth-first branch and bound over the lookahead_width questions with the highest information
+        gain at each node. A question costs at least one plus the cost of its children, and a child that is not a leaf
+        costs at least min(1, entropy), so a question costs at least 1 + (entropy - gain) / log2(n_targets), see
+        _get_question_bound. A question whose bound reaches the incumbent cannot beat it and is skipped. Once the splits
+        of the children are computed, the bound is refined with the exact cost of the leaves before any child is
+        expanded. Splits and costs of nodes are memoized by the set of answers that leads to them, so a node reached by
+        answering the same questions in another order is not evaluated twice.
+
+        Returns:
+            int: Index of the selected feature.
+        """
+        state = LookaheadState()
+        state.splits[frozenset()] = splits
+        best_index = -1
+        best_cost = math.inf
+        for index, cost in self._iter_question_costs(state, dataset, rows, frozenset(), features, self.lookahead_depth):
+            if cost < best_cost:
+                best_index, best_cost = index, cost
+        logger.debug(
+            "Lookahead selected %s with %f expected questions, scored %d questions and pruned %d.",
+            features[best_index].name,
+            best_cost,
+            state.n_expanded,
+            state.n_pruned,
+        )
+        return best_index
+
+    def _iter_question_costs(  # noqa: PLR0913, PLR0917
+        self,
+        state: LookaheadState,
+        dataset: Dataset,
+        rows: np.ndarray,
+        path: Path,
+        features: list[Feature],
+        depth: int,
+    ) -> Iterator[tuple[int, float]]:
+        """Score the candidate questions of a node, yielding the index and cost of each question that is not pruned."""
+        splits = state.splits[path]
+        candidates = sorted(
+            (index for index, split in enumerate(splits) if split.information_gain > 0),
+            key=lambda index: -splits[index].information_gain,
+        )[: self.lookahead_width]
+        entropy = self._compute_entropy(self._count_targets(dataset, rows))
+
+        incumbent = math.inf
+        for index in candidates:
+            if self._get_question_bound(dataset, rows, features[index], splits[index], entropy) >= incumbent:
+                state.n_pruned += 1
+                continue
+            cost = self._get_question_cost(state, dataset, rows, path, features, index, depth, incumbent)
+            incumbent = min(incumbent, cost)
+            yield index, cost
+
+    def _get_question_bound(
+        self,
+        dataset: Dataset,
+        rows: np.ndarray,
+        feature: Feature,
+        split: Split,
+        entropy: float,
+    ) -> float:
+        """Get a lower bound on the cost of a question from its information gain, before its children are split.
+
+        Children that a stopping rule ends cost nothing however much entropy they have left, so the bound on the cost
+        of their entropy only holds without stopping rules. It also only holds when every row has a known value of the
+        feature. The children of a question only get the rows with a known value, and the information gain is scaled
+        by their share, so the entropy left in the children can be far below the entropy of the node minus the gain.
+        """
+        if self.stop_posterior is not None or self.stop_entropy is not None:
+            return 1.0
+        if self._has_missing_values(dataset, rows, feature):
+            return 1.0
+        entropy_scale = max(1.0, math.log2(len(dataset.get_categories(dataset.feature_info.target_feature_name))))
+        return 1.0 + max(0.0, entropy - split.information_gain) / entropy_scale
+
+    def _has_missing_values(self, dataset: Dataset, rows: np.ndarray, feature: Feature) -> bool:
+        """Check whether any of the rows has a missing value of a feature."""
+        column = self.get_split_column(dataset, feature)[rows]
+        if isinstance(feature.type, Categorical):
+            return bool((column < 0).any())
+        return bool(np.isnan(column.astype(np.float64)).any())
+
+    def _get_node_cost(  # noqa: PLR0913, PLR0917
+        self,
+        state: LookaheadState,
+        dataset: Dataset,
+        rows: np.ndarray,
+        path: Path,
+        features: list[Feature],
+        depth: int,
+    ) -> float:
+        """Compute the expected number of remaining questions at a node whose splits are known."""
+        key = (path, depth)
+        cost = state.node_costs.get(key)
+        if cost is None:
+            cost = self._get_leaf_cost(dataset, rows, state.splits[path])
+            if depth > 0 and cost > 0 and any(split.information_gain > 0 for split in state.splits[path]):
+                costs = self._iter_question_costs(state, dataset, rows, path, features, depth)
+                cost = min(question_cost for _, question_cost in costs)
+            state.node_costs[key] = cost
+        return cost
+
+    def _get_question_cost(  # noqa: PLR0913, PLR0917
+        self,
+        state: LookaheadState,
+        dataset: Dataset,
+        rows: np.ndarray,
+        path: Path,
+        features: list[Feature],
+        index: int,
+        depth: int,
+        incumbent: float,
+    ) -> float:
+        """Compute the expected questions after asking a question, or a lower bound once it reaches the incumbent."""
+        state.n_expanded += 1
+        feature = features[index]
+        child_features = features[:index] + features[index + 1 :]
+        branches = [
+            (answer, child_rows, self._get_weight(dataset, child_rows))
+            for answer, child_rows in self._branch(dataset, rows, feature, state.splits[path][index])
+        ]
+        # Answers are distributed like those of the rows with a known value.
+        total = sum(weight for _, _, weight in branches)
+
+        children = []
+        cost = 1.0
+        for answer, child_rows, weight in branches:
+            child_path = path | {answer}
+            if child_path not in state.splits:
+                child_targets = self._get_targets(dataset, child_rows)
+                state.splits[child_path] = self._compute_splits(dataset, child_features, child_rows, child_targets)
+            probability = weight / total
+            leaf_cost = self._get_leaf_cost(dataset, child_rows, state.splits[child_path])
+            is_leaf = leaf_cost == 0 or all(split.information_gain <= 0 for split in state.splits[child_path])
+            # A child that asks another question costs at least that one question.
+            cost += probability * (leaf_cost if is_leaf else 1.0)
+            if not is_leaf:
+                children.append((probability, child_rows, child_path))
+        if cost >= incumbent:
+            state.n_pruned += 1
+            return cost
+
+        for probability, child_rows, child_path in children:
+            child_cost = self._get_node_cost(state, dataset, child_rows, child_path, child_features, depth - 1)
+            cost += probability * (child_cost - 1.0)
+            if cost >= incumbent:
+                state.n_pruned += 1
+                return cost
+        return cost
+
+    def _get_leaf_cost(self, dataset: Dataset, rows: np.ndarray, splits: list[Split]) -> float:
+        """Estimate the number of remaining questions at a node without looking further ahead."""
+        target_counts = self._count_targets(dataset, rows)
+        if self._is_confident(target_counts):
+            return 0.0
+        entropy = self._compute_entropy(target_counts)
+        max_information_gain = max((split.information_gain for split in splits), default=0.0)
+        if entropy == 0 or max_information_gain <= 0:
+            return entropy
+        return entropy / max_information_gain
+
+    def _count_targets(self, dataset: Dataset, rows: np.ndarray) -> np.ndarray:
+        """Count the rows of each target category, weighted by the sample weights."""
+        targets = self._get_targets(dataset, rows)
+        return self._count_codes(targets.codes, targets.n_categories, targets.weights)
+
+    @staticmethod
+    def _get_weight(dataset: Dataset, rows: np.ndarray) -> float:
+        """Get the total sample weight of the rows."""
+        if dataset.weights is None:
+            return float(rows.shape[0])
+        return float(dataset.weights[rows].sum())
+
+    def _branch(
+        self,
+        dataset: Dataset,
+        rows: np.ndarray,
+        feature: Feature,
+        split: Split,
+    ) -> list[tuple[Hashable, np.ndarray]]:
+        """Split rows by their answer to a question, keyed by the answer. Rows with a missing value are left out."""
+        if split.threshold is None:
+            codes = self.get_split_column(dataset, feature)[rows]
+            return [((feature.name, int(code)), rows[codes == code]) for code in np.unique(codes[codes >= 0])]
+        values = dataset.get_column(feature.name)[rows].astype(np.float64)
+        return [
+            ((feature.name, LtConstraint.__name__), rows[values < split.threshold]),
+            ((feature.name, GtConstraint.__name__), rows[values > split.threshold]),
+        ]
+
+    def _compute_splits(
+        self,
+        dataset: Dataset,
+        features: list[Feature],
+        rows: np.ndarray,
+        targets: Targets,
+    ) -> list[Split]:
+        """Compute the best split of each feature, in the same order as the features."""
+        if self.executor == "process" and len(features) > 1:
+            # Spans recorded in worker processes would be lost, so workers evaluate without a profiler.
+            with (
+                self._span("split", n_rows=rows.shape[0], n_features=len(features), executor="process"),
+                self._use_process_pool(dataset) as process_pool,
+            ):
+                return process_pool.compute_splits(
+                    replace(self, executor="serial", profiler=None), features, rows, targets
+                )
+
+        target_bitmaps = self._get_target_bitmaps(dataset, rows, targets)
+
+        def compute_split(feature: Feature) -> Split:
+            logger.debug("Computing information gain for feature: %s", feature.name)
+            if target_bitmaps is not None and self._use_bitmaps(dataset, feature, rows, targets):
+                bitmaps = dataset.bitmap_index.get_bitmaps(feature.name)
+                contingency = dataset.bitmap_index.count(bitmaps, target_bitmaps)
+                # Rows with a missing value are in no category bitmap.
+                n_missing = rows.shape[0] - contingency.sum()
+                return Split(information_gain=self._compute_information_gain(contingency, n_missing))
+            column = self.get_split_column(dataset, feature)[rows]
+            return self.compute_split(feature, column, targets)
+
+        # Without a profiler, features are scored without entering a span for each of them.
+        split_function = compute_split
+        profiler = self.profiler
+        if profiler is not None:
+
+            def compute_split_profiled(feature: Feature) -> Split:
+                with profiler.span("split", feature=feature.name, n_rows=rows.shape[0]):
+                    return compute_split(feature)
+
+            split_function = compute_split_profiled
+
+        if self.executor == "thread" and len(features) > 1:
+            return list(self._get_thread_pool().map(split_function, features))
+        return [split_function(feature) for feature in features]
+
+    def compute_split(self, feature: Feature, column: np.ndarray, targets: Targets) -> Split:
+        """Compute the best split of the rows on a feature.
+
+        Args:
+            feature (Feature): Feature to split on.
+            column (np.ndarray): Feature column of the rows to split, as returned by get_split_column.
+            targets (Targets): Target values of the rows to split.
 
-    def _compute_information_gain(self, dataset: Dataset, feature: Feature, constraints: list[Constraint]) -> float:
+        Returns:
+            Split: The split with the highest information gain.
+        """
         match feature.type:
-            case Categorical():
-                return self._compute_information_gain_categorical(dataset, feature, constraints)
+            case Categorical(categories=categories):
+                information_gain = self._compute_information_gain_categorical(column, len(categories), targets)
+                return Split(information_gain=information_gain)
+            case Numeric():
+                return self._compute_split_numeric(column, targets)
             case _:
                 raise NotImplementedError
 
+    def _get_target_bitmaps(self, dataset: Dataset, rows: np.ndarray, targets: Targets) -> Optional[np.ndarray]:
+        """Get the bitmaps of the target categories restricted to the rows, if any feature is counted with bitmaps."""
+        target_feature_name = dataset.feature_info.target_feature_name
+        if not self.use_bitmap_index or targets.weights is not None:
+            return None
+        if not dataset.bitmap_index.is_indexed(target_feature_name):
+            return None
+        # Binary features are the cheapest to count with bitmaps, if they are not worth it no feature is.
+        if 2 * targets.n_categories * dataset.bitmap_index.n_words > BITMAP_ROWS_PER_WORD * rows.shape[0]:
+            return None
+        mask = dataset.bitmap_index.rows_to_mask(rows)
+        return dataset.bitmap_index.get_bitmaps(target_feature_name) & mask
+
+    @staticmethod
+    def _use_bitmaps(dataset: Dataset, feature: Feature, rows: np.ndarray, targets: Targets) -> bool:
+        """Check whether counting a feature with bitmaps is cheaper than counting the rows one by one."""
+        if not isinstance(feature.type, Categorical) or not dataset.bitmap_index.is_indexed(feature.name):
+            return False
+        n_pairs = len(feature.type.categories) * targets.n_categories
+        return n_pairs * dataset.bitmap_index.n_words <= BITMAP_ROWS_PER_WORD * rows.shape[0]
+
+    @staticmethod
+    def get_split_column(dataset: Dataset, feature: Feature) -> np.ndarray:
+        """Get the column that a feature is split on, codes for categorical features and values otherwise.
+
+        Args:
+            dataset (Dataset): Dataset to get the column from.
+            feature (Feature): Feature to get the column of.
+
+        Returns:
+            np.ndarray: Feature column.
+        """
+        if isinstance(feature.type, Categorical):
+            return dataset.get_codes(feature.name)
+        return dataset.get_column(feature.name)
+
+    def close(self) -> None:
+        """Shut down the thread and process pools. Process pools still in use close once their evaluations finish."""
+        with self._pool_lock:
+            thread_pool, self._thread_pool = self._thread_pool, None
+            process_pools = list(self._process_pools.values())
+            self._process_pools.clear()
+        if thread_pool is not None:
+            thread_pool.shutdown()
+        for process_pool in process_pools:
+            process_pool.retire()
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.n_workers)
+            return self._thread_pool
+
+    @contextmanager
+    def _use_process_pool(self, dataset: Dataset) -> Iterator[ProcessSplitPool]:
+        """Use the process pool of a dataset, starting it if there is none.
+
+        The evaluator may be shared between threads evaluating different datasets, so it keeps a pool per dataset,
+        keyed by the dataset fingerprint. A dataset that is reloaded without changes keeps its pool. Beyond
+        MAX_PROCESS_POOLS the least recently used pool is retired, and it is only closed once the evaluations using
+        it have finished.
+        """
+        key = dataset.fingerprint
+        with self._pool_lock:
+            process_pool = self._process_pools.get(key)
+            if process_pool is None:
+                process_pool = ProcessSplitPool(dataset, n_workers=self.n_workers)
+                self._process_pools[key] = process_pool
+            self._process_pools.move_to_end(key)
+            process_pool.acquire()
+            while len(self._process_pools) > MAX_PROCESS_POOLS:
+                _, evicted_process_pool = self._process_pools.popitem(last=False)
+                evicted_process_pool.retire()
+        try:
+            yield process_pool
+        finally:
+            process_pool.release()
+
     @classmethod
-    def _filter_dataset(cls, dataset: Dataset, constraints: list[Constraint]) -> np.ndarray:
-        """Filter the dataset based on constraints."""
-        logger.debug("Initial dataset has %d samples.", dataset.n_samples)
-        mask_column = np.ones(dataset.n_samples, dtype=bool)
+    def filter_rows(
+        cls,
+        dataset: Dataset,
+        constraints: list[Constraint],
+        rows: Optional[np.ndarray] = None,
+        profiler: Optional[Profiler] = None,
+    ) -> np.ndarray:
+        """Filter dataset rows based on constraints.
+
+        Args:
+            dataset (Dataset): Dataset to filter.
+            constraints (list[Constraint]): Constraints to apply.
+            rows (Optional[np.ndarray]): Indices of rows to narrow down. Defaults to all rows.
+            profiler (Optional[Profiler]): Records the rows surviving each constraint.
+
+        Returns:
+            np.ndarray: Indices of the rows that match all constraints.
+        """
+        if rows is None:
+            if profiler is None:
+                rows, constraints = cls._filter_rows_indexed(dataset, constraints)
+            else:
+                with profiler.span("indexed_constraints", n_constraints=len(constraints)) as attributes:
+                    rows, constraints = cls._filter_rows_indexed(dataset, constraints)
+                    attributes["n_constraints"] -= len(constraints)
+                    attributes["n_rows"] = rows.shape[0]
+        logger.debug("Initial dataset has %d samples.", rows.shape[0])
         for constraint in constraints:
-            logger.debug("Applying constraint: %s %s", type(constraint).__name__, constraint)
-            constraint_column = dataset.get_column(constraint.feature.name)
-            match constraint:
-                case EqConstraint(value=value):
-                    mask_column &= constraint_column == value
-                case LtConstraint(value=value):
-                    mask_column &= constraint_column < value
-                case GtConstraint(value=value):
-                    mask_column &= constraint_column > value
-                case _:
-                    raise NotImplementedError
-            logger.debug("Filtered dataset has %d samples.", np.sum(mask_column))
-        return mask_column
+            logger.debug("Applying constraint: %s", constraint)
+            if profiler is None:
+                rows = cls._filter_rows_constraint(dataset, constraint, rows)
+            else:
+                with profiler.span("constraint", constraint=str(constraint)) as attributes:
+                    rows = cls._filter_rows_constraint(dataset, constraint, rows)
+                    attributes["n_rows"] = rows.shape[0]
+            logger.debug("Filtered dataset has %d samples.", rows.shape[0])
+        return rows
+
+    @staticmethod
+    def _filter_rows_constraint(dataset: Dataset, constraint: Constraint, rows: np.ndarray) -> np.ndarray:
+        """Narrow down rows to those that match a constraint."""
+        feature_name = constraint.feature.name
+        match constraint:
+            case EqConstraint() | InConstraint() if isinstance(constraint.feature.type, Categorical):
+                categories = dataset.get_categories(feature_name)
+                values = [constraint.value] if isinstance(constraint, EqConstraint) else constraint.values
+                codes = [categories.index(value) for value in values if value in categories]
+                return rows[np.isin(dataset.get_codes(feature_name)[rows], codes)]
+            case EqConstraint() | InConstraint():
+                values = [constraint.value] if isinstance(constraint, EqConstraint) else constraint.values
+                numbers = [float(value) for value in values]
+                return rows[np.isin(dataset.get_column(feature_name)[rows], numbers)]
+            case SkipConstraint():
+                return rows
+            case LtConstraint(value=value):
+                return rows[dataset.get_column(feature_name)[rows] < value]
+            case GtConstraint(value=value):
+                return rows[dataset.get_column(feature_name)[rows] > value]
+            case _:
+                raise NotImplementedError
+
+    @staticmethod
+    def _filter_rows_indexed(dataset: Dataset, constraints: list[Constraint]) -> tuple[np.ndarray, list[Constraint]]:
+        """Apply the equals and in constraints on indexed features as an AND of their bitmaps.
+
+        The bitmap of an in constraint is the OR of the bitmaps of its categories. Skip constraints are dropped since
+        they do not filter any rows.
+
+        Returns:
+            tuple[np.ndarray, list[Constraint]]: Indices of the rows that match the indexed constraints, and the
+                constraints that still need to be applied.
+        """
+        bitmap_index = dataset.bitmap_index
+        mask = None
+        remaining_constraints = []
+        for constraint in constraints:
+            feature = constraint.feature
+            if isinstance(constraint, SkipConstraint):
+                continue
+            if not (
+                isinstance(constraint, (EqConstraint, InConstraint))
+                and isinstance(feature.type, Categorical)
+                and bitmap_index.is_indexed(feature.name)
+            ):
+                remaining_constraints.append(constraint)
+                continue
+            categories = dataset.get_categories(feature.name)
+            values = [constraint.value] if isinstance(constraint, EqConstraint) else constraint.values
+            codes = [categories.index(value) for value in values if value in categories]
+            if not codes:
+                return np.arange(0), []
+            bitmaps = bitmap_index.get_bitmaps(feature.name)
+            bitmap = np.bitwise_or.reduce(bitmaps[codes], axis=0)
+            mask = bitmap if mask is None else mask & bitmap
+
+        if mask is None:
+            return np.arange(dataset.n_samples), remaining_constraints
+        return bitmap_index.mask_to_rows(mask), remaining_constraints
 
     def _compute_information_gain_categorical(
         self,
-        dataset: Dataset,
-        feature: Feature,
-        constraints: list[Constraint],
+        codes: np.ndarray,
+        n_categories: int,
+        targets: Targets,
     ) -> float:
-        column = dataset.get_column(feature.name)
-        target_feature = dataset.get_feature(dataset.feature_info.target_feature_name)
-        target_column = dataset.get_column(dataset.feature_info.target_feature_name)
-
-        mask_column = self._filter_dataset(dataset, constraints)
-
-        # Filter down dataset rows to only those that match the constraints.
-        column = column[mask_column]
-        target_column = target_column[mask_column]
-
-        entropy_initial = self._compute_entropy(target_column, target_feature.type)
-        information_gain = entropy_initial
-        for category in np.unique(column):
-            target_subset = target_column[column == category]
-            subset_entropy = self._compute_entropy(target_subset, target_feature.type)
-            proportion = target_subset.shape[0] / target_column.shape[0]
-            information_gain -= proportion * subset_entropy
-        return information_gain
-
-    def _compute_entropy(self, column: np.ndarray, feature_type: FeatureType) -> float:
-        match feature_type:
-            case Categorical():
-                return self._compute_entropy_categorical(column)
-            case _:
-                raise NotImplementedError
+        n_targets = targets.n_categories
+        # Shifting the codes by one counts the rows with a missing value, coded -1, in the first row of the table.
+        pair_codes = (codes.astype(np.intp) + 1) * n_targets + targets.codes
+        n_cells = (n_categories + 1) * n_targets
+        if n_cells > DENSE_CONTINGENCY_CELLS_PER_ROW * codes.shape[0]:
+            return self._compute_information_gain_sparse(pair_codes, targets)
+        contingency = self._count_codes(pair_codes, n_cells, targets.weights).reshape(n_categories + 1, n_targets)
+        return self._compute_information_gain(contingency[1:], contingency[0].sum())
+
+    def _compute_information_gain_sparse(self, pair_codes: np.ndarray, targets: Targets) -> float:
+        """Compute the information gain of a categorical split from the nonzero cells of its contingency table.
+
+        The distinct pair codes of the rows are the nonzero cells, so time and memory grow with the number of rows
+        instead of the number of feature categories times the number of target categories.
+        """
+        n_targets = targets.n_categories
+        if targets.weights is None:
+            cells, counts = np.unique(pair_codes, return_counts=True)
+        else:
+            cells, cell_indices = np.unique(pair_codes, return_inverse=True)
+            counts = np.bincount(cell_indices, weights=targets.weights)
+        if self.profiler is None:
+            return self._get_information_gain_sparse(cells, counts, n_targets)
+        with self.profiler.span("entropy"):
+            return self._get_information_gain_sparse(cells, counts, n_targets)
+
+    @classmethod
+    def _get_information_gain_sparse(cls, cells: np.ndarray, counts: np.ndarray, n_targets: int) -> float:
+        """Compute the information gain of a categorical split from the counts of its nonzero cells."""
+        cell_categories = cells // n_targets
+        is_known = cell_categories > 0
+        known_counts = counts[is_known]
+        n_missing = counts[~is_known].sum()
+        total = known_counts.sum()
+        if total == 0:
+            return 0.0
+        target_counts = np.bincount(cells[is_known] % n_targets, weights=known_counts, minlength=n_targets)
+        category_counts = np.bincount(cell_categories[is_known], weights=known_counts)
+        conditional_entropy = (cls._xlogx(category_counts).sum() - cls._xlogx(known_counts).sum()) / total
+        information_gain = cls._compute_entropy(target_counts) - float(conditional_entropy)
+        return information_gain * cls._get_known_fraction(total, n_missing)
+
+    def _compute_information_gain(self, contingency: np.ndarray, n_missing: float = 0.0) -> float:
+        """Compute the information gain of a split given as a category by target contingency table.
+
+        Rows with a missing feature value are left out of the table, and only their total weight is given. As in C4.5,
+        the information gain is computed over the rows with a known value and scaled by their share of the weight.
+        """
+        if self.profiler is None:
+            return self._get_information_gain(contingency, n_missing)
+        with self.profiler.span("entropy"):
+            return self._get_information_gain(contingency, n_missing)
+
+    @classmethod
+    def _get_information_gain(cls, contingency: np.ndarray, n_missing: float) -> float:
+        """Compute the information gain of a split from its contingency table and the weight of missing rows."""
+        information_gain = cls._compute_entropy(contingency.sum(axis=0)) - cls._compute_conditional_entropy(contingency)
+        return information_gain * cls._get_known_fraction(contingency.sum(), n_missing)
+
+    @staticmethod
+    def _get_known_fraction(n_known: float, n_missing: float) -> float:
+        """Get the share of the weight of the rows that have a known feature value."""
+        if n_missing <= 0:
+            return 1.0
+        return float(n_known / (n_known + n_missing))
+
+    def _compute_split_numeric(self, column: np.ndarray, targets: Targets) -> Split:
+        """Find the threshold on a numeric feature with the highest information gain.
+
+        Values are sorted once and grouped, either by distinct value or into quantile bins. All thresholds between
+        groups are then scored in a single vectorized pass, see _compute_threshold_gains. Rows with a missing value
+        are left out, and the information gain is scaled by the share of the weight of the other rows as for
+        categorical features.
+        """
+        column = column.astype(np.float64)
+        is_missing = np.isnan(column)
+        n_missing = 0.0
+        if is_missing.any():
+            is_known = ~is_missing
+            n_missing = float(is_missing.sum() if targets.weights is None else targets.weights[is_missing].sum())
+            column = column[is_known]
+            weights = targets.weights[is_known] if targets.weights is not None else None
+            targets = Targets(codes=targets.codes[is_known], n_categories=targets.n_categories, weights=weights)
+        unique_values, groups = np.unique(column, return_inverse=True)
+        if unique_values.shape[0] <= 1:
+            return Split(information_gain=0.0)
+
+        # Index of the largest distinct value in each group, a candidate threshold follows each group but the last.
+        group_ends = np.arange(unique_values.shape[0])
+        if self.numeric_max_bins is not None and unique_values.shape[0] > self.numeric_max_bins:
+            probabilities = np.linspace(0, 1, self.numeric_max_bins + 1)[1:-1]
+            quantiles = np.quantile(column, probabilities, weights=targets.weights, method="inverted_cdf")
+            _, unique_bins = np.unique(np.searchsorted(quantiles, unique_values, side="left"), return_inverse=True)
+            groups = unique_bins[groups]
+            group_ends = np.flatnonzero(np.diff(unique_bins, append=unique_bins[-1] + 1))
+            if group_ends.shape[0] <= 1:
+                return Split(information_gain=0.0)
+
+        n_groups = group_ends.shape[0]
+        information_gains, total = self._compute_threshold_gains(groups, n_groups, targets)
+        best = int(np.argmax(information_gains))
+        lower_value = unique_values[group_ends[best]]
+        upper_value = unique_values[group_ends[best] + 1]
+        threshold = float((lower_value + upper_value) / 2)
+        information_gain = float(information_gains[best]) * self._get_known_fraction(total, n_missing)
+        return Split(information_gain=information_gain, threshold=threshold)
+
+    def _compute_threshold_gains(self, groups: np.ndarray, n_groups: int, targets: Targets) -> tuple[np.ndarray, float]:
+        """Compute the information gain of the threshold after each group of numeric values but the last.
+
+        With few groups or targets, a cumulative sum over the group by target contingency table gives the target
+        counts on both sides of every threshold. Otherwise that table would be too large, and the rows are visited in
+        value order instead. Moving a row to the left side only changes the count of its own target, so the sums of
+        count * log2(count) on both sides are cumulative sums of per-row changes, in time and memory linear in the
+        number of rows.
+
+        Returns:
+            tuple[np.ndarray, float]: Information gain of each threshold, and the total weight of the rows.
+        """
+        if self.profiler is None:
+            return self._get_threshold_gains(groups, n_groups, targets)
+        with self.profiler.span("entropy", n_thresholds=n_groups - 1):
+            return self._get_threshold_gains(groups, n_groups, targets)
+
+    @classmethod
+    def _get_threshold_gains(cls, groups: np.ndarray, n_groups: int, targets: Targets) -> tuple[np.ndarray, float]:
+        """Compute the information gain of the threshold after each group of numeric values but the last."""
+        n_targets = targets.n_categories
+        n_rows = groups.shape[0]
+        if n_groups * n_targets <= DENSE_CONTINGENCY_CELLS_PER_ROW * n_rows:
+            contingency = cls._count_codes(
+                groups.astype(np.intp) * n_targets + targets.codes, n_groups * n_targets, targets.weights
+            ).reshape(n_groups, n_targets)
+            target_counts = contingency.sum(axis=0)
+            left_counts = np.cumsum(contingency, axis=0)[:-1]
+            n_left = left_counts.sum(axis=1)
+            left_xlogx = cls._xlogx(left_counts).sum(axis=1)
+            right_xlogx = cls._xlogx(target_counts - left_counts).sum(axis=1)
+        else:
+            weights = np.ones(n_rows) if targets.weights is None else targets.weights.astype(np.float64)
+            target_counts = np.bincount(targets.codes, weights=weights, minlength=n_targets)
+            order = np.argsort(groups, kind="stable")
+            sorted_targets = targets.codes[order]
+            sorted_weights = weights[order]
+            # Weight of the rows of the same target before each row, from a cumulative sum within each target.
+            target_order = np.argsort(sorted_targets, kind="stable")
+            grouped_targets = sorted_targets[target_order]
+            cumulative_weights = np.concatenate([[0.0], np.cumsum(sorted_weights[target_order])])
+            target_starts = np.searchsorted(grouped_targets, grouped_targets)
+            weights_before = np.empty(n_rows)
+            weights_before[target_order] = cumulative_weights[:-1] - cumulative_weights[target_starts]
+            right_before = target_counts[sorted_targets] - weights_before
+
+            left_changes = cls._xlogx(weights_before + sorted_weights) - cls._xlogx(weights_before)
+            right_changes = cls._xlogx(right_before - sorted_weights) - cls._xlogx(right_before)
+            # The last row of each group but the last group is where a threshold follows.
+            threshold_rows = np.flatnonzero(np.diff(groups[order]))
+            n_left = np.cumsum(sorted_weights)[threshold_rows]
+            left_xlogx = np.cumsum(left_changes)[threshold_rows]
+            right_xlogx = cls._xlogx(target_counts).sum() + np.cumsum(right_changes)[threshold_rows]
+
+        total = float(target_counts.sum())
+        n_right = total - n_left
+        conditional_entropies = (cls._xlogx(n_left) - left_xlogx + cls._xlogx(n_right) - right_xlogx) / total
+        return cls._compute_entropy(target_counts) - conditional_entropies, total
+
+    @staticmethod
+    def _count_codes(codes: np.ndarray, n_codes: int, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """Count occurrences of each integer code, optionally weighted."""
+        return np.bincount(codes.astype(np.intp, copy=False), weights=weights, minlength=n_codes)
+
+    @staticmethod
+    def _xlogx(x: np.ndarray) -> np.ndarray:
+        """Compute x * log2(x) elementwise, with 0 * log2(0) taken to be 0."""
+        x = np.asarray(x, dtype=np.float64)
+        return x * np.log2(x, out=np.zeros_like(x), where=x > 0)
+
+    @staticmethod
+    def _compute_entropy(counts: np.ndarray) -> float:
+        """Compute the entropy of a distribution given as counts."""
+        total = counts.sum()
+        if total == 0:
+            return 0.0
+        counts = counts[counts > 0]
+        return float((total * np.log2(total) - np.sum(counts * np.log2(counts))) / total)
 
     @staticmethod
-    def _compute_entropy_categorical(column: np.ndarray) -> float:
-        h = 0.0
-        for x in np.unique(column):
-            p_x = np.sum(column == x) / column.shape[0]
-            h -= p_x * np.log2(p_x)
-        return float(h)
+    def _compute_conditional_entropy(contingency: np.ndarray) -> float:
+        """Compute the conditional entropy of the columns given the rows of a contingency table."""
+        total = contingency.sum()
+        if total == 0:
+            return 0.0
+        row_totals = contingency.sum(axis=1)
+        row_totals = row_totals[row_totals > 0]
+        joint_counts = contingency[contingency > 0]
+        return float((np.sum(row_totals * np.log2(row_totals)) - np.sum(joint_counts * np.log2(joint_counts))) / total)
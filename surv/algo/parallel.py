@@ -0,0 +1,207 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from surv.algo.split import Split, Targets
+from surv.dataset.dataset import Dataset
+from surv.dataset.feature_types import Categorical
+
+if TYPE_CHECKING:
+    from surv.algo.evaluator import Evaluator
+    from surv.dataset.feature import Feature
+
+# Dataset columns attached by each worker process, keyed by feature name.
+_worker_columns: dict[str, np.ndarray] = {}
+_worker_shared_memories: list[SharedMemory] = []
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """Handle to a numpy array stored in shared memory.
+
+    Attributes:
+        name (str): Name of the shared memory block.
+        shape (tuple[int, ...]): Array shape.
+        dtype (str): Array data type.
+    """
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+    @classmethod
+    def create(cls, array: np.ndarray) -> tuple[SharedMemory, "SharedArray"]:
+        """Copy an array into a new shared memory block.
+
+        Args:
+            array (np.ndarray): Array to share.
+
+        Returns:
+            tuple[SharedMemory, SharedArray]: The shared memory block, owned by the caller, and its handle.
+        """
+        shared_memory = SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared_array = cls(name=shared_memory.name, shape=array.shape, dtype=array.dtype.str)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shared_memory.buf)[...] = array
+        return shared_memory, shared_array
+
+    def attach(self) -> tuple[SharedMemory, np.ndarray]:
+        """Attach to the shared memory block.
+
+        Returns:
+            tuple[SharedMemory, np.ndarray]: The shared memory block and a read-only array view of it.
+        """
+        shared_memory = SharedMemory(name=self.name)
+        array = np.ndarray(self.shape, dtype=np.dtype(self.dtype), buffer=shared_memory.buf)
+        array.flags.writeable = False
+        return shared_memory, array
+
+    def copy(self) -> np.ndarray:
+        """Copy the array out of the shared memory block.
+
+        Returns:
+            np.ndarray: A copy of the shared array.
+        """
+        shared_memory, array = self.attach()
+        try:
+            return array.copy()
+        finally:
+            del array
+            shared_memory.close()
+
+
+def _init_worker(shared_columns: dict[str, SharedArray]) -> None:
+    for feature_name, shared_array in shared_columns.items():
+        shared_memory, array = shared_array.attach()
+        _worker_shared_memories.append(shared_memory)
+        _worker_columns[feature_name] = array
+
+
+def _compute_split_worker(
+    evaluator: "Evaluator",
+    feature: "Feature",
+    shared_arrays: dict[str, SharedArray],
+    n_targets: int,
+) -> Split:
+    rows = shared_arrays["rows"].copy()
+    weights = shared_arrays["weights"].copy() if "weights" in shared_arrays else None
+    targets = Targets(codes=shared_arrays["target_codes"].copy(), n_categories=n_targets, weights=weights)
+    column = _worker_columns[feature.name][rows]
+    return evaluator.compute_split(feature, column, targets)
+
+
+@dataclass
+class ProcessSplitPool:
+    """Process pool that computes feature splits on dataset columns stored in shared memory.
+
+    The split columns of all training features are copied into shared memory once and attached by every worker.
+    For each evaluation only the surviving row indices and their targets are shared with the workers.
+
+    Callers that share a pool between threads mark their use of it with acquire and release, and retire the pool
+    instead of closing it, so that it is only closed once no thread is using it.
+
+    Attributes:
+        dataset (Dataset): Dataset whose columns are shared with the workers.
+        n_workers (Optional[int]): Number of worker processes. Defaults to the number of CPUs.
+    """
+
+    dataset: Dataset
+    n_workers: Optional[int] = None
+    _shared_memories: list[SharedMemory] = field(default_factory=list, init=False, repr=False)
+    _executor: ProcessPoolExecutor = field(init=False, repr=False)
+    _n_users: int = field(default=0, init=False, repr=False)
+    _is_retired: bool = field(default=False, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Share the dataset columns and start the worker processes."""
+        shared_columns: dict[str, SharedArray] = {}
+        for feature in self.dataset.feature_info.training_features:
+            if isinstance(feature.type, Categorical):
+                column = self.dataset.get_codes(feature.name)
+            else:
+                column = self.dataset.get_column(feature.name).astype(np.float64)
+            shared_memory, shared_columns[feature.name] = SharedArray.create(np.ascontiguousarray(column))
+            self._shared_memories.append(shared_memory)
+        # Workers are spawned rather than forked. Pools are started from whichever thread first evaluates a dataset,
+        # and a worker forked while another thread holds a lock inherits that lock held forever.
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(shared_columns,),
+        )
+
+    def compute_splits(
+        self,
+        evaluator: "Evaluator",
+        features: list["Feature"],
+        rows: np.ndarray,
+        targets: Targets,
+    ) -> list[Split]:
+        """Compute the best split of each feature on the worker processes.
+
+        Args:
+            evaluator (Evaluator): Serial evaluator used by the workers to compute splits.
+            features (list[Feature]): Features to split on.
+            rows (np.ndarray): Indices of the rows to split.
+            targets (Targets): Target values of the rows to split.
+
+        Returns:
+            list[Split]: The best split of each feature, in the same order as the features.
+        """
+        arrays = {"rows": rows, "target_codes": targets.codes}
+        if targets.weights is not None:
+            arrays["weights"] = targets.weights
+
+        shared_memories = []
+        shared_arrays = {}
+        try:
+            for name, array in arrays.items():
+                shared_memory, shared_arrays[name] = SharedArray.create(np.ascontiguousarray(array))
+                shared_memories.append(shared_memory)
+            futures = [
+                self._executor.submit(_compute_split_worker, evaluator, feature, shared_arrays, targets.n_categories)
+                for feature in features
+            ]
+            return [future.result() for future in futures]
+        finally:
+            for shared_memory in shared_memories:
+                shared_memory.close()
+                shared_memory.unlink()
+
+    def acquire(self) -> None:
+        """Mark the pool as in use until release is called."""
+        with self._lock:
+            if self._is_retired:
+                msg = "Process split pool is retired."
+                raise RuntimeError(msg)
+            self._n_users += 1
+
+    def release(self) -> None:
+        """Mark the pool as no longer in use by one caller, closing it if it was retired in the meantime."""
+        with self._lock:
+            self._n_users -= 1
+            should_close = self._is_retired and self._n_users == 0
+        if should_close:
+            self.close()
+
+    def retire(self) -> None:
+        """Close the pool as soon as no caller is using it."""
+        with self._lock:
+            self._is_retired = True
+            should_close = self._n_users == 0
+        if should_close:
+            self.close()
+
+    def close(self) -> None:
+        """Shut down the worker processes and release the shared memory."""
+        self._executor.shutdown()
+        for shared_memory in self._shared_memories:
+            shared_memory.close()
+            shared_memory.unlink()
+        self._shared_memories.clear()
@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+
+@dataclass(frozen=True)
+class ProfileEvent:
+    """Timed span of work recorded by a profiler.
+
+    Attributes:
+        name (str): Phase name.
+        start (float): Start time in seconds, relative to the creation of the profiler.
+        duration (float): Duration in seconds.
+        thread_id (int): Identifier of the thread that did the work.
+        attributes (dict[str, Any]): Additional information about the span, such as feature names or row counts.
+        allocated_bytes (Optional[int]): Net memory allocated during the span, if allocations are traced.
+    """
+
+    name: str
+    start: float
+    duration: float
+    thread_id: int
+    attributes: dict[str, Any] = field(default_factory=dict)
+    allocated_bytes: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class PhaseStats:
+    """Summary statistics of the spans of one phase.
+
+    Attributes:
+        count (int): Number of spans.
+        total_seconds (float): Total duration.
+        max_seconds (float): Longest duration.
+        allocated_bytes (Optional[int]): Total net memory allocated, if allocations are traced.
+    """
+
+    count: int
+    total_seconds: float
+    max_seconds: float
+    allocated_bytes: Optional[int] = None
+
+    @property
+    def mean_seconds(self) -> float:
+        """Mean duration."""
+        return self.total_seconds / self.count
+
+
+@dataclass
+class Profiler:
+    """Records timings of the phases of evaluation.
+
+    An evaluator only calls into its profiler when one is set, so evaluation without a profiler does no
+    instrumentation work.
+
+    Attributes:
+        trace_allocations (bool): Whether to record the net memory allocated during each span with tracemalloc.
+            Tracing allocations slows down evaluation considerably.
+        events (list[ProfileEvent]): Recorded spans.
+    """
+
+    trace_allocations: bool = False
+    events: list[ProfileEvent] = field(default_factory=list)
+    _origin: float = field(default_factory=time.perf_counter, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Start tracing allocations if enabled."""
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+        """Record the duration of a block of work.
+
+        Args:
+            name (str): Phase name.
+            **attributes (Any): Additional information about the span.
+
+        Yields:
+            dict[str, Any]: Attributes of the span, which can be extended inside the block.
+        """
+        allocated_start = tracemalloc.get_traced_memory()[0] if self.trace_allocations else 0
+        start = time.perf_counter()
+        try:
+            yield attributes
+        finally:
+            duration = time.perf_counter() - start
+            allocated_bytes = None
+            if self.trace_allocations:
+                allocated_bytes = tracemalloc.get_traced_memory()[0] - allocated_start
+            event = ProfileEvent(
+                name=name,
+                start=start - self._origin,
+                duration=duration,
+                thread_id=threading.get_ident(),
+                attributes=attributes,
+                allocated_bytes=allocated_bytes,
+            )
+            self.events.append(event)
+
+    def summarize(self) -> dict[str, PhaseStats]:
+        """Summarize the recorded spans by phase.
+
+        Returns:
+            dict[str, PhaseStats]: Statistics of each phase, in order of first appearance.
+        """
+        events_by_name: dict[str, list[ProfileEvent]] = {}
+        for event in self.events:
+            events_by_name.setdefault(event.name, []).append(event)
+
+        summary = {}
+        for name, events in events_by_name.items():
+            allocated_bytes = None
+            if self.trace_allocations:
+                allocated_bytes = sum(event.allocated_bytes or 0 for event in events)
+            summary[name] = PhaseStats(
+                count=len(events),
+                total_seconds=sum(event.duration for event in events),
+                max_seconds=max(event.duration for event in events),
+                allocated_bytes=allocated_bytes,
+            )
+        return summary
+
+    def to_metrics(self) -> list[dict[str, Any]]:
+        """Export the recorded spans as structured metrics.
+
+        Returns:
+            list[dict[str, Any]]: One record per span.
+        """
+        return [
+            {
+                "name": event.name,
+                "start": event.start,
+                "duration": event.duration,
+                "thread_id": event.thread_id,
+                "allocated_bytes": event.allocated_bytes,
+                **event.attributes,
+            }
+            for event in self.events
+        ]
+
+    def save_metrics(self, filepath: Path) -> None:
+        """Save the phase summary and the recorded spans as JSON.
+
+        Args:
+            filepath (Path): Path to the metrics file.
+        """
+        summary = {
+            name: {**asdict(stats), "mean_seconds": stats.mean_seconds} for name, stats in self.summarize().items()
+        }
+        with filepath.open("w") as file:
+            json.dump({"summary": summary, "events": self.to_metrics()}, file, indent=2, default=str)
+
+    def save_trace(self, filepath: Path) -> None:
+        """Save the recorded spans in the Chrome trace event format.
+
+        The file can be opened in chrome://tracing or https://ui.perfetto.dev.
+
+        Args:
+            filepath (Path): Path to the trace file.
+        """
+        trace_events = []
+        for event in self.events:
+            args = dict(event.attributes)
+            if event.allocated_bytes is not None:
+                args["allocated_bytes"] = event.allocated_bytes
+            trace_events.append(
+                {
+                    "name": event.name,
+                    "ph": "X",
+                    "ts": event.start * 1e6,
+                    "dur": event.duration * 1e6,
+                    "pid": os.getpid(),
+                    "tid": event.thread_id,
+                    "args": args,
+                }
+            )
+        with filepath.open("w") as file:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, file, default=str)
+
+    def close(self) -> None:
+        """Stop tracing allocations."""
+        if self.trace_allocations and tracemalloc.is_tracing():
+            tracemalloc.stop()
@@ -1,24 +1,85 @@
-from pydantic import BaseModel
+from dataclasses import dataclass, field
+from typing import Optional
 
 from surv.dataset.feature import Feature
 
 
-class Result(BaseModel):
-    """Evaluation result."""
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Result:
+    """Evaluation result.
 
+    Results are plain immutable data on the serving path. Serialization goes through pydantic at the IO boundary,
+    see EvaluationCache.
 
+    Attributes:
+        posterior (dict[str, float]): Probability of each target category given the answers so far, estimated from
+            the weighted target counts of the matching rows. Empty if no rows match. Cached results are shared between
+            sessions, so the posterior must not be mutated, copy it before handing it out.
+    """
+
+    posterior: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def most_likely_category(self) -> Optional[str]:
+        """Target category with the highest posterior probability, if any rows match."""
+        if not self.posterior:
+            return None
+        return max(self.posterior, key=self.posterior.__getitem__)
+
+    def apply_stopping_rule(self, n_answers: int, max_questions: int, information_gain_threshold: float) -> "Result":
+        """End the survey at a question that is not worth asking, predicting the most likely category.
+
+        A question is not asked once max_questions questions have been answered, or if its information gain is below
+        the threshold. The CLI, the simulator, the compiler and the survey service all stop surveys with this rule,
+        so that the simulated accuracy describes what respondents are told.
+
+        Args:
+            n_answers (int): Number of questions answered so far.
+            max_questions (int): Maximum number of questions to ask.
+            information_gain_threshold (float): Questions with a lower information gain are not asked.
+
+        Returns:
+            Result: This result if the survey goes on or is already over. Otherwise a Terminal result with the most
+                likely category, or an Unknown result if no rows match.
+        """
+        if not isinstance(self, Continue):
+            return self
+        if n_answers < max_questions and self.information_gain >= information_gain_threshold:
+            return self
+        category = self.most_likely_category
+        if category is None:
+            return Unknown(posterior=self.posterior)
+        return Terminal(category=category, posterior=self.posterior)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
 class Continue(Result):
-    """Continue evaluation result."""
+    """Continue evaluation result.
+
+    Attributes:
+        feature (Feature): Feature to collect next.
+        information_gain (float): Expected information gain of collecting the feature.
+        threshold (Optional[float]): Threshold to compare the value of a numeric feature against.
+    """
 
     feature: Feature
     information_gain: float
+    threshold: Optional[float] = None
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
 class Terminal(Result):
-    """Terminal evaluation result."""
+    """Terminal evaluation result.
+
+    Attributes:
+        category (str): Predicted target category. Either every matching row has this target, its posterior
+            probability is high enough to end the survey, or it is the most likely category when no question is
+            worth asking, see Result.apply_stopping_rule.
+    """
 
     category: str
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
 class Unknown(Result):
-    """Unknown evaluation result."""
+    """Unknown evaluation result, when no rows match the answers."""
@@ -0,0 +1,63 @@
+import copy
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from surv.algo.constraints import Constraint
+from surv.algo.evaluator import Evaluator
+from surv.algo.profiler import Profiler
+from surv.dataset.dataset import Dataset
+
+
+@dataclass
+class Session:
+    """Survey session.
+
+    Keeps track of the constraints collected so far along with the indices of the dataset rows that match them.
+    Adding a constraint narrows down the surviving rows instead of filtering the full dataset again.
+
+    Attributes:
+        dataset (Dataset): Dataset the survey is based on.
+        constraints (list[Constraint]): Constraints collected so far.
+        rows (np.ndarray): Indices of the dataset rows that match all constraints.
+        profiler (Optional[Profiler]): Records the rows surviving each constraint as it is added.
+    """
+
+    dataset: Dataset
+    constraints: list[Constraint] = field(default_factory=list)
+    rows: np.ndarray = field(init=False, repr=False)
+    profiler: Optional[Profiler] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Filter the dataset rows by the initial constraints."""
+        self.constraints = list(self.constraints)
+        self.rows = Evaluator.filter_rows(self.dataset, self.constraints, profiler=self.profiler)
+
+    def add_constraint(self, constraint: Constraint) -> None:
+        """Add a constraint to the session.
+
+        Args:
+            constraint (Constraint): Constraint to add.
+        """
+        self.rows = Evaluator.filter_rows(self.dataset, [constraint], self.rows, self.profiler)
+        self.constraints.append(constraint)
+
+    def branch(self, constraint: Constraint) -> "Session":
+        """Create a new session with an additional constraint, leaving this session unchanged.
+
+        Args:
+            constraint (Constraint): Constraint to add to the new session.
+
+        Returns:
+            Session: The new session.
+        """
+        session = copy.copy(self)
+        session.constraints = [*self.constraints, constraint]
+        session.rows = Evaluator.filter_rows(self.dataset, [constraint], self.rows, self.profiler)
+        return session
+
+    @property
+    def n_samples(self) -> int:
+        """Number of dataset samples that match the session constraints."""
+        return self.rows.shape[0]
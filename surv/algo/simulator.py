@@ -0,0 +1,161 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from surv.algo.constraints import EqConstraint, GtConstraint, LtConstraint, SkipConstraint
+from surv.algo.evaluator import Evaluator
+from surv.algo.result import Continue, Terminal, Unknown
+from surv.algo.session import Session
+from surv.dataset.dataset import Dataset
+from surv.dataset.feature import Feature
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SimulationReport:
+    """Results of replaying the survey for a set of respondents.
+
+    Attributes:
+        n_respondents (float): Number of respondents, weighted by the dataset weights.
+        mean_questions (float): Mean number of questions asked per respondent.
+        max_questions (int): Largest number of questions asked to any respondent.
+        accuracy (float): Fraction of respondents whose target was predicted correctly.
+        unknown_rate (float): Fraction of respondents whose survey ended without a prediction.
+        n_evaluations (int): Number of evaluations run.
+        seconds (float): Wall time of the simulation.
+    """
+
+    n_respondents: float
+    mean_questions: float
+    max_questions: int
+    accuracy: float
+    unknown_rate: float
+    n_evaluations: int
+    seconds: float
+
+
+@dataclass
+class Simulator:
+    """Batch survey simulator.
+
+    Treats each row of a respondents dataset as a respondent that answers every question with its own values, and
+    skips the questions about features whose value is missing.
+    Respondents that gave the same answers so far share a session, so every node of the survey tree that some
+    respondent reaches is evaluated exactly once, no matter how many respondents pass through it.
+
+    Attributes:
+        evaluator (Evaluator): Evaluator used to select questions.
+        max_questions (Optional[int]): Maximum number of questions asked to a respondent.
+        information_gain_threshold (float): Questions with a lower information gain are not asked.
+    """
+
+    evaluator: Evaluator = field(default_factory=Evaluator)
+    max_questions: Optional[int] = None
+    information_gain_threshold: float = 0.0
+
+    def simulate(self, dataset: Dataset, respondents: Optional[Dataset] = None) -> SimulationReport:
+        """Replay the survey for every respondent.
+
+        Args:
+            dataset (Dataset): Dataset the survey is based on.
+            respondents (Optional[Dataset]): Respondents with the same features as the dataset, for example held-out
+                rows. Defaults to the rows of the dataset itself.
+
+        Returns:
+            SimulationReport: Questions asked and accuracy over all respondents.
+        """
+        start = time.perf_counter()
+        respondents = dataset if respondents is None else respondents
+        predictions, n_questions, n_evaluations = self.predict(dataset, respondents)
+        seconds = time.perf_counter() - start
+
+        target_feature_name = dataset.feature_info.target_feature_name
+        targets = respondents.get_codes(target_feature_name)
+        weights = respondents.weights if respondents.weights is not None else np.ones(respondents.n_samples)
+        n_respondents = float(weights.sum())
+        if n_respondents == 0:
+            msg = "Cannot simulate a survey without respondents."
+            raise ValueError(msg)
+
+        report = SimulationReport(
+            n_respondents=n_respondents,
+            mean_questions=float(np.dot(weights, n_questions) / n_respondents),
+            max_questions=int(n_questions.max()),
+            accuracy=float(weights[predictions == targets].sum() / n_respondents),
+            unknown_rate=float(weights[predictions < 0].sum() / n_respondents),
+            n_evaluations=n_evaluations,
+            seconds=seconds,
+        )
+        logger.info("Simulation report: %s", report)
+        return report
+
+    def predict(self, dataset: Dataset, respondents: Dataset) -> tuple[np.ndarray, np.ndarray, int]:
+        """Run the survey for every respondent.
+
+        Args:
+            dataset (Dataset): Dataset the survey is based on.
+            respondents (Dataset): Respondents with the same features as the dataset.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, int]: Predicted target code of each respondent, -1 if the survey ended
+                without a prediction, the number of questions asked to each respondent, and the number of evaluations.
+        """
+        target_categories = dataset.get_categories(dataset.feature_info.target_feature_name)
+        max_questions = dataset.n_training_features
+        if self.max_questions is not None:
+            max_questions = min(max_questions, self.max_questions)
+
+        predictions = np.full(respondents.n_samples, -1, dtype=np.intp)
+        n_questions = np.zeros(respondents.n_samples, dtype=np.intp)
+        n_evaluations = 0
+        stack = [(Session(dataset), np.arange(respondents.n_samples))]
+        while stack:
+            session, group = stack.pop()
+            result = self.evaluator.evaluate_session(session).apply_stopping_rule(
+                len(session.constraints), max_questions, self.information_gain_threshold
+            )
+            n_evaluations += 1
+            match result:
+                case Terminal(category=category):
+                    predictions[group] = target_categories.index(category)
+                case Unknown():
+                    pass
+                case Continue(feature=feature, threshold=threshold):
+                    n_questions[group] += 1
+                    stack.extend(self._branch(session, respondents, group, feature, threshold))
+        return predictions, n_questions, n_evaluations
+
+    @staticmethod
+    def _branch(
+        session: Session,
+        respondents: Dataset,
+        group: np.ndarray,
+        feature: Feature,
+        threshold: Optional[float],
+    ) -> list[tuple[Session, np.ndarray]]:
+        """Split a group of respondents by their answer to a question, with one session per answer."""
+        branches = []
+        if threshold is None:
+            categories = respondents.get_categories(feature.name)
+            answers = respondents.get_codes(feature.name)[group]
+            for code in np.unique(answers[answers >= 0]):
+                child_session = session.branch(EqConstraint(feature=feature, value=categories[code]))
+                branches.append((child_session, group[answers == code]))
+            is_missing = answers < 0
+        else:
+            values = respondents.get_column(feature.name)[group].astype(np.float64)
+            # Values equal to the threshold are answered as greater than it, like in the CLI and the survey tree.
+            is_less = values < threshold
+            is_greater = values >= threshold
+            if is_less.any():
+                branches.append((session.branch(LtConstraint(feature=feature, value=threshold)), group[is_less]))
+            if is_greater.any():
+                branches.append((session.branch(GtConstraint(feature=feature, value=threshold)), group[is_greater]))
+            is_missing = ~(is_less | is_greater)
+        if is_missing.any():
+            branches.append((session.branch(SkipConstraint(feature=feature)), group[is_missing]))
+        return branches
@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Split:
+    """Candidate split of the dataset rows on a feature.
+
+    Attributes:
+        information_gain (float): Information gain of the split.
+        threshold (Optional[float]): Threshold that numeric feature values are compared against.
+    """
+
+    information_gain: float
+    threshold: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class Targets:
+    """Target values of the dataset rows being split.
+
+    Attributes:
+        codes (np.ndarray): Target codes of the rows.
+        n_categories (int): Number of target categories.
+        weights (Optional[np.ndarray]): Sample weights of the rows. Defaults to a weight of 1 per row.
+    """
+
+    codes: np.ndarray
+    n_categories: int
+    weights: Optional[np.ndarray] = None
@@ -0,0 +1,223 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Union
+
+SURVEY_TREE_FORMAT_VERSION = 1
+
+LESS_THAN = "lt"
+GREATER_THAN = "gt"
+
+
+@dataclass(frozen=True, slots=True)
+class SurveyQuestion:
+    """Question asked at a node of a survey tree.
+
+    Attributes:
+        feature_name (str): Name of the feature the question collects.
+        question (Optional[str]): Question text.
+        categories (tuple[str, ...]): Possible answers.
+    """
+
+    feature_name: str
+    question: Optional[str]
+    categories: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class ContinueNode:
+    """Survey tree node that asks a question.
+
+    Attributes:
+        question (SurveyQuestion): Question to ask.
+        information_gain (float): Information gain of the question.
+        children (dict[str, SurveyNode]): Child node for each answer. Numeric questions have a child for answers
+            less than and greater than the threshold.
+        threshold (Optional[float]): Threshold that answers to a numeric question are compared against.
+    """
+
+    question: SurveyQuestion
+    information_gain: float
+    children: dict[str, "SurveyNode"]
+    threshold: Optional[float] = None
+
+    def next(self, answer: str) -> "SurveyNode":
+        """Get the next node for an answer.
+
+        Args:
+            answer (str): Answer to the question.
+
+        Returns:
+            SurveyNode: Child node for the answer.
+        """
+        if self.threshold is not None:
+            return self.children[LESS_THAN if float(answer) < self.threshold else GREATER_THAN]
+        if answer not in self.children:
+            msg = f"Answer '{answer}' is not valid for question '{self.question.feature_name}'."
+            raise ValueError(msg)
+        return self.children[answer]
+
+
+@dataclass(frozen=True, slots=True)
+class TerminalNode:
+    """Survey tree node where the target category is known.
+
+    Attributes:
+        category (str): Target category.
+    """
+
+    category: str
+
+
+@dataclass(frozen=True, slots=True)
+class UnknownNode:
+    """Survey tree node where no more useful questions can be asked."""
+
+
+SurveyNode = Union[ContinueNode, TerminalNode, UnknownNode]
+
+
+@dataclass(frozen=True, slots=True)
+class SurveyTree:
+    """Precompiled survey decision tree.
+
+    Traversing the tree only depends on the standard library, so compiled surveys can be served without loading
+    the dataset or running any pandas or numpy computation per respondent.
+
+    Attributes:
+        root (SurveyNode): Root node of the tree.
+        target_feature_name (str): Name of the target feature.
+    """
+
+    root: SurveyNode
+    target_feature_name: str
+
+    def traverse(self, answers: dict[str, str]) -> SurveyNode:
+        """Follow the answers from the root until a question without an answer or a leaf is reached.
+
+        Args:
+            answers (dict[str, str]): Answers keyed by feature name.
+
+        Returns:
+            SurveyNode: Node where the traversal stopped.
+        """
+        node = self.root
+        while isinstance(node, ContinueNode) and node.question.feature_name in answers:
+            node = node.next(answers[node.question.feature_name])
+        return node
+
+    def save(self, filepath: Path) -> None:
+        """Save the survey tree to a file.
+
+        Nodes are stored in a flat list in depth-first order with children referenced by index.
+        Questions are deduplicated into a separate list and referenced by index.
+
+        Args:
+            filepath (Path): Path to the output file.
+        """
+        questions: list[SurveyQuestion] = []
+        question_ids: dict[SurveyQuestion, int] = {}
+        nodes: list[list[Any]] = []
+
+        def add_node(node: SurveyNode) -> int:
+            node_id = len(nodes)
+            match node:
+                case ContinueNode(question=question, information_gain=information_gain, children=children):
+                    if question not in question_ids:
+                        question_ids[question] = len(questions)
+                        questions.append(question)
+                    if node.threshold is None:
+                        record: list[Any] = ["c", question_ids[question], information_gain]
+                        nodes.append(record)
+                        record.append([add_node(children[category]) for category in question.categories])
+                    else:
+                        record = ["n", question_ids[question], information_gain]
+                        nodes.append(record)
+                        record.append([add_node(children[LESS_THAN]), add_node(children[GREATER_THAN])])
+                        record.append(node.threshold)
+                case TerminalNode(category=category):
+                    nodes.append(["t", category])
+                case UnknownNode():
+                    nodes.append(["u"])
+            return node_id
+
+        add_node(self.root)
+        data = {
+            "version": SURVEY_TREE_FORMAT_VERSION,
+            "target_feature_name": self.target_feature_name,
+            "questions": [[q.feature_name, q.question, list(q.categories)] for q in questions],
+            "nodes": nodes,
+        }
+        with filepath.open("w") as file:
+            json.dump(data, file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, filepath: Path) -> "SurveyTree":
+        """Load a survey tree from a file.
+
+        Args:
+            filepath (Path): Path to the survey tree file.
+
+        Returns:
+            SurveyTree: The loaded survey tree.
+        """
+        with filepath.open("r") as file:
+            data = json.load(file)
+
+        if data["version"] != SURVEY_TREE_FORMAT_VERSION:
+            msg = f"Unsupported survey tree format version: {data['version']}."
+            raise ValueError(msg)
+
+        questions = [
+            SurveyQuestion(feature_name=feature_name, question=question, categories=tuple(categories))
+            for feature_name, question, categories in data["questions"]
+        ]
+        records = data["nodes"]
+        nodes: list[Optional[SurveyNode]] = [None] * len(records)
+
+        # Children always come after their parent, so build nodes back to front.
+        for node_id in range(len(records) - 1, -1, -1):
+            record = records[node_id]
+            match record[0]:
+                case "c":
+                    question = questions[record[1]]
+                    children = {}
+                    for category, child_id in zip(question.categories, record[3], strict=True):
+                        child = nodes[child_id]
+                        assert child is not None
+                        children[category] = child
+                    nodes[node_id] = ContinueNode(question=question, information_gain=record[2], children=children)
+                case "n":
+                    question = questions[record[1]]
+                    less_than_node, greater_than_node = nodes[record[3][0]], nodes[record[3][1]]
+                    assert less_than_node is not None
+                    assert greater_than_node is not None
+                    nodes[node_id] = ContinueNode(
+                        question=question,
+                        information_gain=record[2],
+                        children={LESS_THAN: less_than_node, GREATER_THAN: greater_than_node},
+                        threshold=record[4],
+                    )
+                case "t":
+                    nodes[node_id] = TerminalNode(category=record[1])
+                case "u":
+                    nodes[node_id] = UnknownNode()
+                case kind:
+                    msg = f"Unknown survey tree node kind: {kind}."
+                    raise ValueError(msg)
+
+        root = nodes[0]
+        assert root is not None
+        return cls(root=root, target_feature_name=data["target_feature_name"])
+
+    @property
+    def n_nodes(self) -> int:
+        """Number of nodes in the tree."""
+        n = 0
+        stack: list[SurveyNode] = [self.root]
+        while stack:
+            node = stack.pop()
+            n += 1
+            if isinstance(node, ContinueNode):
+                stack.extend(node.children.values())
+        return n
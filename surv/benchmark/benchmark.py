@@ -0,0 +1,293 @@
+import logging
+import platform
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from surv.algo.constraints import Constraint, EqConstraint, GtConstraint, LtConstraint, SkipConstraint
+from surv.algo.evaluator import Evaluator
+from surv.algo.result import Continue
+from surv.algo.session import Session
+from surv.benchmark.synthetic import SyntheticDatasetConfig, write_dataset
+from surv.dataset.dataset import MISSING_CODE, Dataset
+from surv.dataset.feature_types import Categorical
+
+logger = logging.getLogger(__name__)
+
+
+class BenchmarkResult(BaseModel):
+    """Timing and memory measurements of a benchmark case.
+
+    Attributes:
+        name (str): Benchmark case name.
+        n_runs (int): Number of timed runs.
+        mean_seconds (float): Mean duration of a run.
+        min_seconds (float): Duration of the fastest run.
+        n_items (int): Number of items, rows or sessions, processed by each run.
+        throughput (float): Items processed per second in the fastest run.
+        peak_memory_bytes (int): Peak memory allocated during a run.
+    """
+
+    name: str
+    n_runs: int
+    mean_seconds: float
+    min_seconds: float
+    n_items: int
+    throughput: float
+    peak_memory_bytes: int
+
+
+class Regression(BaseModel):
+    """Benchmark measurement that got worse than its baseline.
+
+    Attributes:
+        name (str): Benchmark case name.
+        metric (str): Name of the measurement that regressed.
+        baseline (float): Baseline measurement.
+        current (float): Current measurement.
+    """
+
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        """Ratio of the current measurement to the baseline."""
+        return self.current / self.baseline
+
+
+class BenchmarkReport(BaseModel):
+    """Results of a benchmark run.
+
+    Attributes:
+        config (SyntheticDatasetConfig): Configuration of the benchmark dataset.
+        environment (dict[str, str]): Versions of Python and the numerical libraries used.
+        results (list[BenchmarkResult]): Results of each benchmark case.
+    """
+
+    config: SyntheticDatasetConfig
+    environment: dict[str, str]
+    results: list[BenchmarkResult]
+
+    def save(self, filepath: Path) -> None:
+        """Save the report as a JSON baseline.
+
+        Args:
+            filepath (Path): Path to the JSON file.
+        """
+        filepath.write_text(self.model_dump_json(indent=2))
+
+    @classmethod
+    def load(cls, filepath: Path) -> "BenchmarkReport":
+        """Load a report from a JSON baseline.
+
+        Args:
+            filepath (Path): Path to the JSON file.
+
+        Returns:
+            BenchmarkReport: The loaded report.
+        """
+        return cls.model_validate_json(filepath.read_text())
+
+    def compare(self, baseline: "BenchmarkReport", tolerance: float = 0.2) -> list[Regression]:
+        """Compare the report to a baseline.
+
+        The fastest run is compared rather than the mean because it is the least affected by other load on the machine.
+
+        Args:
+            baseline (BenchmarkReport): Baseline report.
+            tolerance (float): Allowed relative increase of run time and peak memory.
+
+        Returns:
+            list[Regression]: Measurements that increased by more than the tolerance.
+        """
+        if baseline.config != self.config:
+            msg = "Benchmark reports with different dataset configurations cannot be compared."
+            raise ValueError(msg)
+
+        baseline_results = {result.name: result for result in baseline.results}
+        regressions = []
+        for result in self.results:
+            baseline_result = baseline_results.get(result.name)
+            if baseline_result is None:
+                continue
+            for metric in ["min_seconds", "peak_memory_bytes"]:
+                baseline_value = getattr(baseline_result, metric)
+                current_value = getattr(result, metric)
+                if baseline_value > 0 and current_value > baseline_value * (1 + tolerance):
+                    regressions.append(
+                        Regression(name=result.name, metric=metric, baseline=baseline_value, current=current_value)
+                    )
+        return regressions
+
+
+@dataclass
+class Benchmark:
+    """Benchmark of dataset loading, evaluation and survey sessions on a generated dataset.
+
+    Each case is timed over several runs. Peak memory is measured in one extra run with tracemalloc, which slows
+    down allocations and so is not part of the timed runs.
+
+    Attributes:
+        config (SyntheticDatasetConfig): Configuration of the benchmark dataset.
+        evaluator (Evaluator): Evaluator to benchmark.
+        n_runs (int): Number of timed runs of each case.
+        constraint_depths (tuple[int, ...]): Numbers of constraints to benchmark evaluation with.
+        n_sessions (int): Number of simulated survey sessions in each run of the session case.
+    """
+
+    config: SyntheticDatasetConfig = field(default_factory=SyntheticDatasetConfig)
+    evaluator: Evaluator = field(default_factory=Evaluator)
+    n_runs: int = 5
+    constraint_depths: tuple[int, ...] = (0, 1, 2, 4)
+    n_sessions: int = 20
+
+    def run(self, work_dirpath: Path) -> BenchmarkReport:
+        """Run all benchmark cases.
+
+        Args:
+            work_dirpath (Path): Directory to write the generated dataset files to.
+
+        Returns:
+            BenchmarkReport: Benchmark results.
+        """
+        tabular_filepath, feature_info_filepath = write_dataset(self.config, work_dirpath)
+        n_samples = self.config.n_samples
+
+        results = [
+            self.measure("load", partial(Dataset.from_files, tabular_filepath, feature_info_filepath), n_samples),
+        ]
+        dataset = Dataset.from_files(tabular_filepath, feature_info_filepath)
+        results.append(self.measure("validate", dataset.validate, n_samples))
+
+        rng = np.random.default_rng(self.config.seed)
+        for depth in self.constraint_depths:
+            row = int(rng.integers(dataset.n_samples))
+            constraints = simulate_session(self.evaluator, dataset, row, max_questions=depth).constraints
+            if len(constraints) < depth:
+                logger.warning("Survey for row %d ended after %d of %d questions", row, len(constraints), depth)
+            results.append(
+                self.measure(
+                    f"evaluate_depth_{depth}",
+                    partial(self.evaluator.evaluate, dataset, constraints),
+                    n_samples,
+                )
+            )
+
+        rows = rng.integers(dataset.n_samples, size=self.n_sessions)
+        results.append(
+            self.measure(
+                "session",
+                lambda: [simulate_session(self.evaluator, dataset, int(row)) for row in rows],
+                self.n_sessions,
+            )
+        )
+
+        environment = {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+        }
+        return BenchmarkReport(config=self.config, environment=environment, results=results)
+
+    def measure(self, name: str, func: Callable[[], Any], n_items: int) -> BenchmarkResult:
+        """Measure the run time and peak memory of a benchmark case.
+
+        Args:
+            name (str): Benchmark case name.
+            func (Callable[[], Any]): Function that runs the case once.
+            n_items (int): Number of items processed by each run.
+
+        Returns:
+            BenchmarkResult: Benchmark case measurements.
+        """
+        durations = []
+        for _ in range(self.n_runs):
+            start = time.perf_counter()
+            func()
+            durations.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            func()
+            _, peak_memory_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        min_seconds = min(durations)
+        result = BenchmarkResult(
+            name=name,
+            n_runs=self.n_runs,
+            mean_seconds=sum(durations) / len(durations),
+            min_seconds=min_seconds,
+            n_items=n_items,
+            throughput=n_items / min_seconds if min_seconds > 0 else float("inf"),
+            peak_memory_bytes=peak_memory_bytes,
+        )
+        logger.info("Benchmark %s: %f s, %d bytes", name, result.min_seconds, result.peak_memory_bytes)
+        return result
+
+
+def simulate_session(
+    evaluator: Evaluator,
+    dataset: Dataset,
+    row: int,
+    max_questions: Optional[int] = None,
+) -> Session:
+    """Run a survey session answering every question with the values of a dataset row.
+
+    Args:
+        evaluator (Evaluator): Evaluator used to select questions.
+        dataset (Dataset): Dataset the survey is based on.
+        row (int): Index of the row that answers the questions.
+        max_questions (Optional[int]): Maximum number of questions to answer. Defaults to no limit.
+
+    Returns:
+        Session: The session with a constraint for every answered question.
+    """
+    session = Session(dataset)
+    max_questions = dataset.n_training_features if max_questions is None else max_questions
+    while len(session.constraints) < max_questions:
+        result = evaluator.evaluate_session(session)
+        if not isinstance(result, Continue):
+            break
+        session.add_constraint(get_answer(dataset, row, result))
+    return session
+
+
+def get_answer(dataset: Dataset, row: int, result: Continue) -> Constraint:
+    """Answer a survey question with the value of a dataset row, skipping the question if the value is missing.
+
+    Args:
+        dataset (Dataset): Dataset the survey is based on.
+        row (int): Index of the row that answers the question.
+        result (Continue): Evaluation result with the question to answer.
+
+    Returns:
+        Constraint: The answer.
+    """
+    feature = result.feature
+    if isinstance(feature.type, Categorical):
+        code = dataset.get_codes(feature.name)[row]
+        if code == MISSING_CODE:
+            return SkipConstraint(feature=feature)
+        return EqConstraint(feature=feature, value=dataset.get_categories(feature.name)[code])
+    value = float(dataset.get_column(feature.name)[row])
+    if np.isnan(value):
+        return SkipConstraint(feature=feature)
+    if result.threshold is None:
+        return EqConstraint(feature=feature, value=str(value))
+    if value < result.threshold:
+        return LtConstraint(feature=feature, value=result.threshold)
+    return GtConstraint(feature=feature, value=result.threshold)
@@ -0,0 +1,116 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from surv.dataset.feature_info import FeatureInfo
+
+TARGET_FEATURE_NAME = "target"
+
+
+class SyntheticDatasetConfig(BaseModel):
+    """Configuration of a generated benchmark dataset.
+
+    The target is a noisy function of the first few training features so that evaluation has informative features to
+    find and survey sessions ask several questions before reaching a decision.
+
+    Attributes:
+        n_samples (int): Number of rows.
+        n_categorical_features (int): Number of categorical training features.
+        n_numeric_features (int): Number of numeric training features.
+        n_categories (int): Number of categories of each categorical training feature.
+        n_targets (int): Number of target categories.
+        n_informative_features (int): Number of training features that the target depends on.
+        noise (float): Fraction of rows with a random target.
+        seed (int): Random seed.
+    """
+
+    n_samples: int = 10_000
+    n_categorical_features: int = 10
+    n_numeric_features: int = 0
+    n_categories: int = 4
+    n_targets: int = 4
+    n_informative_features: int = 3
+    noise: float = 0.1
+    seed: int = 0
+
+
+def generate_dataset(config: SyntheticDatasetConfig) -> tuple[pd.DataFrame, FeatureInfo]:
+    """Generate a random dataset.
+
+    Args:
+        config (SyntheticDatasetConfig): Dataset configuration.
+
+    Returns:
+        tuple[pd.DataFrame, FeatureInfo]: Tabular data and feature information.
+    """
+    rng = np.random.default_rng(config.seed)
+    columns = {}
+    features = []
+    signals = []
+
+    categories = [f"c{i}" for i in range(config.n_categories)]
+    for i in range(config.n_categorical_features):
+        name = f"categorical_{i}"
+        codes = rng.integers(config.n_categories, size=config.n_samples)
+        columns[name] = np.array(categories)[codes]
+        features.append(
+            {
+                "name": name,
+                "type": {"name": "categorical", "type": {"name": "multiclass"}, "categories": categories},
+                "purpose": {"name": "training"},
+            }
+        )
+        signals.append(codes)
+
+    for i in range(config.n_numeric_features):
+        name = f"numeric_{i}"
+        values = np.round(rng.normal(50.0, 15.0, size=config.n_samples), 1)
+        columns[name] = values
+        features.append(
+            {
+                "name": name,
+                "type": {"name": "numeric", "type": {"name": "ratio"}},
+                "purpose": {"name": "training"},
+            }
+        )
+        signals.append(np.digitize(values, np.quantile(values, np.linspace(0, 1, config.n_categories + 1)[1:-1])))
+
+    target_categories = [f"t{i}" for i in range(config.n_targets)]
+    target_codes = np.zeros(config.n_samples, dtype=np.int64)
+    for signal in signals[: config.n_informative_features]:
+        target_codes = target_codes * config.n_categories + signal
+    target_codes %= config.n_targets
+    noisy = rng.random(config.n_samples) < config.noise
+    target_codes[noisy] = rng.integers(config.n_targets, size=int(noisy.sum()))
+    columns[TARGET_FEATURE_NAME] = np.array(target_categories)[target_codes]
+    features.append(
+        {
+            "name": TARGET_FEATURE_NAME,
+            "type": {"name": "categorical", "type": {"name": "multiclass"}, "categories": target_categories},
+            "purpose": {"name": "target"},
+        }
+    )
+
+    feature_info = FeatureInfo(features=features, target_feature_name=TARGET_FEATURE_NAME)
+    return pd.DataFrame(columns), feature_info
+
+
+def write_dataset(config: SyntheticDatasetConfig, dataset_dirpath: Path) -> tuple[Path, Path]:
+    """Generate a random dataset and write it in the layout of the data directory.
+
+    Args:
+        config (SyntheticDatasetConfig): Dataset configuration.
+        dataset_dirpath (Path): Directory to write the dataset files to.
+
+    Returns:
+        tuple[Path, Path]: Paths to the tabular CSV file and the feature_info JSON file.
+    """
+    tabular, feature_info = generate_dataset(config)
+    dataset_dirpath.mkdir(parents=True, exist_ok=True)
+    tabular_filepath = dataset_dirpath / "tabular.csv"
+    feature_info_filepath = dataset_dirpath / "features.json"
+    tabular.to_csv(tabular_filepath, index=False)
+    feature_info_filepath.write_text(feature_info.model_dump_json(indent=2))
+    return tabular_filepath, feature_info_filepath
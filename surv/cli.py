@@ -1,19 +1,37 @@
+import asyncio
 import logging
+import tempfile
+from functools import partial
+from pathlib import Path
 from typing import Optional
 
 import click
 from rich.logging import RichHandler
 
-from surv.algo.constraints import Constraint, EqConstraint
-from surv.algo.evaluator import Evaluator
+from surv.algo.compiler import Compiler
+from surv.algo.constraints import Constraint, EqConstraint, GtConstraint, InConstraint, LtConstraint, SkipConstraint
+from surv.algo.evaluator import Evaluator, ExecutorName
+from surv.algo.profiler import Profiler
 from surv.algo.result import Continue, Terminal, Unknown
+from surv.algo.session import Session
+from surv.algo.simulator import Simulator
+from surv.benchmark.benchmark import Benchmark, BenchmarkReport
+from surv.benchmark.synthetic import SyntheticDatasetConfig
 from surv.dataset.dataset import Dataset
+from surv.dataset.dataset_cache import DatasetCache
+from surv.dataset.dataset_registry import DatasetRegistry
 from surv.dataset.feature import Feature
-from surv.dataset.feature_types import Categorical
+from surv.dataset.feature_types import Categorical, Numeric
+from surv.dataset.holdout import split_holdout
+from surv.service.http_server import SurveyHttpServer
+from surv.service.survey_service import SurveyService
 from surv.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Input that skips a question in the interactive survey.
+SKIP_INPUT = "s"
+
 
 @click.group()
 def main() -> None:
@@ -33,10 +51,21 @@ def set_logger_config(info: bool, debug: bool) -> None:
 
 @main.command(name="run")
 @click.argument("dataset-name")
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Profile evaluations and save the profile to this file.",
+)
+@click.option("--profile-format", type=click.Choice(["trace", "metrics"]), default="trace")
+@click.option("--profile-allocations", is_flag=True, help="Also trace memory allocations while profiling.")
 @click.option("--info", is_flag=True)
 @click.option("--debug", is_flag=True)
-def run_command(
+def run_command(  # noqa: PLR0913, PLR0917
     dataset_name: str,
+    profile: Optional[Path] = None,
+    profile_format: str = "trace",
+    profile_allocations: bool = False,
     info: bool = False,
     debug: bool = False,
 ) -> None:
@@ -44,67 +73,304 @@ def run_command(
     set_logger_config(info, debug)
 
     settings = Settings()
+    dataset = load_dataset(settings, dataset_name)
+
+    profiler = Profiler(trace_allocations=profile_allocations) if profile is not None else None
+    evaluator = create_evaluator(settings, profiler=profiler)
+    session = Session(dataset, profiler=profiler)
+    # The pools of the evaluator are shut down even if the survey is interrupted.
+    try:
+        while True:
+            result = evaluator.evaluate_session(session).apply_stopping_rule(
+                len(session.constraints), dataset.n_training_features, settings.information_gain_threshold
+            )
+            match result:
+                case Terminal(category=category, posterior=posterior):
+                    print_prediction(category, posterior[category])
+                    break
+                case Unknown():
+                    print("Dataset does not contain enough samples to make a decision")
+                    break
+                case Continue(feature=feature, information_gain=information_gain, threshold=threshold):
+                    logger.info("Found feature with highest information gain (%f): %s", information_gain, feature.name)
+                    constraint = accept_input(feature, threshold)
+                    session.add_constraint(constraint)
+                case _:
+                    raise NotImplementedError
+    finally:
+        evaluator.close()
+
+    if profiler is not None and profile is not None:
+        save_profile(profiler, profile, profile_format)
+
+    logger.info("Final constraints: %s", session.constraints)
+
+    target_feature = dataset.feature_info.target_feature
+    target_constraint = accept_input(target_feature)
+
+    logger.info("Target constraint: %s", target_constraint)
+
+    print_survey_summary(session.constraints, target_constraint)
+
+
+@main.command(name="compile")
+@click.argument("dataset-name")
+@click.argument("output-filepath", type=click.Path(dir_okay=False, path_type=Path))
+@click.option("--max-depth", type=int, default=None, help="Maximum number of questions asked on any path.")
+@click.option("--info", is_flag=True)
+@click.option("--debug", is_flag=True)
+def compile_command(
+    dataset_name: str,
+    output_filepath: Path,
+    max_depth: Optional[int] = None,
+    info: bool = False,
+    debug: bool = False,
+) -> None:
+    """Compile the survey decision tree for a dataset."""
+    set_logger_config(info, debug)
+
+    settings = Settings()
+    dataset = load_dataset(settings, dataset_name)
+
+    evaluator = create_evaluator(settings)
+    compiler = Compiler(
+        evaluator=evaluator,
+        max_depth=max_depth,
+        information_gain_threshold=settings.information_gain_threshold,
+    )
+    try:
+        survey_tree = compiler.compile(dataset)
+    finally:
+        evaluator.close()
+    survey_tree.save(output_filepath)
+    print(f"Compiled survey tree with {survey_tree.n_nodes} nodes to {output_filepath}")
+
+
+@main.command(name="simulate")
+@click.argument("dataset-name")
+@click.option("--holdout", type=float, default=None, help="Fraction of rows held out as respondents.")
+@click.option("--seed", type=int, default=0, help="Random seed of the holdout split.")
+@click.option("--max-questions", type=int, default=None, help="Maximum number of questions asked to a respondent.")
+@click.option("--info", is_flag=True)
+@click.option("--debug", is_flag=True)
+def simulate_command(  # noqa: PLR0913, PLR0917
+    dataset_name: str,
+    holdout: Optional[float] = None,
+    seed: int = 0,
+    max_questions: Optional[int] = None,
+    info: bool = False,
+    debug: bool = False,
+) -> None:
+    """Replay the survey with every dataset row as a respondent."""
+    set_logger_config(info, debug)
+
+    settings = Settings()
+    dataset = load_dataset(settings, dataset_name)
+    respondents = None
+    if holdout is not None:
+        training_rows, holdout_rows = split_holdout(dataset, holdout, seed=seed)
+        dataset, respondents = dataset.take(training_rows), dataset.take(holdout_rows)
+
+    evaluator = create_evaluator(settings)
+    simulator = Simulator(
+        evaluator=evaluator,
+        max_questions=max_questions,
+        information_gain_threshold=settings.information_gain_threshold,
+    )
+    try:
+        report = simulator.simulate(dataset, respondents)
+    finally:
+        evaluator.close()
+
+    print(f"Respondents: {report.n_respondents:g}")
+    print(f"Questions per respondent: {report.mean_questions:.2f} (max {report.max_questions})")
+    print(f"Accuracy: {report.accuracy:.2%}")
+    print(f"Unknown: {report.unknown_rate:.2%}")
+    print(f"Evaluations: {report.n_evaluations}")
+    print(f"Wall time: {report.seconds:.3f} s")
+
+
+@main.command(name="serve")
+@click.option("--host", type=str, default="127.0.0.1", help="Host to listen on.")
+@click.option("--port", type=int, default=8000, help="Port to listen on.")
+@click.option("--workers", type=int, default=None, help="Number of evaluation worker threads.")
+@click.option("--info", is_flag=True)
+@click.option("--debug", is_flag=True)
+def serve_command(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: Optional[int] = None,
+    info: bool = False,
+    debug: bool = False,
+) -> None:
+    """Serve surveys over HTTP."""
+    set_logger_config(info, debug)
+
+    settings = Settings()
+    dataset_registry = DatasetRegistry(
+        data_dirpath=settings.data_dirpath,
+        dataset_loader=partial(load_dataset, settings),
+        max_memory_bytes=settings.dataset_memory_budget,
+        reload_interval=settings.dataset_reload_interval,
+    )
+    logger.info("Serving datasets %s", ", ".join(dataset_registry.discover()))
+    service = SurveyService(
+        dataset_loader=dataset_registry.get,
+        evaluator=create_evaluator(settings),
+        information_gain_threshold=settings.information_gain_threshold,
+        n_workers=workers,
+    )
+    server = SurveyHttpServer(service, host=host, port=port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+@main.command(name="benchmark")
+@click.argument("output-filepath", type=click.Path(dir_okay=False, path_type=Path))
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False, path_type=Path), default=None)
+@click.option("--tolerance", type=float, default=0.2, help="Allowed relative slowdown compared to the baseline.")
+@click.option("--samples", type=int, default=10_000, help="Number of rows of the generated dataset.")
+@click.option("--categorical-features", type=int, default=10, help="Number of categorical training features.")
+@click.option("--numeric-features", type=int, default=0, help="Number of numeric training features.")
+@click.option("--categories", type=int, default=4, help="Number of categories of each categorical feature.")
+@click.option("--targets", type=int, default=4, help="Number of target categories.")
+@click.option("--runs", type=int, default=5, help="Number of timed runs of each benchmark case.")
+@click.option("--executor", type=click.Choice(["serial", "thread", "process"]), default="serial")
+@click.option("--info", is_flag=True)
+@click.option("--debug", is_flag=True)
+def benchmark_command(  # noqa: PLR0913, PLR0917
+    output_filepath: Path,
+    baseline: Optional[Path] = None,
+    tolerance: float = 0.2,
+    samples: int = 10_000,
+    categorical_features: int = 10,
+    numeric_features: int = 0,
+    categories: int = 4,
+    targets: int = 4,
+    runs: int = 5,
+    executor: ExecutorName = "serial",
+    info: bool = False,
+    debug: bool = False,
+) -> None:
+    """Benchmark dataset loading and evaluation on a generated dataset."""
+    set_logger_config(info, debug)
 
+    config = SyntheticDatasetConfig(
+        n_samples=samples,
+        n_categorical_features=categorical_features,
+        n_numeric_features=numeric_features,
+        n_categories=categories,
+        n_targets=targets,
+    )
+    evaluator = Evaluator(executor=executor)
+    benchmark = Benchmark(config=config, evaluator=evaluator, n_runs=runs)
+    with tempfile.TemporaryDirectory() as work_dirpath:
+        report = benchmark.run(Path(work_dirpath))
+    evaluator.close()
+    report.save(output_filepath)
+
+    for result in report.results:
+        print(
+            f"{result.name}: {result.min_seconds * 1000:.3f} ms, {result.throughput:,.0f} items/s, "
+            f"{result.peak_memory_bytes / 2**20:.1f} MiB"
+        )
+    print(f"Saved benchmark results to {output_filepath}")
+
+    if baseline is not None:
+        regressions = report.compare(BenchmarkReport.load(baseline), tolerance=tolerance)
+        for regression in regressions:
+            print(f"Regression in {regression.name} {regression.metric}: {regression.ratio:.2f}x baseline")
+        if regressions:
+            msg = f"{len(regressions)} benchmark regressions compared to {baseline}"
+            raise click.ClickException(msg)
+
+
+def create_evaluator(settings: Settings, profiler: Optional[Profiler] = None) -> Evaluator:
+    """Create an evaluator configured by the settings."""
+    return Evaluator(
+        executor=settings.evaluation_executor,
+        n_workers=settings.evaluation_workers,
+        lookahead_depth=settings.lookahead_depth,
+        lookahead_width=settings.lookahead_width,
+        stop_posterior=settings.stop_posterior,
+        stop_entropy=settings.stop_entropy,
+        posterior_prior=settings.posterior_prior,
+        profiler=profiler,
+    )
+
+
+def load_dataset(settings: Settings, dataset_name: str) -> Dataset:
+    """Load and validate a dataset from the data directory."""
     dataset_dirpath = settings.data_dirpath / dataset_name
     tabular_filepath = dataset_dirpath / "tabular.csv"
     feature_info_filepath = dataset_dirpath / "features.json"
-    dataset = Dataset.from_files(tabular_filepath, feature_info_filepath)
+    if settings.stream_chunk_size is not None:
+        dataset = Dataset.from_files_streaming(tabular_filepath, feature_info_filepath, settings.stream_chunk_size)
+    elif settings.use_dataset_cache:
+        dataset_cache = DatasetCache(dataset_dirpath / ".cache")
+        dataset = dataset_cache.load_or_build(tabular_filepath, feature_info_filepath)
+    else:
+        dataset = Dataset.from_files(tabular_filepath, feature_info_filepath, lazy=True)
     dataset.validate()
+    if settings.compress_datasets and settings.stream_chunk_size is None:
+        n_samples = dataset.n_samples
+        dataset = dataset.compress()
+        logger.info("Compressed %d rows into %d unique rows", n_samples, dataset.n_samples)
     logger.debug("Dataset: %s", dataset)
     logger.debug("Number of samples: %s", dataset.n_samples)
     logger.debug("Number of features: %s", dataset.n_features)
+    return dataset
 
-    evaluator = Evaluator()
-    constraints: list[Constraint] = []
-    while len(constraints) < dataset.n_training_features:
-        result = evaluator.evaluate(dataset, constraints)
-        match result:
-            case Terminal(category=category):
-                print(f"We think it's most likely your category is {category}")
-                break
-            case Unknown():
-                print("Dataset does not contain enough samples to make a decision")
-                break
-            case Continue(feature=feature, information_gain=information_gain):
-                feature = result.feature
-                information_gain = result.information_gain
-
-                logger.info("Found feature with highest information gain (%f): %s", information_gain, feature.name)
-
-                if information_gain == settings.information_gain_threshold:
-                    logger.info("Information gain threshold reached.")
-                    break
-
-                constraint = accept_input(feature)
-                constraints.append(constraint)
 
-    logger.info("Final constraints: %s", constraints)
+def print_prediction(category: str, probability: float) -> None:
+    """Print the predicted target category with its posterior probability."""
+    print(f"We think it's most likely your category is {category} ({probability:.0%})")
 
-    target_feature = dataset.get_feature(dataset.feature_info.target_feature_name)
-    target_constraint = accept_input(target_feature)
 
-    logger.info("Target constraint: %s", target_constraint)
+def save_profile(profiler: Profiler, filepath: Path, profile_format: str) -> None:
+    """Save a profile and print a summary of its phases."""
+    profiler.close()
+    if profile_format == "metrics":
+        profiler.save_metrics(filepath)
+    else:
+        profiler.save_trace(filepath)
 
-    print_survey_summary(constraints, target_constraint)
+    print("-----")
+    print("Profile summary:")
+    for name, stats in profiler.summarize().items():
+        line = (
+            f"{name}: {stats.count} spans, {stats.total_seconds * 1000:.3f} ms total, "
+            f"{stats.max_seconds * 1000:.3f} ms max"
+        )
+        if stats.allocated_bytes is not None:
+            line += f", {stats.allocated_bytes / 2**20:.2f} MiB allocated"
+        print(line)
+    print(f"Saved profile to {filepath}")
 
 
 def print_survey_summary(constraints: list[Constraint], target_constraint: Constraint) -> None:
     """Print the survey summary."""
     print("-----")
     print("Survey summary:")
-    for constraint in constraints:
+    for constraint in [*constraints, target_constraint]:
         match constraint:
             case EqConstraint(feature=feature, value=value):
                 print(f"Question: {feature.name} -> {value}")
+            case InConstraint(feature=feature, values=values):
+                print(f"Question: {feature.name} -> one of {', '.join(values)}")
+            case SkipConstraint(feature=feature):
+                print(f"Question: {feature.name} -> skipped")
+            case LtConstraint(feature=feature, value=value):
+                print(f"Question: {feature.name} -> less than {value}")
+            case GtConstraint(feature=feature, value=value):
+                print(f"Question: {feature.name} -> greater than {value}")
             case _:
                 raise NotImplementedError
 
-    match target_constraint:
-        case EqConstraint(feature=feature, value=value):
-            print(f"Question: {feature.name} -> {value}")
-        case _:
-            raise NotImplementedError
-
 
 def get_synonym_input(input_str: str, categories: list[str]) -> Optional[str]:
     """Get the synonym input."""
@@ -117,40 +383,77 @@ def get_synonym_input(input_str: str, categories: list[str]) -> Optional[str]:
     return None
 
 
-def accept_input(feature: Feature) -> Constraint:
-    """Accept input from the user."""
+def accept_input(feature: Feature, threshold: Optional[float] = None) -> Constraint:
+    """Accept input from the user.
+
+    Numeric answers are compared against the threshold if one is given, otherwise the exact value is kept. Questions
+    can be skipped, and categorical questions can be answered with several comma separated categories.
+    """
     if feature.metadata is None:
         msg = "Feature metadata is required to run survey."
         raise ValueError(msg)
 
+    print(f"Question: {feature.metadata.question}")
     match feature.type:
-        case Categorical():
-            categories = feature.type.categories
-            print(f"Question: {feature.metadata.question}")
-            num_map = {str(i + 1): category for i, category in enumerate(categories)}
-            for n, category in num_map.items():
-                print(f"{n}: {category}")
-
-            while True:
-                print("> ", end="")
-                input_str = input()
-                if input_str in num_map:
-                    value = num_map[input_str]
-                    break
-                if input_str in categories:
-                    value = input_str
-                    break
-                synonym = get_synonym_input(input_str, categories)
-                if synonym is not None:
-                    value = synonym
-                    break
-                print(f"Invalid input. Please select a number between 1 and {len(num_map)}.")
-
-            assert value in categories
-            return EqConstraint(feature=feature, value=value)
+        case Categorical(categories=categories):
+            return accept_category_input(feature, categories)
+        case Numeric():
+            number = accept_number_input()
+            if number is None:
+                return SkipConstraint(feature=feature)
+            if threshold is None:
+                return EqConstraint(feature=feature, value=str(number))
+            if number < threshold:
+                return LtConstraint(feature=feature, value=threshold)
+            return GtConstraint(feature=feature, value=threshold)
         case _:
             raise NotImplementedError
 
 
+def accept_category_input(feature: Feature, categories: list[str]) -> Constraint:
+    """Accept one or more categories from the user, or skip the question."""
+    num_map = {str(i + 1): category for i, category in enumerate(categories)}
+    for n, category in num_map.items():
+        print(f"{n}: {category}")
+    print(f"{SKIP_INPUT}: skip")
+
+    while True:
+        print("> ", end="")
+        input_str = input()
+        value = get_category_input(input_str, num_map, categories)
+        if value is not None:
+            return EqConstraint(feature=feature, value=value)
+        if input_str == SKIP_INPUT:
+            return SkipConstraint(feature=feature)
+        parts = input_str.split(",")
+        values = [get_category_input(part.strip(), num_map, categories) for part in parts]
+        valid_values = [value for value in values if value is not None]
+        if len(parts) > 1 and len(valid_values) == len(parts):
+            return InConstraint(feature=feature, values=tuple(valid_values))
+        print(f"Invalid input. Please select one or more numbers between 1 and {len(num_map)}.")
+
+
+def get_category_input(input_str: str, num_map: dict[str, str], categories: list[str]) -> Optional[str]:
+    """Get the category selected by its number, its name or a synonym."""
+    if input_str in num_map:
+        return num_map[input_str]
+    if input_str in categories:
+        return input_str
+    return get_synonym_input(input_str, categories)
+
+
+def accept_number_input() -> Optional[float]:
+    """Accept a number from the user, or None if the question is skipped."""
+    while True:
+        print("> ", end="")
+        input_str = input()
+        if input_str == SKIP_INPUT:
+            return None
+        try:
+            return float(input_str)
+        except ValueError:
+            print("Invalid input. Please enter a number.")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,115 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+MAX_INDEXED_CATEGORIES = 64
+
+
+@dataclass
+class BitmapIndex:
+    """Inverted index from the categories of encoded features to packed bitmaps of the rows with that category.
+
+    Bitmaps are packed into 64 bit words with bit i of the words set if row i has the category. Selecting rows is an
+    AND of bitmaps and counting rows is a popcount, so both cost a fixed number of word operations per feature
+    regardless of how many rows match. Bitmaps are built the first time a feature is used. Features with more than
+    MAX_INDEXED_CATEGORIES categories are not indexed because their bitmaps would take more memory than their codes.
+
+    Attributes:
+        codes (dict[str, np.ndarray]): Integer codes of each encoded feature.
+        categories (dict[str, list[str]]): Categories that the codes of each encoded feature index into.
+        n_samples (int): Number of rows.
+    """
+
+    codes: dict[str, np.ndarray] = field(repr=False)
+    categories: dict[str, list[str]] = field(repr=False)
+    n_samples: int
+    _bitmaps: dict[str, np.ndarray] = field(default_factory=dict, init=False, repr=False)
+
+    @property
+    def n_words(self) -> int:
+        """Number of 64 bit words in each bitmap."""
+        return (self.n_samples + 63) // 64
+
+    def is_indexed(self, feature_name: str) -> bool:
+        """Check whether a feature is indexed.
+
+        Args:
+            feature_name (str): Name of the feature.
+
+        Returns:
+            bool: Whether the feature has bitmaps.
+        """
+        return feature_name in self.codes and len(self.categories[feature_name]) <= MAX_INDEXED_CATEGORIES
+
+    def get_bitmaps(self, feature_name: str) -> np.ndarray:
+        """Get the bitmaps of a feature.
+
+        Args:
+            feature_name (str): Name of an indexed feature.
+
+        Returns:
+            np.ndarray: Array of shape (n_categories, n_words) with the bitmap of each category.
+        """
+        bitmaps = self._bitmaps.get(feature_name)
+        if bitmaps is None:
+            if not self.is_indexed(feature_name):
+                msg = f"Feature '{feature_name}' is not indexed."
+                raise ValueError(msg)
+            n_categories = len(self.categories[feature_name])
+            is_set = self.codes[feature_name][np.newaxis, :] == np.arange(n_categories)[:, np.newaxis]
+            bitmaps = self.pack(is_set)
+            self._bitmaps[feature_name] = bitmaps
+        return bitmaps
+
+    def pack(self, is_set: np.ndarray) -> np.ndarray:
+        """Pack boolean arrays over the rows into bitmaps.
+
+        Args:
+            is_set (np.ndarray): Boolean array with the rows along the last axis.
+
+        Returns:
+            np.ndarray: Bitmaps with the rows along the last axis packed into n_words words.
+        """
+        packed = np.packbits(is_set, axis=-1, bitorder="little")
+        padding = [(0, 0)] * (packed.ndim - 1) + [(0, self.n_words * 8 - packed.shape[-1])]
+        return np.ascontiguousarray(np.pad(packed, padding)).view(np.uint64)
+
+    def rows_to_mask(self, rows: np.ndarray) -> np.ndarray:
+        """Convert row indices to a bitmap.
+
+        Args:
+            rows (np.ndarray): Row indices.
+
+        Returns:
+            np.ndarray: Bitmap of the rows.
+        """
+        is_set = np.zeros(self.n_samples, dtype=bool)
+        is_set[rows] = True
+        return self.pack(is_set)
+
+    def mask_to_rows(self, mask: np.ndarray) -> np.ndarray:
+        """Convert a bitmap to row indices.
+
+        Args:
+            mask (np.ndarray): Bitmap of the rows.
+
+        Returns:
+            np.ndarray: Sorted row indices.
+        """
+        is_set = np.unpackbits(mask.view(np.uint8), count=self.n_samples, bitorder="little")
+        return np.flatnonzero(is_set)
+
+    @staticmethod
+    def count(bitmaps: np.ndarray, target_bitmaps: np.ndarray) -> np.ndarray:
+        """Count the rows with each pair of categories of two features.
+
+        Args:
+            bitmaps (np.ndarray): Bitmaps of the categories of a feature, of shape (n_categories, n_words).
+            target_bitmaps (np.ndarray): Bitmaps of the categories of the target, of shape (n_targets, n_words),
+                already restricted to the rows to count.
+
+        Returns:
+            np.ndarray: Contingency table of shape (n_categories, n_targets).
+        """
+        intersections = bitmaps[:, np.newaxis, :] & target_bitmaps[np.newaxis, :, :]
+        return np.bitwise_count(intersections).sum(axis=-1, dtype=np.int64)
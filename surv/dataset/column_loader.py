@@ -0,0 +1,56 @@
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class ColumnLoader:
+    """Reads columns of a tabular CSV file on demand.
+
+    Attributes:
+        tabular_filepath (Path): Path to the tabular dataset CSV file.
+        rows (Optional[np.ndarray]): Indices of the file rows that loaded columns are restricted to. Defaults to all
+            rows.
+        column_names (list[str]): Names of all columns of the file, in file order.
+        lock (threading.Lock): Lock that serializes loading columns into a dataset.
+    """
+
+    tabular_filepath: Path
+    rows: Optional[np.ndarray] = field(default=None, repr=False)
+    column_names: list[str] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Read the column names from the header of the file."""
+        if not self.column_names:
+            self.column_names = [str(name) for name in pd.read_csv(self.tabular_filepath, nrows=0).columns]
+
+    def load(self, column_names: list[str]) -> pd.DataFrame:
+        """Load columns from the file.
+
+        Args:
+            column_names (list[str]): Names of the columns to load.
+
+        Returns:
+            pd.DataFrame: The columns, in the given order, restricted to the loader rows.
+        """
+        tabular = pd.read_csv(self.tabular_filepath, usecols=column_names)[column_names]
+        if self.rows is not None:
+            tabular = tabular.iloc[self.rows].reset_index(drop=True)
+        return tabular
+
+    def take(self, rows: np.ndarray) -> "ColumnLoader":
+        """Create a loader restricted to a subset of the rows of this loader.
+
+        Args:
+            rows (np.ndarray): Indices of the rows to keep, relative to the rows of this loader.
+
+        Returns:
+            ColumnLoader: Loader of the selected rows.
+        """
+        file_rows = rows if self.rows is None else self.rows[rows]
+        return ColumnLoader(self.tabular_filepath, rows=file_rows, column_names=self.column_names)
@@ -1,40 +1,368 @@
+import hashlib
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
+from typing import Optional
 
 import numpy as np
 import pandas as pd
 
+from surv.dataset.bitmap_index import BitmapIndex
+from surv.dataset.column_loader import ColumnLoader
 from surv.dataset.feature import Feature
 from surv.dataset.feature_info import FeatureInfo
 from surv.dataset.feature_purpose import Training
-from surv.dataset.feature_types import Categorical
+from surv.dataset.feature_types import Categorical, Numeric
+from surv.dataset.patterns import count_patterns, find_patterns, merge_patterns
+from surv.dataset.validation_error import DatasetValidationError, InvalidValues
+
+# Code of missing values in encoded columns, such as blank cells in the tabular file.
+MISSING_CODE = -1
+# Code of values that are not in the categories of their column. Kept apart from missing values so that invalid
+# values are never mistaken for missing ones, for example once the codes are stored in a dataset cache.
+INVALID_CODE = -2
 
 
 @dataclass
 class Dataset:
-    """Survey dataset."""
+    """Survey dataset.
+
+    Attributes:
+        tabular (pd.DataFrame): Tabular dataset.
+        feature_info (FeatureInfo): Feature metadata.
+        codes (dict[str, np.ndarray]): Integer codes of the categorical columns and the target column.
+        categories (dict[str, list[str]]): Categories that the codes of each encoded column index into.
+        weights (Optional[np.ndarray]): Number of samples each row stands for, if rows are not single samples.
+        column_loader (Optional[ColumnLoader]): Loads the columns of the source file that are not in the tabular
+            dataset yet, the first time they are accessed.
+    """
 
     tabular: pd.DataFrame
     feature_info: FeatureInfo
+    codes: dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+    categories: dict[str, list[str]] = field(default_factory=dict, repr=False)
+    weights: Optional[np.ndarray] = field(default=None, repr=False)
+    column_loader: Optional[ColumnLoader] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Encode categorical columns and the target column into integer codes.
+
+        A numeric target is encoded with each distinct value as its own category.
+        Columns that were already encoded, for example when loading from a dataset cache, are not encoded again.
+        Columns that are deferred to the column loader are encoded when they are loaded.
+        If no weights are given and the dataset has a sample weight feature, its column is used as the weights.
+        """
+        for feature in self.feature_info.features:
+            if self.column_loader is not None and feature.name not in self.tabular.columns:
+                continue
+            self._encode_feature(feature)
+
+        sample_weight_feature = self.feature_info.sample_weight_feature
+        if self.weights is None and sample_weight_feature is not None:
+            self.weights = self.parse_weights(self.tabular[sample_weight_feature.name].to_numpy())
+
+    def _encode_feature(self, feature: Feature) -> None:
+        """Encode the column of a feature into integer codes, unless it is already encoded."""
+        if feature.name in self.codes and feature.name in self.categories:
+            return
+        match feature.type:
+            case Categorical(categories=categories):
+                series = self.tabular[feature.name]
+                if isinstance(series.dtype, pd.CategoricalDtype) and list(series.cat.categories) == categories:
+                    self.codes[feature.name] = series.cat.codes.to_numpy()
+                else:
+                    self.codes[feature.name] = self.encode_categorical(series.to_numpy(), categories)
+                self.categories[feature.name] = categories
+            case Numeric() if feature.name == self.feature_info.target_feature_name:
+                column = self.tabular[feature.name].to_numpy()
+                codes, values = pd.factorize(column, sort=True, use_na_sentinel=True)
+                self.codes[feature.name] = codes.astype(np.min_scalar_type(-len(values)))
+                self.categories[feature.name] = [str(value) for value in values]
 
     @classmethod
-    def from_files(cls, tabular_filepath: Path, feature_info_filepath: Path) -> "Dataset":
+    def from_files(cls, tabular_filepath: Path, feature_info_filepath: Path, lazy: bool = False) -> "Dataset":
         """Load the dataset from the data directory.
 
         Args:
             tabular_filepath (Path): Path tabular dataset CSV file.
             feature_info_filepath (Path): Path to feature_info JSON file.
+            lazy (bool): Whether to only read the training, target and sample weight columns up front. Other columns,
+                such as identifiers, metadata and free text answers, are read the first time they are accessed.
         """
-        tabular = pd.read_csv(tabular_filepath)
+        with feature_info_filepath.open("r") as file:
+            feature_info_json = json.load(file)
+            feature_info = FeatureInfo(**feature_info_json)
+
+        if not lazy:
+            tabular = cls.apply_aliases(feature_info, pd.read_csv(tabular_filepath))
+            return cls(tabular, feature_info)
+
+        column_loader = ColumnLoader(tabular_filepath)
+        required_feature_names = set(cls.get_required_feature_names(feature_info))
+        column_names = [name for name in column_loader.column_names if name in required_feature_names]
+        tabular = cls.apply_aliases(feature_info, column_loader.load(column_names))
+        return cls(tabular, feature_info, column_loader=column_loader)
+
+    @classmethod
+    def get_required_feature_names(cls, feature_info: FeatureInfo) -> list[str]:
+        """Get the names of the features that evaluation needs, the training, target and sample weight features.
+
+        Args:
+            feature_info (FeatureInfo): Feature metadata.
+
+        Returns:
+            list[str]: Names of the required features, in feature metadata order.
+        """
+        sample_weight_feature = feature_info.sample_weight_feature
+        return [
+            feature.name
+            for feature in feature_info.features
+            if isinstance(feature.purpose, Training)
+            or feature.name == feature_info.target_feature_name
+            or feature is sample_weight_feature
+        ]
+
+    def load_columns(self, feature_names: list[str]) -> None:
+        """Load deferred columns from the source file into the tabular dataset.
+
+        Columns that are already loaded are skipped.
+
+        Args:
+            feature_names (list[str]): Names of the features to load.
+
+        Raises:
+            DatasetValidationError: If any loaded categorical column has values that are not in its categories.
+        """
+        if self.column_loader is None:
+            return
+        with self.column_loader.lock:
+            deferred_feature_names = set(self.deferred_feature_names)
+            column_names = [name for name in feature_names if name in deferred_feature_names]
+            if not column_names:
+                return
+            loaded = self.apply_aliases(self.feature_info, self.column_loader.load(column_names))
+            tabular = pd.concat([self.tabular, loaded], axis=1)
+            self.tabular = tabular[[name for name in self.column_loader.column_names if name in tabular.columns]]
+
+            invalid_values = []
+            for name in column_names:
+                feature = self.get_feature(name)
+                self._encode_feature(feature)
+                if isinstance(feature.type, Categorical):
+                    rows = self.find_invalid_codes(self.codes[name])
+                    if rows.shape[0] > 0:
+                        invalid_values.append(InvalidValues(name, rows, self.tabular[name].to_numpy()[rows]))
+            if invalid_values:
+                raise DatasetValidationError(invalid_values)
+
+    @classmethod
+    def from_files_streaming(
+        cls,
+        tabular_filepath: Path,
+        feature_info_filepath: Path,
+        chunk_size: int = 100_000,
+    ) -> "Dataset":
+        """Load the dataset by streaming the tabular file in chunks.
+
+        Only the training, target and sample weight columns are read. Each chunk is validated and encoded, then
+        collapsed into unique patterns of feature values with the number of rows, or the sum of their sample weights,
+        as the weight of each pattern. Peak memory grows with the chunk size and the number of unique patterns rather
+        than the number of rows. This only saves memory when rows repeat: numeric or high-cardinality columns can make
+        most rows unique, and then memory grows with the number of rows as when loading the whole file. The returned
+        dataset only has the training and target features, and gives the same evaluation results as the full dataset.
 
+        Args:
+            tabular_filepath (Path): Path tabular dataset CSV file.
+            feature_info_filepath (Path): Path to feature_info JSON file.
+            chunk_size (int): Number of rows read at a time.
+
+        Raises:
+            DatasetValidationError: If any categorical column has values that are not in its categories, or any sample
+                weight is negative or not a number.
+        """
         with feature_info_filepath.open("r") as file:
             feature_info_json = json.load(file)
             feature_info = FeatureInfo(**feature_info_json)
 
-        tabular = cls.apply_aliases(feature_info, tabular)
+        sample_weight_feature = feature_info.sample_weight_feature
+        usecols = cls.get_required_feature_names(feature_info)
+        feature_info = cls._get_pattern_feature_info(feature_info)
+
+        patterns: list[pd.DataFrame] = []
+        pattern_weights: list[np.ndarray] = []
+        invalid_values: list[InvalidValues] = []
+        offset = 0
+        merge_threshold = chunk_size
+        for chunk in pd.read_csv(tabular_filepath, usecols=usecols, chunksize=chunk_size):
+            encoded_chunk = cls._encode_chunk(feature_info, chunk, offset, invalid_values)
+            chunk_weights = None
+            if sample_weight_feature is not None:
+                weight_column = chunk[sample_weight_feature.name].to_numpy()
+                chunk_weights = cls.parse_weights(weight_column)
+                rows = cls.find_invalid_weights(chunk_weights)
+                if rows.shape[0] > 0:
+                    invalid_values.append(InvalidValues(sample_weight_feature.name, rows + offset, weight_column[rows]))
+                    encoded_chunk = None
+            offset += chunk.shape[0]
+            if encoded_chunk is None:
+                continue
+            chunk_patterns, chunk_pattern_weights = count_patterns(encoded_chunk, chunk_weights)
+            patterns.append(chunk_patterns)
+            pattern_weights.append(chunk_pattern_weights)
+
+            # Merge pattern tables once they hold twice as many rows as after the last merge, so that each pattern is
+            # merged a bounded number of times on average even when most patterns are unique.
+            if sum(chunk_patterns.shape[0] for chunk_patterns in patterns) > merge_threshold:
+                merged_patterns, merged_pattern_weights = merge_patterns(patterns, pattern_weights)
+                patterns, pattern_weights = [merged_patterns], [merged_pattern_weights]
+                merge_threshold = max(chunk_size, 2 * merged_patterns.shape[0])
+
+        if invalid_values:
+            raise DatasetValidationError(cls._concatenate_invalid_values(invalid_values))
+        if not patterns:
+            empty_patterns = pd.DataFrame({feature.name: np.zeros(0) for feature in feature_info.features})
+            patterns, pattern_weights = [empty_patterns], [np.zeros(0)]
+        merged_patterns, merged_pattern_weights = merge_patterns(patterns, pattern_weights)
+        return cls._from_patterns(feature_info, merged_patterns, merged_pattern_weights)
+
+    def compress(self) -> "Dataset":
+        """Collapse rows with identical training feature values and target into weighted unique patterns.
+
+        The weight of each pattern is the number of rows it stands for, or the sum of their weights if the dataset is
+        weighted. Evaluation results on the compressed dataset are the same as on this dataset, while evaluations
+        only scan the unique patterns. Features other than the training and target features are dropped.
+
+        Returns:
+            Dataset: The compressed dataset.
+        """
+        feature_info = self._get_pattern_feature_info(self.feature_info)
+        feature_names = [feature.name for feature in feature_info.features]
+        columns = {}
+        for feature_name in feature_names:
+            if feature_name in self.codes:
+                columns[feature_name] = self.get_codes(feature_name)
+            else:
+                columns[feature_name] = self.get_column(feature_name)
+        first_rows, weights = find_patterns(pd.DataFrame(columns), self.weights)
+
+        tabular = self.tabular[feature_names].iloc[first_rows].reset_index(drop=True)
+        codes = {name: self.codes[name][first_rows] for name in feature_names if name in self.codes}
+        categories = {name: self.categories[name] for name in codes}
+        return Dataset(tabular, feature_info, codes=codes, categories=categories, weights=weights)
+
+    @staticmethod
+    def _get_pattern_feature_info(feature_info: FeatureInfo) -> FeatureInfo:
+        """Restrict feature metadata to the training and target features that patterns are made of."""
+        features = []
+        for feature in feature_info.features:
+            if isinstance(feature.purpose, Training) or feature.name == feature_info.target_feature_name:
+                if not isinstance(feature.type, Categorical | Numeric):
+                    msg = f"Feature '{feature.name}' must be categorical or numeric to collapse rows into patterns."
+                    raise ValueError(msg)
+                features.append(feature)
+        return FeatureInfo(features=features, target_feature_name=feature_info.target_feature_name)
+
+    @classmethod
+    def _from_patterns(cls, feature_info: FeatureInfo, patterns: pd.DataFrame, weights: np.ndarray) -> "Dataset":
+        """Create a dataset from encoded patterns and their weights."""
+        features = feature_info.features
+        feature_names = [feature.name for feature in features]
+        columns = {}
+        codes = {}
+        categories = {}
+        for feature in features:
+            column = patterns[feature.name].to_numpy()
+            if isinstance(feature.type, Categorical):
+                categories[feature.name] = feature.type.categories
+                codes[feature.name] = column.astype(np.min_scalar_type(-len(feature.type.categories)))
+                columns[feature.name] = pd.Categorical.from_codes(
+                    codes[feature.name], categories=feature.type.categories
+                )
+            else:
+                columns[feature.name] = column.astype(np.float64)
+        tabular = pd.DataFrame(columns, columns=feature_names)
+
+        return cls(tabular, feature_info, codes=codes, categories=categories, weights=weights)
+
+    @staticmethod
+    def _concatenate_invalid_values(invalid_values: list[InvalidValues]) -> list[InvalidValues]:
+        """Concatenate the invalid values found in each chunk into one entry per feature."""
+        feature_invalid_values: dict[str, list[InvalidValues]] = {}
+        for chunk_invalid_values in invalid_values:
+            feature_invalid_values.setdefault(chunk_invalid_values.feature_name, []).append(chunk_invalid_values)
+        return [
+            InvalidValues(
+                feature_name,
+                np.concatenate([chunk_invalid_values.rows for chunk_invalid_values in chunks_invalid_values]),
+                np.concatenate([chunk_invalid_values.values for chunk_invalid_values in chunks_invalid_values]),
+            )
+            for feature_name, chunks_invalid_values in feature_invalid_values.items()
+        ]
+
+    @classmethod
+    def _encode_chunk(
+        cls,
+        feature_info: FeatureInfo,
+        chunk: pd.DataFrame,
+        offset: int,
+        invalid_values: list[InvalidValues],
+    ) -> Optional[pd.DataFrame]:
+        """Encode categorical columns of a chunk of rows as codes, collecting invalid values by absolute row index.
+
+        Returns:
+            Optional[pd.DataFrame]: The encoded chunk, or None if the chunk has invalid values.
+        """
+        try:
+            chunk = cls.apply_aliases(feature_info, chunk)
+        except DatasetValidationError as error:
+            for chunk_invalid_values in error.invalid_values:
+                rows = chunk_invalid_values.rows + offset
+                invalid_values.append(
+                    InvalidValues(chunk_invalid_values.feature_name, rows, chunk_invalid_values.values)
+                )
+            return None
+
+        n_invalid_values = len(invalid_values)
+        encoded_chunk = {}
+        for feature in feature_info.features:
+            column = chunk[feature.name].to_numpy()
+            if isinstance(feature.type, Categorical):
+                codes = cls.encode_categorical(column, feature.type.categories)
+                is_target = feature.name == feature_info.target_feature_name
+                rows = cls.find_invalid_codes(codes, allow_missing=not is_target)
+                if rows.shape[0] > 0:
+                    invalid_values.append(InvalidValues(feature.name, rows + offset, column[rows]))
+                encoded_chunk[feature.name] = codes
+            else:
+                encoded_chunk[feature.name] = column.astype(np.float64)
+        if len(invalid_values) > n_invalid_values:
+            return None
+        return pd.DataFrame(encoded_chunk)
+
+    @staticmethod
+    def parse_weights(column: np.ndarray) -> np.ndarray:
+        """Convert a sample weight column to floats, with values that are not numbers converted to NaN.
 
-        return cls(tabular, feature_info)
+        Args:
+            column (np.ndarray): Sample weight column.
+
+        Returns:
+            np.ndarray: Sample weights.
+        """
+        return pd.to_numeric(pd.Series(column), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+    @staticmethod
+    def find_invalid_weights(weights: np.ndarray) -> np.ndarray:
+        """Find sample weights that are negative or not finite.
+
+        Args:
+            weights (np.ndarray): Sample weights.
+
+        Returns:
+            np.ndarray: Indices of the invalid weights.
+        """
+        return np.flatnonzero(~(np.isfinite(weights) & (weights >= 0)))
 
     @classmethod
     def apply_aliases(cls, feature_info: FeatureInfo, tabular: pd.DataFrame) -> pd.DataFrame:
@@ -46,29 +374,116 @@ class Dataset:
 
         Returns:
             pd.DataFrame: Tabular dataset with aliased columns.
+
+        Raises:
+            DatasetValidationError: If any aliased column has values that are not category numbers.
         """
         tabular = tabular.copy()
+        invalid_values = []
         for feature in feature_info.features:
             if isinstance(feature.type, Categorical) and feature.type.numeric_alias:
-                column = tabular[feature.name]
+                if feature.name not in tabular.columns:
+                    continue
+                column = tabular[feature.name].to_numpy()
                 categories = feature.type.categories
-                for x in column:
-                    if x < 1 or x > len(categories):
-                        msg = f"Value '{x}' not in categories for feature '{feature.name}'."
-                        raise ValueError(msg)
-                tabular[feature.name] = column.apply(lambda x, categories=categories: categories[x - 1])
+                numbers = pd.to_numeric(column, errors="coerce").astype(np.float64)
+                is_missing = pd.isna(column)
+                is_valid = (numbers >= 1) & (numbers <= len(categories)) & (numbers == np.floor(numbers))
+                invalid = ~(is_valid | is_missing)
+                if np.any(invalid):
+                    rows = np.flatnonzero(invalid)
+                    invalid_values.append(InvalidValues(feature.name, rows, column[rows]))
+                    continue
+                numbers[is_missing] = MISSING_CODE + 1
+                codes = numbers.astype(np.min_scalar_type(-len(categories))) - 1
+                tabular[feature.name] = pd.Categorical.from_codes(codes, categories=categories)
+        if invalid_values:
+            raise DatasetValidationError(invalid_values)
         return tabular
 
+    @staticmethod
+    def encode_categorical(column: np.ndarray, categories: list[str]) -> np.ndarray:
+        """Encode a categorical column into integer codes.
+
+        Codes index into the list of categories. Missing values are encoded as MISSING_CODE and values that are not in
+        the list of categories as INVALID_CODE. The smallest integer dtype that can hold all categories is used.
+
+        Args:
+            column (np.ndarray): Categorical column values.
+            categories (list[str]): List of categories.
+
+        Returns:
+            np.ndarray: Integer category codes.
+        """
+        codes = pd.Index(categories).get_indexer(column)
+        codes[(codes == MISSING_CODE) & pd.notna(column)] = INVALID_CODE
+        return codes.astype(np.min_scalar_type(-len(categories)))
+
+    @staticmethod
+    def find_invalid_codes(codes: np.ndarray, allow_missing: bool = True) -> np.ndarray:
+        """Find the rows of an encoded column with values that are not in its categories.
+
+        Args:
+            codes (np.ndarray): Integer category codes of the column.
+            allow_missing (bool): Whether missing values are valid. Rows with a missing target are invalid since
+                they cannot be learned from.
+
+        Returns:
+            np.ndarray: Indices of the rows with invalid values.
+        """
+        is_invalid = codes == INVALID_CODE
+        if not allow_missing:
+            is_invalid |= codes == MISSING_CODE
+        return np.flatnonzero(is_invalid)
+
+    def get_codes(self, feature_name: str) -> np.ndarray:
+        """Get the integer codes of an encoded column, with MISSING_CODE for missing values.
+
+        Args:
+            feature_name (str): Name of a categorical feature or the target feature.
+
+        Returns:
+            np.ndarray: Integer category codes.
+        """
+        if feature_name not in self.codes:
+            self.load_columns([feature_name])
+        if feature_name not in self.codes:
+            msg = f"Feature '{feature_name}' is not encoded."
+            raise ValueError(msg)
+        return self.codes[feature_name]
+
+    def get_categories(self, feature_name: str) -> list[str]:
+        """Get the categories that the codes of an encoded column index into.
+
+        Args:
+            feature_name (str): Name of a categorical feature or the target feature.
+
+        Returns:
+            list[str]: List of categories.
+        """
+        if feature_name not in self.categories:
+            self.load_columns([feature_name])
+        if feature_name not in self.categories:
+            msg = f"Feature '{feature_name}' is not encoded."
+            raise ValueError(msg)
+        return self.categories[feature_name]
+
     def get_column(self, feature_name: str) -> np.ndarray:
         """Get a column from the dataset.
 
+        Aliased categorical columns and categorical columns loaded from the dataset cache are stored as pandas
+        categoricals, and text columns may use a pandas string dtype, so columns are converted to numpy arrays with
+        missing values as NaN. Numeric columns are returned without a copy.
+
         Args:
             feature_name (str): Name of the feature.
 
         Returns:
             np.ndarray: Feature data.
         """
-        return self.tabular[feature_name].values
+        if feature_name not in self.tabular.columns:
+            self.load_columns([feature_name])
+        return self.tabular[feature_name].to_numpy()
 
     def get_feature(self, feature_name: str) -> Feature:
         """Get a feature from the dataset.
@@ -79,11 +494,52 @@ class Dataset:
         Returns:
             Feature: The feature for the given name.
         """
-        for feature in self.feature_info.features:
-            if feature.name == feature_name:
-                return feature
-        msg = f"Feature '{feature_name}' not found in dataset metadata."
-        raise ValueError(msg)
+        return self.feature_info.get_feature(feature_name)
+
+    def take(self, rows: np.ndarray) -> "Dataset":
+        """Create a dataset with a subset of the rows.
+
+        Codes and categories are carried over rather than encoded again, so codes keep the same meaning in both
+        datasets even for a numeric target whose categories depend on the values present.
+
+        Args:
+            rows (np.ndarray): Indices of the rows to keep.
+
+        Returns:
+            Dataset: Dataset with the selected rows.
+        """
+        tabular = self.tabular.iloc[rows].reset_index(drop=True)
+        codes = {name: feature_codes[rows] for name, feature_codes in self.codes.items()}
+        weights = self.weights[rows] if self.weights is not None else None
+        column_loader = self.column_loader.take(rows) if self.column_loader is not None else None
+        return Dataset(
+            tabular,
+            self.feature_info,
+            codes=codes,
+            categories=dict(self.categories),
+            weights=weights,
+            column_loader=column_loader,
+        )
+
+    @cached_property
+    def bitmap_index(self) -> BitmapIndex:
+        """Bitmap index of the encoded features."""
+        return BitmapIndex(self.codes, self.categories, self.n_samples)
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Hash of the feature information and the columns that evaluation depends on.
+
+        Other columns are left out so that the fingerprint does not depend on which deferred columns were loaded.
+        """
+        column_names = [name for name in self.get_required_feature_names(self.feature_info) if name in self.tabular]
+        digest = hashlib.sha256()
+        digest.update(self.feature_info.model_dump_json().encode())
+        digest.update(",".join(column_names).encode())
+        digest.update(pd.util.hash_pandas_object(self.tabular[column_names], index=False).to_numpy().tobytes())
+        if self.weights is not None:
+            digest.update(np.asarray(self.weights, dtype=np.float64).tobytes())
+        return digest.hexdigest()
 
     @property
     def n_samples(self) -> int:
@@ -93,27 +549,55 @@ class Dataset:
     @property
     def n_features(self) -> int:
         """Number of features in the dataset."""
-        return self.tabular.shape[1]
+        return len(self.column_names)
+
+    @property
+    def column_names(self) -> list[str]:
+        """Names of the columns of the dataset, whether they are loaded or deferred."""
+        if self.column_loader is None:
+            return [str(name) for name in self.tabular.columns]
+        return self.column_loader.column_names
+
+    @property
+    def deferred_feature_names(self) -> list[str]:
+        """Names of the columns that have not been loaded from the source file yet."""
+        if self.column_loader is None:
+            return []
+        return [name for name in self.column_loader.column_names if name not in self.tabular.columns]
 
     @property
     def n_training_features(self) -> int:
         """Number of training features in the dataset."""
-        n = 0
-        for feature in self.feature_info.features:
-            if isinstance(feature.purpose, Training):
-                n += 1
-        return n
+        return len(self.feature_info.training_features)
 
     def validate(self) -> None:
-        """Validate the dataset."""
-        if set(self.tabular.columns) != {feature.name for feature in self.feature_info.features}:
+        """Validate the dataset.
+
+        Missing values are valid in every column but the target. Deferred columns are validated when they are loaded.
+
+        Raises:
+            DatasetValidationError: If any categorical column has values that are not in its categories, the target has
+                missing values, or any sample weight is negative or not a number.
+        """
+        if set(self.column_names) != {feature.name for feature in self.feature_info.features}:
             msg = "Feature names in the dataset do not match feature metadata."
             raise ValueError(msg)
 
+        invalid_values = []
+        target_feature_name = self.feature_info.target_feature_name
         for feature in self.feature_info.features:
-            if isinstance(feature.type, Categorical):
-                column = self.get_column(feature.name)
-                for value in column:
-                    if value not in feature.type.categories:
-                        msg = f"Value '{value}' not in categories for feature '{feature.name}'."
-                        raise ValueError(msg)
+            is_target = feature.name == target_feature_name
+            if (isinstance(feature.type, Categorical) or is_target) and feature.name in self.codes:
+                column = self.tabular[feature.name].to_numpy()
+                rows = self.find_invalid_codes(self.get_codes(feature.name), allow_missing=not is_target)
+                if rows.shape[0] > 0:
+                    invalid_values.append(InvalidValues(feature.name, rows, column[rows]))
+
+        sample_weight_feature = self.feature_info.sample_weight_feature
+        if sample_weight_feature is not None and self.weights is not None:
+            rows = self.find_invalid_weights(self.weights)
+            if rows.shape[0] > 0:
+                values = self.tabular[sample_weight_feature.name].to_numpy()[rows]
+                invalid_values.append(InvalidValues(sample_weight_feature.name, rows, values))
+        if invalid_values:
+            raise DatasetValidationError(invalid_values)
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from surv.dataset.dataset import Dataset
+from surv.dataset.feature_info import FeatureInfo
+from surv.dataset.feature_types import Categorical
+
+logger = logging.getLogger(__name__)
+
+DATASET_CACHE_FORMAT_VERSION = 4
+
+# Number of times a load is retried when the cache is replaced while it is being loaded.
+LOAD_ATTEMPTS = 3
+
+
+@dataclass
+class DatasetCache:
+    """On-disk columnar cache of a dataset.
+
+    Each column is stored as its own .npy file, with integer codes instead of values for encoded columns. Cached
+    columns are memory-mapped when loaded, so startup does not parse the CSV file and processes that load the same
+    cache share the column memory. Text columns are stored as codes into their distinct values, which are kept in a
+    JSON file per column, so that missing values stay missing and one long value does not widen the whole column.
+
+    Every save writes its columns to a new data directory inside the cache directory, then atomically replaces the
+    metadata file, which holds the fingerprints of the source files and names the data directory. Readers resolve
+    the data directory once from the metadata, so they never mix the columns of two saves, and retry if a newer save
+    deletes the data directory before all of its columns are open.
+
+    Attributes:
+        cache_dirpath (Path): Directory of the cache.
+    """
+
+    cache_dirpath: Path
+
+    def load_or_build(self, tabular_filepath: Path, feature_info_filepath: Path) -> Dataset:
+        """Load the dataset from the cache, or from the source files if the cache is missing or outdated.
+
+        The cache is written after loading from the source files, if the dataset is valid.
+
+        Args:
+            tabular_filepath (Path): Path to the tabular dataset CSV file.
+            feature_info_filepath (Path): Path to the feature_info JSON file.
+
+        Returns:
+            Dataset: The loaded dataset.
+
+        Raises:
+            DatasetValidationError: If the dataset loaded from the source files is not valid.
+        """
+        dataset = self.load(tabular_filepath, feature_info_filepath)
+        if dataset is not None:
+            return dataset
+
+        dataset = Dataset.from_files(tabular_filepath, feature_info_filepath)
+        try:
+            self.save(dataset, tabular_filepath, feature_info_filepath)
+        except OSError:
+            logger.warning("Failed to write dataset cache to %s", self.cache_dirpath, exc_info=True)
+        return dataset
+
+    def load(self, tabular_filepath: Path, feature_info_filepath: Path) -> Optional[Dataset]:
+        """Load the dataset from the cache.
+
+        Args:
+            tabular_filepath (Path): Path to the tabular dataset CSV file.
+            feature_info_filepath (Path): Path to the feature_info JSON file.
+
+        Returns:
+            Optional[Dataset]: The cached dataset, or None if the cache is missing or the source files have changed.
+        """
+        metadata_filepath = self.cache_dirpath / "metadata.json"
+        for _ in range(LOAD_ATTEMPTS):
+            if not metadata_filepath.exists():
+                logger.info("Dataset cache not found at %s", self.cache_dirpath)
+                return None
+
+            with metadata_filepath.open("r") as file:
+                metadata = json.load(file)
+            if metadata["version"] != DATASET_CACHE_FORMAT_VERSION or metadata["fingerprints"] != self.get_fingerprints(
+                tabular_filepath, feature_info_filepath
+            ):
+                logger.info("Dataset cache at %s is outdated", self.cache_dirpath)
+                return None
+
+            try:
+                dataset = self._load_dataset(metadata)
+            except FileNotFoundError:
+                logger.info("Dataset cache at %s was replaced while loading", self.cache_dirpath)
+                continue
+            logger.info("Loaded dataset from cache at %s", self.cache_dirpath)
+            return dataset
+
+        logger.warning("Dataset cache at %s kept changing while loading", self.cache_dirpath)
+        return None
+
+    def _load_dataset(self, metadata: dict[str, Any]) -> Dataset:
+        """Load the dataset from the data directory named in the cache metadata."""
+        data_dirpath = self.cache_dirpath / metadata["data_dirname"]
+        feature_info = FeatureInfo(**metadata["feature_info"])
+        categories: dict[str, list[str]] = metadata["categories"]
+        codes = {name: self._load_array(data_dirpath, filename) for name, filename in metadata["codes"].items()}
+
+        columns: dict[str, Any] = {}
+        for name in metadata["column_names"]:
+            if name in metadata["values"]:
+                columns[name] = self._load_array(data_dirpath, metadata["values"][name])
+            elif name in metadata["texts"]:
+                columns[name] = self._load_text_column(data_dirpath, *metadata["texts"][name])
+            else:
+                columns[name] = pd.Categorical.from_codes(codes[name], categories=categories[name], validate=False)
+        tabular = pd.DataFrame(columns, columns=metadata["column_names"], copy=False)
+        weights = None
+        if metadata["weights"] is not None:
+            weights = self._load_array(data_dirpath, metadata["weights"])
+        return Dataset(tabular, feature_info, codes=codes, categories=categories, weights=weights)
+
+    def save(self, dataset: Dataset, tabular_filepath: Path, feature_info_filepath: Path) -> None:
+        """Save a dataset to the cache.
+
+        Only valid datasets are saved, so a dataset loaded from the cache is valid without checking the source files.
+
+        Args:
+            dataset (Dataset): Dataset to save.
+            tabular_filepath (Path): Path to the tabular dataset CSV file the dataset was loaded from.
+            feature_info_filepath (Path): Path to the feature_info JSON file the dataset was loaded from.
+
+        Raises:
+            DatasetValidationError: If the dataset is not valid.
+        """
+        dataset.load_columns(dataset.deferred_feature_names)
+        dataset.validate()
+
+        self.cache_dirpath.mkdir(parents=True, exist_ok=True)
+        data_dirpath = Path(tempfile.mkdtemp(dir=self.cache_dirpath, prefix="data-"))
+        column_names = [str(name) for name in dataset.tabular.columns]
+        values: dict[str, str] = {}
+        texts: dict[str, tuple[str, str]] = {}
+        codes: dict[str, str] = {}
+        for i, name in enumerate(column_names):
+            feature = dataset.get_feature(name)
+            series = dataset.tabular[name]
+            if name in dataset.codes:
+                codes[name] = f"codes-{i}.npy"
+                np.save(data_dirpath / codes[name], dataset.get_codes(name))
+            if isinstance(feature.type, Categorical):
+                continue
+            if pd.api.types.is_numeric_dtype(series.dtype):
+                values[name] = f"values-{i}.npy"
+                np.save(data_dirpath / values[name], series.to_numpy())
+            else:
+                texts[name] = (f"text-codes-{i}.npy", f"text-values-{i}.json")
+                self._save_text_column(series, data_dirpath, *texts[name])
+        weights = None
+        if dataset.weights is not None:
+            weights = "weights.npy"
+            np.save(data_dirpath / weights, dataset.weights)
+
+        metadata = {
+            "version": DATASET_CACHE_FORMAT_VERSION,
+            "data_dirname": data_dirpath.name,
+            "fingerprints": self.get_fingerprints(tabular_filepath, feature_info_filepath),
+            "feature_info": dataset.feature_info.model_dump(mode="json"),
+            "column_names": column_names,
+            "values": values,
+            "texts": texts,
+            "codes": codes,
+            "categories": {name: dataset.get_categories(name) for name in codes},
+            "weights": weights,
+        }
+        # Replace the metadata file in one rename once the data directory is complete, so readers see either the
+        # previous save or this one. The data of previous saves is then deleted, readers still loading it retry.
+        fd, tmp_filepath = tempfile.mkstemp(dir=self.cache_dirpath, suffix=".tmp")
+        with os.fdopen(fd, "w") as file:
+            json.dump(metadata, file)
+        Path(tmp_filepath).replace(self.cache_dirpath / "metadata.json")
+        for path in self.cache_dirpath.iterdir():
+            if path.name in {"metadata.json", data_dirpath.name}:
+                continue
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+        logger.info("Saved dataset cache to %s", self.cache_dirpath)
+
+    @staticmethod
+    def get_fingerprints(tabular_filepath: Path, feature_info_filepath: Path) -> dict[str, Any]:
+        """Get fingerprints of the dataset source files.
+
+        The tabular file is identified by its size and modification time so that large files are not read.
+
+        Args:
+            tabular_filepath (Path): Path to the tabular dataset CSV file.
+            feature_info_filepath (Path): Path to the feature_info JSON file.
+
+        Returns:
+            dict[str, Any]: Source file fingerprints.
+        """
+        tabular_stat = tabular_filepath.stat()
+        return {
+            "tabular": [tabular_stat.st_size, tabular_stat.st_mtime_ns],
+            "feature_info": hashlib.sha256(feature_info_filepath.read_bytes()).hexdigest(),
+        }
+
+    @staticmethod
+    def _load_array(dirpath: Path, filename: str) -> np.ndarray:
+        return np.load(dirpath / filename, mmap_mode="r", allow_pickle=False)
+
+    @staticmethod
+    def _save_text_column(series: pd.Series, dirpath: Path, codes_filename: str, values_filename: str) -> None:
+        """Save a text column as codes into its distinct values, with missing values coded -1."""
+        column_codes, column_values = pd.factorize(series, use_na_sentinel=True)
+        np.save(dirpath / codes_filename, column_codes.astype(np.min_scalar_type(-len(column_values) - 1)))
+        with (dirpath / values_filename).open("w") as file:
+            json.dump([str(value) for value in column_values], file)
+
+    @classmethod
+    def _load_text_column(cls, dirpath: Path, codes_filename: str, values_filename: str) -> np.ndarray:
+        """Load a text column saved by _save_text_column as an object array with NaN for missing values."""
+        with (dirpath / values_filename).open("r") as file:
+            column_values = json.load(file)
+        # Code -1 indexes the NaN appended after the distinct values.
+        return np.array([*column_values, np.nan], dtype=object)[cls._load_array(dirpath, codes_filename)]
@@ -0,0 +1,260 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from surv.dataset.dataset import Dataset
+
+logger = logging.getLogger(__name__)
+
+DATASET_NAME_PATTERN = re.compile(r"^\w[\w.-]*$")
+
+TABULAR_FILENAME = "tabular.csv"
+FEATURE_INFO_FILENAME = "features.json"
+
+# Size and modification time of each source file of a dataset.
+SourceStamp = tuple[tuple[int, int], ...]
+
+
+@dataclass
+class RegistryStats:
+    """Dataset registry statistics.
+
+    Attributes:
+        hits (int): Number of requests served by a loaded dataset.
+        misses (int): Number of requests that loaded a dataset.
+        reloads (int): Number of datasets reloaded because their source files changed.
+        evictions (int): Number of datasets evicted to stay within the memory budget.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    reloads: int = 0
+    evictions: int = 0
+
+
+@dataclass
+class RegistryEntry:
+    """Loaded dataset of a registry.
+
+    Attributes:
+        dataset (Dataset): The loaded dataset.
+        source_stamp (SourceStamp): Stamp of the source files the dataset was loaded from.
+        memory_bytes (int): Estimated memory used by the dataset when it was loaded.
+        checked_at (float): Monotonic time the source files were last checked for changes.
+    """
+
+    dataset: Dataset
+    source_stamp: SourceStamp
+    memory_bytes: int
+    checked_at: float
+
+
+@dataclass
+class DatasetRegistry:
+    """Registry of the datasets in a data directory, kept loaded across requests.
+
+    Every subdirectory with a tabular.csv and a features.json file is a dataset named after the subdirectory.
+    Datasets are loaded the first time they are requested and stay loaded. When the estimated memory of the loaded
+    datasets exceeds the memory budget, the least recently used datasets are evicted. Source files are checked for
+    changes at most once per reload interval, and a dataset whose files changed is loaded again. If loading the
+    changed files fails, for example because they are still being written, the previously loaded dataset is kept.
+
+    Safe to use from several threads. Requests for different datasets load concurrently, and concurrent requests for
+    the same dataset wait for a single load.
+
+    Attributes:
+        data_dirpath (Path): Directory with one subdirectory per dataset.
+        dataset_loader (Callable[[str], Dataset]): Loads a dataset by name from the source files.
+        max_memory_bytes (Optional[int]): Memory budget for loaded datasets. Unbounded if not set.
+        reload_interval (float): Minimum number of seconds between checks of the source files of a dataset.
+        stats (RegistryStats): Registry statistics.
+    """
+
+    data_dirpath: Path
+    dataset_loader: Callable[[str], Dataset]
+    max_memory_bytes: Optional[int] = None
+    reload_interval: float = 1.0
+    stats: RegistryStats = field(default_factory=RegistryStats)
+    _entries: OrderedDict[str, RegistryEntry] = field(default_factory=OrderedDict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _load_locks: dict[str, threading.Lock] = field(default_factory=dict, init=False, repr=False)
+
+    def discover(self) -> list[str]:
+        """Find the datasets in the data directory.
+
+        Returns:
+            list[str]: Sorted names of the datasets.
+        """
+        return sorted(
+            dirpath.name
+            for dirpath in self.data_dirpath.iterdir()
+            if DATASET_NAME_PATTERN.match(dirpath.name)
+            and (dirpath / TABULAR_FILENAME).is_file()
+            and (dirpath / FEATURE_INFO_FILENAME).is_file()
+        )
+
+    def get(self, dataset_name: str) -> Dataset:
+        """Get a dataset, loading it if it is not loaded or its source files changed.
+
+        Args:
+            dataset_name (str): Name of the dataset.
+
+        Returns:
+            Dataset: The dataset.
+
+        Raises:
+            FileNotFoundError: If there is no dataset with the name.
+        """
+        entry = self._get_fresh_entry(dataset_name)
+        if entry is not None:
+            return entry.dataset
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(dataset_name, threading.Lock())
+        with load_lock:
+            # Another thread may have loaded the dataset while this one was waiting.
+            entry = self._get_fresh_entry(dataset_name)
+            if entry is not None:
+                return entry.dataset
+            return self._load(dataset_name)
+
+    def evict(self, dataset_name: str) -> None:
+        """Unload a dataset. It is loaded again the next time it is requested.
+
+        Args:
+            dataset_name (str): Name of the dataset.
+        """
+        with self._lock:
+            self._entries.pop(dataset_name, None)
+
+    @property
+    def loaded_dataset_names(self) -> list[str]:
+        """Names of the loaded datasets, from least to most recently used."""
+        with self._lock:
+            return list(self._entries)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated memory used by the loaded datasets."""
+        with self._lock:
+            return sum(entry.memory_bytes for entry in self._entries.values())
+
+    def get_dataset_dirpath(self, dataset_name: str) -> Path:
+        """Get the directory of a dataset.
+
+        Args:
+            dataset_name (str): Name of the dataset.
+
+        Returns:
+            Path: Directory of the dataset source files.
+
+        Raises:
+            FileNotFoundError: If the name is not a valid dataset name.
+        """
+        if not DATASET_NAME_PATTERN.match(dataset_name):
+            msg = f"Invalid dataset name '{dataset_name}'."
+            raise FileNotFoundError(msg)
+        return self.data_dirpath / dataset_name
+
+    def get_source_stamp(self, dataset_name: str) -> SourceStamp:
+        """Get the stamp of the source files of a dataset, which changes whenever either file is modified.
+
+        Args:
+            dataset_name (str): Name of the dataset.
+
+        Returns:
+            SourceStamp: Size and modification time of each source file.
+
+        Raises:
+            FileNotFoundError: If a source file does not exist.
+        """
+        dataset_dirpath = self.get_dataset_dirpath(dataset_name)
+        stamp = []
+        for filename in (TABULAR_FILENAME, FEATURE_INFO_FILENAME):
+            stat = (dataset_dirpath / filename).stat()
+            stamp.append((stat.st_size, stat.st_mtime_ns))
+        return tuple(stamp)
+
+    @staticmethod
+    def estimate_memory(dataset: Dataset) -> int:
+        """Estimate the memory used by a dataset.
+
+        Args:
+            dataset (Dataset): Dataset to estimate.
+
+        Returns:
+            int: Estimated number of bytes of the loaded columns, codes and weights.
+        """
+        memory_bytes = int(dataset.tabular.memory_usage(index=False, deep=True).sum())
+        memory_bytes += sum(codes.nbytes for codes in dataset.codes.values())
+        if dataset.weights is not None:
+            memory_bytes += dataset.weights.nbytes
+        return memory_bytes
+
+    def _get_fresh_entry(self, dataset_name: str) -> Optional[RegistryEntry]:
+        """Get the entry of a loaded dataset if its source files have not changed since it was loaded."""
+        with self._lock:
+            entry = self._entries.get(dataset_name)
+            if entry is None:
+                return None
+            now = time.monotonic()
+            if now - entry.checked_at < self.reload_interval:
+                self._entries.move_to_end(dataset_name)
+                self.stats.hits += 1
+                return entry
+
+        try:
+            source_stamp = self.get_source_stamp(dataset_name)
+        except FileNotFoundError:
+            logger.warning("Source files of dataset %s are missing, keeping the loaded dataset", dataset_name)
+            source_stamp = entry.source_stamp
+        with self._lock:
+            entry.checked_at = now
+            if source_stamp != entry.source_stamp:
+                return None
+            if dataset_name in self._entries:
+                self._entries.move_to_end(dataset_name)
+            self.stats.hits += 1
+            return entry
+
+    def _load(self, dataset_name: str) -> Dataset:
+        """Load a dataset, keeping the loaded dataset if reloading it fails."""
+        with self._lock:
+            previous_entry = self._entries.get(dataset_name)
+        source_stamp = self.get_source_stamp(dataset_name)
+        try:
+            dataset = self.dataset_loader(dataset_name)
+        except Exception:
+            if previous_entry is None:
+                raise
+            logger.exception("Failed to reload dataset %s, keeping the loaded dataset", dataset_name)
+            return previous_entry.dataset
+
+        entry = RegistryEntry(dataset, source_stamp, self.estimate_memory(dataset), time.monotonic())
+        with self._lock:
+            if previous_entry is None:
+                self.stats.misses += 1
+            else:
+                self.stats.reloads += 1
+            self._entries[dataset_name] = entry
+            self._entries.move_to_end(dataset_name)
+            self._evict_over_budget()
+        logger.info("Loaded dataset %s using about %d bytes", dataset_name, entry.memory_bytes)
+        return dataset
+
+    def _evict_over_budget(self) -> None:
+        """Evict least recently used datasets until the loaded datasets fit in the budget, always keeping the newest."""
+        if self.max_memory_bytes is None:
+            return
+        memory_bytes = sum(entry.memory_bytes for entry in self._entries.values())
+        while memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+            dataset_name, entry = self._entries.popitem(last=False)
+            memory_bytes -= entry.memory_bytes
+            self.stats.evictions += 1
+            logger.info("Evicted dataset %s to stay within the memory budget", dataset_name)
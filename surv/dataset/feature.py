@@ -20,6 +20,10 @@ class Feature(BaseModel):
     purpose: FeaturePurpose = Field(..., discriminator="name")
     metadata: Optional[FeatureMetadata] = None
 
+    def __hash__(self) -> int:
+        """Hash the feature by its name, which is unique within a dataset."""
+        return hash(self.name)
+
     def __repr__(self) -> str:
         """Return the string representation of the feature."""
         return f"Feature({self.name})"
@@ -1,11 +1,17 @@
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, PrivateAttr, model_validator
 
 from surv.dataset.feature import Feature
+from surv.dataset.feature_purpose import Evaluation, SampleWeight, Training
 
 
 class FeatureInfo(BaseModel):
     """Dataset feature information.
 
+    Features are indexed by name and by purpose when the feature information is created, so lookups do not scan the
+    features. The features are not expected to change afterwards.
+
     Attributes:
         features (list[Feature]): List of dataset features.
         target_feature_name (str): Name of the target feature.
@@ -13,3 +19,81 @@ class FeatureInfo(BaseModel):
 
     features: list[Feature]
     target_feature_name: str
+    _features_by_name: dict[str, Feature] = PrivateAttr(default_factory=dict)
+    _features_by_purpose: dict[type, tuple[Feature, ...]] = PrivateAttr(default_factory=dict)
+    _sample_weight_feature: Optional[Feature] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def _index_features(self) -> "FeatureInfo":
+        """Index the features by name and by purpose."""
+        features_by_purpose: dict[type, list[Feature]] = {}
+        for feature in self.features:
+            if feature.name in self._features_by_name:
+                msg = f"Duplicate feature name '{feature.name}'."
+                raise ValueError(msg)
+            self._features_by_name[feature.name] = feature
+            features_by_purpose.setdefault(type(feature.purpose), []).append(feature)
+        self._features_by_purpose = {purpose: tuple(features) for purpose, features in features_by_purpose.items()}
+
+        sample_weight_features = [
+            feature
+            for feature in self.get_features(Evaluation)
+            if isinstance(feature.purpose, Evaluation) and isinstance(feature.purpose.type, SampleWeight)
+        ]
+        if len(sample_weight_features) > 1:
+            msg = "Dataset can have at most one sample weight feature."
+            raise ValueError(msg)
+        self._sample_weight_feature = sample_weight_features[0] if sample_weight_features else None
+        return self
+
+    def get_feature(self, feature_name: str) -> Feature:
+        """Get a feature by name.
+
+        Args:
+            feature_name (str): Name of the feature.
+
+        Returns:
+            Feature: The feature for the given name.
+        """
+        feature = self._features_by_name.get(feature_name)
+        if feature is None:
+            msg = f"Feature '{feature_name}' not found in dataset metadata."
+            raise ValueError(msg)
+        return feature
+
+    def has_feature(self, feature_name: str) -> bool:
+        """Check whether there is a feature with a name.
+
+        Args:
+            feature_name (str): Name of the feature.
+
+        Returns:
+            bool: Whether the feature exists.
+        """
+        return feature_name in self._features_by_name
+
+    def get_features(self, purpose: type) -> tuple[Feature, ...]:
+        """Get the features with a purpose.
+
+        Args:
+            purpose (type): Feature purpose class, for example Training.
+
+        Returns:
+            tuple[Feature, ...]: Features with the purpose, in feature order.
+        """
+        return self._features_by_purpose.get(purpose, ())
+
+    @property
+    def training_features(self) -> tuple[Feature, ...]:
+        """Features that questions can be asked about, in feature order."""
+        return self.get_features(Training)
+
+    @property
+    def target_feature(self) -> Feature:
+        """Target feature."""
+        return self.get_feature(self.target_feature_name)
+
+    @property
+    def sample_weight_feature(self) -> Optional[Feature]:
+        """Feature with the sample weight evaluation purpose, if there is one."""
+        return self._sample_weight_feature
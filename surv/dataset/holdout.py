@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from surv.dataset.dataset import Dataset
+from surv.dataset.feature_purpose import Grouping, Stratification, SubjectWise
+
+
+def split_holdout(dataset: Dataset, holdout_fraction: float, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Randomly split the dataset rows into training rows and held-out rows.
+
+    If the dataset has a subject-wise grouping feature, all rows of a subject end up on the same side of the split.
+    If it has a stratification grouping feature, each stratum is split separately so that strata are represented in
+    the same proportions on both sides.
+
+    Args:
+        dataset (Dataset): Dataset to split.
+        holdout_fraction (float): Fraction of rows, or subjects, to hold out.
+        seed (int): Random seed.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Indices of the training rows and of the held-out rows.
+    """
+    if not 0 < holdout_fraction < 1:
+        msg = f"Holdout fraction must be between 0 and 1, got {holdout_fraction}."
+        raise ValueError(msg)
+
+    subject_ids = np.arange(dataset.n_samples)
+    strata = np.zeros(dataset.n_samples, dtype=np.intp)
+    for feature in dataset.feature_info.get_features(Grouping):
+        if not isinstance(feature.purpose, Grouping) or feature.name not in dataset.column_names:
+            continue
+        match feature.purpose.type:
+            case SubjectWise():
+                subject_ids, _ = pd.factorize(dataset.get_column(feature.name), use_na_sentinel=False)
+            case Stratification():
+                strata, _ = pd.factorize(dataset.get_column(feature.name), use_na_sentinel=False)
+
+    # Each subject is assigned to the stratum of its first row.
+    subjects, first_rows = np.unique(subject_ids, return_index=True)
+    subject_strata = strata[first_rows]
+
+    rng = np.random.default_rng(seed)
+    holdout_subjects = []
+    for stratum in np.unique(subject_strata):
+        stratum_subjects = rng.permutation(subjects[subject_strata == stratum])
+        n_holdout = round(stratum_subjects.shape[0] * holdout_fraction)
+        holdout_subjects.append(stratum_subjects[:n_holdout])
+
+    is_holdout = np.isin(subject_ids, np.concatenate(holdout_subjects))
+    return np.flatnonzero(~is_holdout), np.flatnonzero(is_holdout)
@@ -0,0 +1,58 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+PATTERN_WEIGHT_COLUMN = "__pattern_weight__"
+
+
+def count_patterns(frame: pd.DataFrame, weights: Optional[np.ndarray] = None) -> tuple[pd.DataFrame, np.ndarray]:
+    """Collapse identical rows into unique patterns.
+
+    Args:
+        frame (pd.DataFrame): Rows to collapse.
+        weights (Optional[np.ndarray]): Weight of each row. Defaults to a weight of 1 per row.
+
+    Returns:
+        tuple[pd.DataFrame, np.ndarray]: Unique patterns and the summed weight of the rows of each pattern.
+    """
+    pattern_weights = np.ones(frame.shape[0]) if weights is None else np.asarray(weights, dtype=np.float64)
+    weighted_frame = frame.assign(**{PATTERN_WEIGHT_COLUMN: pattern_weights})
+    grouped = weighted_frame.groupby(list(frame.columns), sort=False, dropna=False)[PATTERN_WEIGHT_COLUMN].sum()
+    patterns = grouped.index.to_frame(index=False)
+    return patterns, grouped.to_numpy()
+
+
+def merge_patterns(
+    patterns: list[pd.DataFrame],
+    pattern_weights: list[np.ndarray],
+) -> tuple[pd.DataFrame, np.ndarray]:
+    """Merge several pattern tables, summing the weights of patterns that appear in more than one.
+
+    Args:
+        patterns (list[pd.DataFrame]): Pattern tables with the same columns.
+        pattern_weights (list[np.ndarray]): Weights of the patterns in each table.
+
+    Returns:
+        tuple[pd.DataFrame, np.ndarray]: Merged unique patterns and their summed weights.
+    """
+    if len(patterns) == 1:
+        return patterns[0], pattern_weights[0]
+    return count_patterns(pd.concat(patterns, ignore_index=True), np.concatenate(pattern_weights))
+
+
+def find_patterns(frame: pd.DataFrame, weights: Optional[np.ndarray] = None) -> tuple[np.ndarray, np.ndarray]:
+    """Find the first row of each unique pattern.
+
+    Args:
+        frame (pd.DataFrame): Rows to collapse.
+        weights (Optional[np.ndarray]): Weight of each row. Defaults to a weight of 1 per row.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Index of the first row of each unique pattern, in order of appearance, and the
+            summed weight of the rows of each pattern.
+    """
+    pattern_ids = frame.groupby(list(frame.columns), sort=False, dropna=False).ngroup().to_numpy()
+    _, first_rows = np.unique(pattern_ids, return_index=True)
+    pattern_weights = np.bincount(pattern_ids, weights=weights, minlength=first_rows.shape[0]).astype(np.float64)
+    return first_rows, pattern_weights
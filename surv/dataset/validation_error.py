@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+MAX_REPORTED_EXAMPLES = 5
+
+
+@dataclass(frozen=True)
+class InvalidValues:
+    """Invalid values of a feature.
+
+    Attributes:
+        feature_name (str): Name of the feature.
+        rows (np.ndarray): Indices of the rows with invalid values.
+        values (np.ndarray): Invalid values, aligned with rows.
+    """
+
+    feature_name: str
+    rows: np.ndarray
+    values: np.ndarray
+
+    @property
+    def unique_values(self) -> list[Any]:
+        """Distinct invalid values."""
+        return list(dict.fromkeys(self.values.tolist()))
+
+
+class DatasetValidationError(ValueError):
+    """Dataset values do not match the feature metadata.
+
+    Attributes:
+        invalid_values (list[InvalidValues]): Invalid values of each feature with at least one invalid value.
+    """
+
+    def __init__(self, invalid_values: list[InvalidValues]) -> None:
+        """Create a validation error from the invalid values of each feature.
+
+        Args:
+            invalid_values (list[InvalidValues]): Invalid values of each feature with at least one invalid value.
+        """
+        self.invalid_values = invalid_values
+        lines = ["Invalid values for features:"]
+        for feature_invalid_values in invalid_values:
+            examples = ", ".join(f"'{value}'" for value in feature_invalid_values.unique_values[:MAX_REPORTED_EXAMPLES])
+            lines.append(
+                f"'{feature_invalid_values.feature_name}': {feature_invalid_values.rows.shape[0]} rows ({examples})"
+            )
+        super().__init__("\n".join(lines))
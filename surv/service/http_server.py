@@ -0,0 +1,226 @@
+import asyncio
+import contextlib
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, Optional
+
+from surv.service.survey_service import Answer, ServiceError, SurveyService
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 64 * 1024
+
+SESSIONS_PATH = re.compile(r"^/sessions/?$")
+SESSION_PATH = re.compile(r"^/sessions/(?P<session_id>[0-9a-f]+)/?$")
+QUESTION_PATH = re.compile(r"^/sessions/(?P<session_id>[0-9a-f]+)/question/?$")
+ANSWERS_PATH = re.compile(r"^/sessions/(?P<session_id>[0-9a-f]+)/answers/?$")
+
+
+@dataclass(frozen=True)
+class Response:
+    """HTTP response with a JSON body.
+
+    Attributes:
+        status (int): HTTP status code.
+        body (dict[str, Any]): JSON response body.
+    """
+
+    status: int
+    body: dict[str, Any]
+
+    def encode(self, keep_alive: bool) -> bytes:
+        """Encode the response as an HTTP/1.1 message.
+
+        Args:
+            keep_alive (bool): Whether the connection is kept open after the response.
+
+        Returns:
+            bytes: The encoded response.
+        """
+        content = json.dumps(self.body).encode()
+        headers = [
+            f"HTTP/1.1 {self.status} {HTTPStatus(self.status).phrase}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(content)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        return "\r\n".join(headers).encode("latin-1") + b"\r\n\r\n" + content
+
+
+async def handle_request(service: SurveyService, method: str, path: str, body: bytes) -> Response:
+    """Route a request to the survey service.
+
+    Endpoints:
+        POST /sessions with {"dataset_name": ...} starts a session and returns the first question.
+        GET /sessions/<session_id>/question returns the current question.
+        POST /sessions/<session_id>/answers with {"answer": ...} answers the current question and returns the next.
+            The answer is a string, a list of categories that could all apply, or null to skip the question.
+        DELETE /sessions/<session_id> ends a session.
+
+    Args:
+        service (SurveyService): Survey service to handle the request.
+        method (str): HTTP method.
+        path (str): Request path.
+        body (bytes): Request body.
+
+    Returns:
+        Response: The response.
+    """
+    try:
+        return await _route(service, method, path, body)
+    except ServiceError as error:
+        return Response(error.status, {"error": error.message})
+    except Exception:
+        logger.exception("Failed to handle %s %s", method, path)
+        return Response(500, {"error": "Internal server error."})
+
+
+async def _route(service: SurveyService, method: str, path: str, body: bytes) -> Response:
+    if SESSIONS_PATH.match(path) and method == "POST":
+        dataset_name = _get_body_field(body, "dataset_name")
+        return Response(201, await service.start_session(dataset_name))
+    if (match := QUESTION_PATH.match(path)) and method == "GET":
+        return Response(200, await service.next_question(match["session_id"]))
+    if (match := ANSWERS_PATH.match(path)) and method == "POST":
+        answer = _get_answer(body)
+        return Response(200, await service.answer(match["session_id"], answer))
+    if (match := SESSION_PATH.match(path)) and method == "DELETE":
+        service.end_session(match["session_id"])
+        return Response(200, {"session_id": match["session_id"]})
+    return Response(404, {"error": f"No endpoint for {method} {path}."})
+
+
+def _get_body(body: bytes) -> dict[str, Any]:
+    try:
+        data = json.loads(body)
+    except json.JSONDecodeError as error:
+        raise ServiceError(400, "Request body is not valid JSON.") from error
+    if not isinstance(data, dict):
+        raise ServiceError(400, "Request body must be a JSON object.")
+    return data
+
+
+def _get_body_field(body: bytes, name: str) -> str:
+    data = _get_body(body)
+    if not isinstance(data.get(name), str):
+        raise ServiceError(400, f"Request body must have a string field '{name}'.")
+    return data[name]
+
+
+def _get_answer(body: bytes) -> Answer:
+    data = _get_body(body)
+    if "answer" not in data:
+        raise ServiceError(400, "Request body must have a field 'answer'.")
+    answer = data["answer"]
+    is_list = isinstance(answer, list) and all(isinstance(value, str) for value in answer)
+    if not (answer is None or isinstance(answer, str) or is_list):
+        raise ServiceError(400, "Field 'answer' must be a string, a list of strings or null.")
+    return answer
+
+
+@dataclass
+class SurveyHttpServer:
+    """Minimal asyncio HTTP/1.1 server for the survey service.
+
+    Connections are kept alive between requests so that respondents do not pay for a new connection per answer.
+
+    Attributes:
+        service (SurveyService): Survey service that handles requests.
+        host (str): Host to listen on.
+        port (int): Port to listen on. Port 0 picks a free port.
+        backlog (int): Maximum number of pending connections.
+    """
+
+    service: SurveyService
+    host: str = "127.0.0.1"
+    port: int = 8000
+    backlog: int = 4096
+    _server: Optional[asyncio.Server] = field(default=None, init=False, repr=False)
+
+    async def start(self) -> None:
+        """Start listening for connections."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port, backlog=self.backlog)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Survey service listening on %s:%d", self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        """Start the server if needed and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        """Stop listening and close the server."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    writer.write(Response(400, {"error": "Malformed request line."}).encode(keep_alive=False))
+                    break
+
+                headers = {}
+                while (line := await reader.readline()) not in {b"\r\n", b"\n", b""}:
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                content_length = int(headers.get("content-length", "0"))
+                if content_length > MAX_BODY_BYTES:
+                    writer.write(Response(413, {"error": "Request body too large."}).encode(keep_alive=False))
+                    break
+                body = await reader.readexactly(content_length)
+
+                response = await handle_request(self.service, method, path, body)
+                writer.write(response.encode(keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            logger.debug("Connection closed with an incomplete request")
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+@dataclass
+class LocalSurveyClient:
+    """In-process stand-in for an HTTP client of the survey service.
+
+    Requests are routed exactly as by the HTTP server, without opening sockets, so tests and load experiments can
+    drive the service directly.
+
+    Attributes:
+        service (SurveyService): Survey service that handles requests.
+    """
+
+    service: SurveyService
+
+    async def request(self, method: str, path: str, body: Optional[dict[str, Any]] = None) -> Response:
+        """Send a request to the service.
+
+        Args:
+            method (str): HTTP method.
+            path (str): Request path.
+            body (Optional[dict[str, Any]]): JSON request body.
+
+        Returns:
+            Response: The response.
+        """
+        content = json.dumps(body).encode() if body is not None else b""
+        return await handle_request(self.service, method, path, content)
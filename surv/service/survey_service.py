@@ -0,0 +1,323 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Optional, Union
+
+from surv.algo.constraints import Constraint, EqConstraint, GtConstraint, InConstraint, LtConstraint, SkipConstraint
+from surv.algo.evaluation_cache import CacheStats, EvaluationCache
+from surv.algo.evaluator import Evaluator
+from surv.algo.result import Continue, Result, Terminal
+from surv.algo.session import Session
+from surv.dataset.dataset import Dataset
+from surv.dataset.dataset_registry import DATASET_NAME_PATTERN
+from surv.dataset.feature_types import Categorical, Numeric
+
+logger = logging.getLogger(__name__)
+
+# A category or number, several categories that could all apply, or None to skip the question.
+Answer = Union[str, list[str], None]
+
+
+class ServiceError(Exception):
+    """Survey service request error.
+
+    Attributes:
+        status (int): HTTP status code of the error.
+        message (str): Error message.
+    """
+
+    def __init__(self, status: int, message: str) -> None:
+        """Create a service error.
+
+        Args:
+            status (int): HTTP status code of the error.
+            message (str): Error message.
+        """
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class ServiceSession:
+    """State of one respondent's survey.
+
+    Attributes:
+        session_id (str): Session identifier.
+        dataset_name (str): Name of the dataset the survey is based on.
+        session (Session): Constraints collected so far and the matching dataset rows.
+        result (Result): Evaluation result for the current constraints, with the next question if there is one.
+        last_active (float): Monotonic time of the last request for this session.
+        lock (asyncio.Lock): Lock that serializes requests for this session.
+    """
+
+    session_id: str
+    dataset_name: str
+    session: Session
+    result: Result
+    last_active: float = field(default_factory=time.monotonic)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+
+@dataclass
+class SurveyService:
+    """Asynchronous survey service with many concurrent sessions.
+
+    Datasets are requested from the dataset loader whenever a session starts, and each session keeps the dataset it
+    started with, shared read-only with the other sessions. Only the constraints and the matching row indices are
+    kept per session. The loader is expected to keep datasets loaded between requests, like DatasetRegistry.get
+    does, so that datasets can be reloaded or evicted without restarting the service. Evaluations run on a worker
+    thread pool, so the event loop keeps serving other respondents while one evaluation is running. Respondents with
+    the same answers share evaluation results: results are cached, and concurrent requests for the same result wait
+    on a single evaluation. Sessions that have been idle for longer than the session timeout are expired.
+
+    Attributes:
+        dataset_loader (Callable[[str], Dataset]): Gets a dataset by name. Called on a worker thread.
+        evaluator (Evaluator): Evaluator used to select questions.
+        information_gain_threshold (float): Questions with a lower information gain are not asked.
+        n_workers (Optional[int]): Number of evaluation worker threads. Defaults to the number of CPUs.
+        session_timeout (float): Seconds after which an idle session expires.
+        max_sessions (int): Maximum number of open sessions.
+        cache_size (int): Maximum number of cached evaluation results.
+    """
+
+    dataset_loader: Callable[[str], Dataset]
+    evaluator: Evaluator = field(default_factory=Evaluator)
+    information_gain_threshold: float = 0.0
+    n_workers: Optional[int] = None
+    session_timeout: float = 3600.0
+    max_sessions: int = 100_000
+    cache_size: int = 65_536
+    _cache: EvaluationCache = field(init=False, repr=False)
+    _pending_results: dict[str, "asyncio.Future[Result]"] = field(default_factory=dict, init=False, repr=False)
+    _sessions: dict[str, ServiceSession] = field(default_factory=dict, init=False, repr=False)
+    _executor: ThreadPoolExecutor = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Start the evaluation worker pool."""
+        self._cache = EvaluationCache(evaluator=self.evaluator, max_size=self.cache_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.n_workers, thread_name_prefix="surv-evaluate")
+
+    async def start_session(self, dataset_name: str) -> dict[str, Any]:
+        """Start a survey session.
+
+        Args:
+            dataset_name (str): Name of the dataset the survey is based on.
+
+        Returns:
+            dict[str, Any]: Session identifier and the first question.
+        """
+        self.expire_sessions()
+        if len(self._sessions) >= self.max_sessions:
+            raise ServiceError(503, "Too many open sessions.")
+
+        dataset = await self.get_dataset(dataset_name)
+        session = Session(dataset)
+        result = await self._evaluate(session)
+        service_session = ServiceSession(uuid.uuid4().hex, dataset_name, session, result)
+        self._sessions[service_session.session_id] = service_session
+        logger.debug("Started session %s on dataset %s", service_session.session_id, dataset_name)
+        return self._get_state(service_session)
+
+    async def next_question(self, session_id: str) -> dict[str, Any]:
+        """Get the current question of a session.
+
+        Args:
+            session_id (str): Session identifier.
+
+        Returns:
+            dict[str, Any]: Session state with the next question, or the outcome if the survey is over.
+        """
+        service_session = self._get_session(session_id)
+        return self._get_state(service_session)
+
+    async def answer(self, session_id: str, answer: Answer) -> dict[str, Any]:
+        """Answer the current question of a session.
+
+        Args:
+            session_id (str): Session identifier.
+            answer (Answer): Answer to the current question, several categories that could all apply, or None to
+                skip the question.
+
+        Returns:
+            dict[str, Any]: Session state with the next question, or the outcome if the survey is over.
+        """
+        service_session = self._get_session(session_id)
+        async with service_session.lock:
+            result = self._get_result(service_session)
+            if not isinstance(result, Continue):
+                raise ServiceError(409, "Survey is already finished.")
+            constraint = self.get_constraint(result, answer)
+            # Narrowing the rows scans the dataset column, so it runs on a worker thread like evaluations.
+            loop = asyncio.get_running_loop()
+            session = await loop.run_in_executor(self._executor, service_session.session.branch, constraint)
+            service_session.result = await self._evaluate(session)
+            service_session.session = session
+            service_session.last_active = time.monotonic()
+        return self._get_state(service_session)
+
+    def end_session(self, session_id: str) -> None:
+        """End a session and release its state.
+
+        Args:
+            session_id (str): Session identifier.
+        """
+        self._get_session(session_id)
+        del self._sessions[session_id]
+
+    async def get_dataset(self, dataset_name: str) -> Dataset:
+        """Get a dataset from the dataset loader on a worker thread.
+
+        Args:
+            dataset_name (str): Name of the dataset.
+
+        Returns:
+            Dataset: The shared dataset.
+        """
+        if not DATASET_NAME_PATTERN.match(dataset_name):
+            raise ServiceError(400, f"Invalid dataset name '{dataset_name}'.")
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, self._load_dataset, dataset_name)
+        except FileNotFoundError as error:
+            raise ServiceError(404, f"Dataset '{dataset_name}' not found.") from error
+
+    def expire_sessions(self) -> int:
+        """Remove sessions that have been idle for longer than the session timeout.
+
+        Returns:
+            int: Number of expired sessions.
+        """
+        expiry = time.monotonic() - self.session_timeout
+        expired_session_ids = [
+            session_id
+            for session_id, service_session in self._sessions.items()
+            if service_session.last_active < expiry and not service_session.lock.locked()
+        ]
+        for session_id in expired_session_ids:
+            del self._sessions[session_id]
+        return len(expired_session_ids)
+
+    def close(self) -> None:
+        """Shut down the evaluation worker pool."""
+        self._executor.shutdown()
+        self.evaluator.close()
+
+    @property
+    def n_sessions(self) -> int:
+        """Number of open sessions."""
+        return len(self._sessions)
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        """Statistics of the shared evaluation result cache."""
+        return self._cache.stats
+
+    @staticmethod
+    def get_constraint(result: Continue, answer: Answer) -> Constraint:
+        """Convert an answer to the question of an evaluation result into a constraint.
+
+        Args:
+            result (Continue): Evaluation result with the question that was answered.
+            answer (Answer): Answer to the question.
+
+        Returns:
+            Constraint: Constraint for the answer.
+        """
+        feature = result.feature
+        if answer is None:
+            return SkipConstraint(feature=feature)
+        match feature.type:
+            case Categorical(categories=categories):
+                values = [answer] if isinstance(answer, str) else answer
+                for value in values:
+                    if value not in categories:
+                        raise ServiceError(400, f"Answer '{value}' is not valid for question '{feature.name}'.")
+                if isinstance(answer, str):
+                    return EqConstraint(feature=feature, value=answer)
+                if not values:
+                    raise ServiceError(400, f"Answer to question '{feature.name}' has no categories.")
+                return InConstraint(feature=feature, values=tuple(values))
+            case Numeric():
+                if not isinstance(answer, str):
+                    raise ServiceError(400, f"Answer to question '{feature.name}' must be a single number.")
+                try:
+                    number = float(answer)
+                except ValueError as error:
+                    raise ServiceError(
+                        400, f"Answer '{answer}' to question '{feature.name}' is not a number."
+                    ) from error
+                if result.threshold is None:
+                    return EqConstraint(feature=feature, value=str(number))
+                if number < result.threshold:
+                    return LtConstraint(feature=feature, value=result.threshold)
+                return GtConstraint(feature=feature, value=result.threshold)
+            case _:
+                raise NotImplementedError
+
+    def _load_dataset(self, dataset_name: str) -> Dataset:
+        dataset = self.dataset_loader(dataset_name)
+        # Compute the fingerprint used in cache keys on the worker thread rather than on the event loop.
+        logger.debug("Loaded dataset %s with fingerprint %s", dataset_name, dataset.fingerprint)
+        return dataset
+
+    async def _evaluate(self, session: Session) -> Result:
+        key = self._cache.get_key(session.dataset, session.constraints)
+        result = self._cache.get(key)
+        if result is not None:
+            return result
+
+        future = self._pending_results.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, self.evaluator.evaluate_session, session)
+            self._pending_results[key] = future
+            future.add_done_callback(partial(self._finish_evaluation, key))
+        # Shield the shared evaluation so that a cancelled request does not cancel it for the other requests.
+        return await asyncio.shield(future)
+
+    def _finish_evaluation(self, key: str, future: "asyncio.Future[Result]") -> None:
+        del self._pending_results[key]
+        if not future.cancelled() and future.exception() is None:
+            self._cache.put(key, future.result())
+
+    def _get_session(self, session_id: str) -> ServiceSession:
+        service_session = self._sessions.get(session_id)
+        if service_session is None:
+            raise ServiceError(404, f"Session '{session_id}' not found.")
+        service_session.last_active = time.monotonic()
+        return service_session
+
+    def _get_result(self, service_session: ServiceSession) -> Result:
+        """Get the result of a session, ending the survey if no question is worth asking."""
+        session = service_session.session
+        return service_session.result.apply_stopping_rule(
+            len(session.constraints), session.dataset.n_training_features, self.information_gain_threshold
+        )
+
+    def _get_state(self, service_session: ServiceSession) -> dict[str, Any]:
+        result = self._get_result(service_session)
+        state: dict[str, Any] = {
+            "session_id": service_session.session_id,
+            "n_answers": len(service_session.session.constraints),
+            # Copy the posterior of the shared cached result into the response.
+            "posterior": dict(result.posterior),
+        }
+        match result:
+            case Terminal(category=category):
+                state["status"] = "terminal"
+                state["category"] = category
+            case Continue(feature=feature, threshold=threshold):
+                state["status"] = "question"
+                state["feature_name"] = feature.name
+                state["question"] = feature.metadata.question if feature.metadata is not None else None
+                state["categories"] = feature.type.categories if isinstance(feature.type, Categorical) else None
+                state["threshold"] = threshold
+            case _:
+                state["status"] = "unknown"
+        return state
@@ -1,15 +1,51 @@
 from pathlib import Path
+from typing import Literal, Optional
 
 from pydantic import Field
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Application settings.
 
+    Every setting is read from an environment variable with the SURV_ prefix, for example SURV_LOOKAHEAD_DEPTH.
+
     Attributes:
         data_dirpath (Path): Path to directory containing data files.
+        information_gain_threshold (float): Questions with a lower information gain are not asked.
+        evaluation_executor (Literal["serial", "thread", "process"]): How training features are scored.
+        evaluation_workers (Optional[int]): Number of workers used to score training features concurrently.
+        use_dataset_cache (bool): Whether to load datasets from an on-disk columnar cache next to the source files.
+        stream_chunk_size (Optional[int]): If set, datasets are streamed from the source files in chunks of this many
+            rows and compressed into weighted unique rows instead of being loaded into memory at once.
+        compress_datasets (bool): Whether to collapse rows with identical training feature values and target into
+            weighted unique rows after loading.
+        lookahead_depth (int): Number of questions looked ahead when selecting a question, 1 selects greedily.
+        lookahead_width (int): Number of candidate questions expanded at each node of the lookahead search.
+        stop_posterior (Optional[float]): If set, surveys end with the most probable target once its posterior
+            probability reaches this value.
+        stop_entropy (Optional[float]): If set, surveys end with the most probable target once the entropy of the
+            posterior, which bounds the information the remaining questions can gain, falls below this value.
+        posterior_prior (float): Pseudo-count added to every target category when estimating the posterior.
+        dataset_memory_budget (Optional[int]): If set, the service evicts least recently used datasets when the loaded
+            datasets use more than this many bytes.
+        dataset_reload_interval (float): Minimum number of seconds between checks of the dataset source files for
+            changes by the service.
     """
 
+    model_config = SettingsConfigDict(env_prefix="surv_")
+
     data_dirpath: Path = Field(alias="surv_data_dirpath")
     information_gain_threshold: float = 0.05
+    evaluation_executor: Literal["serial", "thread", "process"] = "serial"
+    evaluation_workers: Optional[int] = None
+    use_dataset_cache: bool = True
+    stream_chunk_size: Optional[int] = None
+    compress_datasets: bool = False
+    lookahead_depth: int = 1
+    lookahead_width: int = 3
+    stop_posterior: Optional[float] = None
+    stop_entropy: Optional[float] = None
+    posterior_prior: float = 0.0
+    dataset_memory_budget: Optional[int] = None
+    dataset_reload_interval: float = 1.0
@@ -21,9 +21,8 @@ def get_evaluation_dataset_names() -> list[str]:
     return ["house", "latitude"]
 
 
-@pytest.fixture(scope="session", params=get_evaluation_dataset_names())
-def evaluation_dataset(request: pytest.FixtureRequest) -> EvaluationDataset:
-    data_dirpath = Path(__file__).parent / "data" / request.param
+def load_evaluation_dataset(dataset_name: str) -> EvaluationDataset:
+    data_dirpath = Path(__file__).parent / "data" / dataset_name
     feature_info_filepath = data_dirpath / "features.json"
     tabular_filepath = data_dirpath / "tabular.csv"
     dataset = Dataset.from_files(tabular_filepath, feature_info_filepath)
@@ -35,3 +34,13 @@ def evaluation_dataset(request: pytest.FixtureRequest) -> EvaluationDataset:
         tags = json.load(file)
 
     return EvaluationDataset(dataset, tags)
+
+
+@pytest.fixture(scope="session", params=get_evaluation_dataset_names())
+def evaluation_dataset(request: pytest.FixtureRequest) -> EvaluationDataset:
+    return load_evaluation_dataset(request.param)
+
+
+@pytest.fixture(scope="session")
+def house_dataset() -> Dataset:
+    return load_evaluation_dataset("house").dataset
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import numpy as np
+from surv.algo.compiler import Compiler
+from surv.algo.constraints import EqConstraint
+from surv.algo.evaluator import Evaluator
+from surv.algo.result import Continue, Terminal, Unknown
+from surv.algo.survey_tree import ContinueNode, SurveyTree, TerminalNode, UnknownNode
+from surv.dataset.dataset import Dataset
+
+from tests.algo.conftest import EvaluationDataset, load_evaluation_dataset
+
+
+class TestCompiler:
+    def test_compiler_matches_evaluator(self, house_dataset: Dataset) -> None:
+        evaluator = Evaluator()
+        survey_tree = Compiler(evaluator=evaluator).compile(house_dataset)
+
+        stack = [(survey_tree.root, [])]
+        while stack:
+            node, constraints = stack.pop()
+            result = evaluator.evaluate(house_dataset, constraints)
+            match node:
+                case ContinueNode(question=question, children=children):
+                    assert isinstance(result, Continue)
+                    assert result.feature.name == question.feature_name
+                    for category, child in children.items():
+                        constraint = EqConstraint(feature=result.feature, value=category)
+                        stack.append((child, [*constraints, constraint]))
+                case TerminalNode(category=category):
+                    assert isinstance(result, Terminal)
+                    assert result.category == category
+                case UnknownNode():
+                    assert isinstance(result, Unknown)
+
+    def test_compiler_max_depth(self, house_dataset: Dataset) -> None:
+        survey_tree = Compiler(max_depth=1).compile(house_dataset)
+        assert isinstance(survey_tree.root, ContinueNode)
+        for child in survey_tree.root.children.values():
+            assert isinstance(child, (TerminalNode, UnknownNode))
+
+    def test_survey_tree_save_load(self, house_dataset: Dataset, tmp_path: Path) -> None:
+        survey_tree = Compiler().compile(house_dataset)
+        filepath = tmp_path / "survey.json"
+        survey_tree.save(filepath)
+        loaded_survey_tree = SurveyTree.load(filepath)
+        assert loaded_survey_tree == survey_tree
+        assert loaded_survey_tree.traverse({"yard_size": "none"}) == TerminalNode(category="cheap")
+
+    def test_compiler_numeric(self, tmp_path: Path) -> None:
+        dataset = load_evaluation_dataset("latitude").dataset
+        survey_tree = Compiler().compile(dataset)
+        filepath = tmp_path / "survey.json"
+        survey_tree.save(filepath)
+        loaded_survey_tree = SurveyTree.load(filepath)
+        assert loaded_survey_tree == survey_tree
+        assert loaded_survey_tree.traverse({"gender": "male", "age": "8"}) == TerminalNode(category="0.13")
+
+    def test_compiler_streaming(self) -> None:
+        for dataset_name in ["house", "latitude"]:
+            data_dirpath = Path(__file__).parent / "data" / dataset_name
+            tabular_filepath = data_dirpath / "tabular.csv"
+            feature_info_filepath = data_dirpath / "features.json"
+            dataset = Dataset.from_files(tabular_filepath, feature_info_filepath)
+            streamed_dataset = Dataset.from_files_streaming(tabular_filepath, feature_info_filepath, chunk_size=3)
+            streamed_dataset.validate()
+
+            assert streamed_dataset.n_samples <= dataset.n_samples
+            assert streamed_dataset.weights is not None
+            assert streamed_dataset.weights.sum() == dataset.n_samples
+            assert Compiler().compile(streamed_dataset) == Compiler().compile(dataset)
+
+    def test_compiler_compressed(self, evaluation_dataset: EvaluationDataset) -> None:
+        dataset = evaluation_dataset.dataset
+        expanded_dataset = dataset.take(np.repeat(np.arange(dataset.n_samples), np.arange(dataset.n_samples) % 3 + 1))
+        compressed_dataset = expanded_dataset.compress()
+        compressed_dataset.validate()
+
+        assert compressed_dataset.n_samples <= dataset.n_samples
+        assert compressed_dataset.weights is not None
+        assert compressed_dataset.weights.sum() == expanded_dataset.n_samples
+        assert Compiler().compile(compressed_dataset) == Compiler().compile(expanded_dataset)
@@ -0,0 +1,74 @@
+from pathlib import Path
+
+from surv.algo.constraints import EqConstraint, InConstraint, SkipConstraint
+from surv.algo.evaluation_cache import EvaluationCache
+from surv.algo.evaluator import Evaluator
+from surv.algo.profiler import Profiler
+from surv.dataset.dataset import Dataset
+
+
+class TestEvaluationCache:
+    def test_evaluation_cache_order_independent(self, house_dataset: Dataset) -> None:
+        yard_size_constraint = EqConstraint(feature=house_dataset.get_feature("yard_size"), value="small")
+        moldy_constraint = EqConstraint(feature=house_dataset.get_feature("moldy"), value="no")
+
+        cache = EvaluationCache()
+        result = cache.evaluate(house_dataset, [yard_size_constraint, moldy_constraint])
+        assert cache.evaluate(house_dataset, [moldy_constraint, yard_size_constraint]) == result
+        assert result == Evaluator().evaluate(house_dataset, [yard_size_constraint, moldy_constraint])
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_evaluation_cache_hashable_constraints(self, house_dataset: Dataset) -> None:
+        yard_size_feature = house_dataset.get_feature("yard_size")
+        constraint = EqConstraint(feature=yard_size_feature, value="small")
+        equal_constraint = EqConstraint(feature=yard_size_feature, value="small")
+        assert constraint == equal_constraint
+        assert len({constraint, equal_constraint, SkipConstraint(feature=yard_size_feature)}) == 2
+        assert {constraint: 1}[equal_constraint] == 1
+
+        cache = EvaluationCache()
+        assert cache.get_key(house_dataset, [constraint, equal_constraint]) == cache.get_key(
+            house_dataset, [constraint]
+        )
+        assert cache.get_key(house_dataset, [constraint]) != cache.get_key(
+            house_dataset, [EqConstraint(feature=yard_size_feature, value="big")]
+        )
+
+    def test_evaluation_cache_in_constraint_order(self, house_dataset: Dataset) -> None:
+        moldy_feature = house_dataset.get_feature("moldy")
+        constraint = InConstraint(feature=moldy_feature, values=("very", "no", "very"))
+        assert constraint.values == ("no", "very")
+        assert constraint == InConstraint(feature=moldy_feature, values=("no", "very"))
+
+        cache = EvaluationCache()
+        assert cache.get_key(house_dataset, [constraint]) == cache.get_key(
+            house_dataset, [InConstraint(feature=moldy_feature, values=("no", "very"))]
+        )
+
+    def test_evaluation_cache_evaluator_settings(self, house_dataset: Dataset) -> None:
+        def get_key(evaluator: Evaluator) -> str:
+            return EvaluationCache(evaluator=evaluator).get_key(house_dataset, [])
+
+        key = get_key(Evaluator())
+        assert get_key(Evaluator(executor="thread", n_workers=2, use_bitmap_index=False)) == key
+        assert get_key(Evaluator(profiler=Profiler())) == key
+        assert get_key(Evaluator(lookahead_depth=2)) != key
+        assert get_key(Evaluator(stop_posterior=0.9)) != key
+
+    def test_evaluation_cache_eviction(self, house_dataset: Dataset) -> None:
+        cache = EvaluationCache(max_size=2)
+        yard_size_feature = house_dataset.get_feature("yard_size")
+        for category in ["none", "small", "big"]:
+            cache.evaluate(house_dataset, [EqConstraint(feature=yard_size_feature, value=category)])
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
+        assert cache.stats.misses == 3
+
+    def test_evaluation_cache_disk_store(self, house_dataset: Dataset, tmp_path: Path) -> None:
+        result = EvaluationCache(cache_dirpath=tmp_path).evaluate(house_dataset, [])
+
+        cache = EvaluationCache(cache_dirpath=tmp_path)
+        assert cache.evaluate(house_dataset, []) == result
+        assert cache.stats.disk_hits == 1
+        assert cache.stats.misses == 0
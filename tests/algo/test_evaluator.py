@@ -1,21 +1,359 @@
-from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
+import numpy as np
+import pandas as pd
 import pytest
-from surv.algo.evaluator import Evaluator
+from surv.algo.constraints import Constraint, EqConstraint, GtConstraint, LtConstraint
+from surv.algo.evaluator import Evaluator, ExecutorName
+from surv.algo.result import Continue, Terminal
+from surv.algo.session import Session
+from surv.algo.simulator import Simulator
+from surv.algo.split import Targets
+from surv.dataset.dataset import Dataset
+from surv.dataset.feature import Feature
+from surv.dataset.feature_info import FeatureInfo
+from surv.dataset.validation_error import DatasetValidationError
 
-from tests.algo.conftest import DatasetTag, EvaluationDataset
-
-if TYPE_CHECKING:
-    from surv.algo.constraints import Constraint
+from tests.algo.conftest import EvaluationDataset, load_evaluation_dataset
 
 
 class TestEvaluator:
     def test_evaluator(self, evaluation_dataset: EvaluationDataset) -> None:
-        tags = evaluation_dataset.tags
-        if DatasetTag.HAS_NUMERIC_TRAINING_FEATURES in tags:
-            pytest.skip("Skipping test for dataset with numeric training features.")
-
         dataset = evaluation_dataset.dataset
         evaluator = Evaluator()
         constraints: list[Constraint] = []
         evaluator.evaluate(dataset, constraints)
+
+    def test_evaluator_information_gain(self, house_dataset: Dataset) -> None:
+        evaluator = Evaluator()
+        result = evaluator.evaluate(house_dataset, [])
+        assert isinstance(result, Continue)
+        assert result.feature.name == "yard_size"
+        assert result.information_gain == pytest.approx(0.476698, abs=1e-6)
+
+    def test_evaluator_terminal(self, house_dataset: Dataset) -> None:
+        evaluator = Evaluator()
+        yard_size_feature = house_dataset.get_feature("yard_size")
+        constraints: list[Constraint] = [EqConstraint(feature=yard_size_feature, value="none")]
+        result = evaluator.evaluate(house_dataset, constraints)
+        assert result == Terminal(category="cheap", posterior={"cheap": 1.0, "expensive": 0.0})
+
+    def test_evaluator_numeric(self) -> None:
+        dataset = load_evaluation_dataset("latitude").dataset
+        evaluator = Evaluator()
+        gender_feature = dataset.get_feature("gender")
+        constraints: list[Constraint] = [EqConstraint(feature=gender_feature, value="male")]
+        result = evaluator.evaluate(dataset, constraints)
+        assert isinstance(result, Continue)
+        assert result.feature.name == "age"
+        assert result.threshold == 9.0
+        assert result.information_gain == pytest.approx(0.918296, abs=1e-6)
+
+        constraints.append(LtConstraint(feature=result.feature, value=result.threshold))
+        result = evaluator.evaluate(dataset, constraints)
+        assert isinstance(result, Terminal)
+        assert result.category == "0.13"
+        assert result.posterior["0.13"] == 1.0
+
+    def test_evaluator_stopping(self, house_dataset: Dataset) -> None:
+        result = Evaluator().evaluate(house_dataset, [])
+        assert isinstance(result, Continue)
+        assert result.posterior == pytest.approx({"cheap": 9 / 14, "expensive": 5 / 14})
+        assert result.most_likely_category == "cheap"
+
+        result = Evaluator(stop_posterior=0.6).evaluate(house_dataset, [])
+        assert isinstance(result, Terminal)
+        assert result.category == "cheap"
+        assert isinstance(Evaluator(stop_posterior=0.6, posterior_prior=4.0).evaluate(house_dataset, []), Continue)
+        assert isinstance(Evaluator(stop_entropy=0.95).evaluate(house_dataset, []), Terminal)
+        assert isinstance(Evaluator(stop_entropy=0.9).evaluate(house_dataset, []), Continue)
+
+        report = Simulator(evaluator=Evaluator()).simulate(house_dataset)
+        stopping_report = Simulator(evaluator=Evaluator(stop_posterior=0.75)).simulate(house_dataset)
+        assert stopping_report.mean_questions < report.mean_questions
+        assert stopping_report.n_evaluations < report.n_evaluations
+        assert stopping_report.unknown_rate == 0.0
+
+    @pytest.mark.parametrize(
+        ("stop_posterior", "stop_entropy", "posterior_prior"),
+        [(0.0, None, 0.0), (1.5, None, 0.0), (None, -1.0, 0.0), (None, None, -1.0)],
+    )
+    def test_evaluator_stopping_invalid(
+        self, stop_posterior: Optional[float], stop_entropy: Optional[float], posterior_prior: float
+    ) -> None:
+        with pytest.raises(ValueError, match="must"):
+            Evaluator(stop_posterior=stop_posterior, stop_entropy=stop_entropy, posterior_prior=posterior_prior)
+
+    def test_evaluator_numeric_max_bins(self) -> None:
+        dataset = load_evaluation_dataset("latitude").dataset
+        evaluator = Evaluator(numeric_max_bins=2)
+        gender_feature = dataset.get_feature("gender")
+        result = evaluator.evaluate(dataset, [EqConstraint(feature=gender_feature, value="female")])
+        assert isinstance(result, Continue)
+        assert result.threshold == 13.0
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_evaluator_executor(self, evaluation_dataset: EvaluationDataset, executor: ExecutorName) -> None:
+        dataset = evaluation_dataset.dataset
+        evaluator = Evaluator(executor=executor, n_workers=2)
+        try:
+            assert evaluator.evaluate(dataset, []) == Evaluator().evaluate(dataset, [])
+        finally:
+            evaluator.close()
+
+    def test_evaluator_process_pools_shared(self) -> None:
+        datasets = [load_evaluation_dataset(dataset_name).dataset for dataset_name in ["house", "latitude"]]
+        expected_results = [Evaluator().evaluate(dataset, []) for dataset in datasets]
+        evaluator = Evaluator(executor="process", n_workers=2)
+        try:
+            with ThreadPoolExecutor(max_workers=4) as thread_pool:
+                results = list(thread_pool.map(lambda i: evaluator.evaluate(datasets[i % 2], []), range(8)))
+            assert results == [expected_results[i % 2] for i in range(8)]
+            process_pool_ids = {id(process_pool) for process_pool in evaluator._process_pools.values()}
+            assert len(process_pool_ids) == 2
+
+            # A reloaded dataset with the same contents keeps its pool.
+            reloaded_dataset = load_evaluation_dataset("house").dataset
+            assert evaluator.evaluate(reloaded_dataset, []) == expected_results[0]
+            assert {id(process_pool) for process_pool in evaluator._process_pools.values()} == process_pool_ids
+        finally:
+            evaluator.close()
+        assert not evaluator._process_pools
+
+    def test_evaluator_sample_weight(self, evaluation_dataset: EvaluationDataset) -> None:
+        dataset = evaluation_dataset.dataset
+        counts = np.arange(dataset.n_samples) % 4 + 1
+        expanded_dataset = Dataset(dataset.tabular.loc[dataset.tabular.index.repeat(counts)], dataset.feature_info)
+
+        weight_feature = Feature(
+            name="count",
+            type={"name": "numeric", "type": {"name": "ratio"}},
+            purpose={
+                "name": "evaluation",
+                "type": {"name": "sample_weight"},
+            },
+        )
+        feature_info = FeatureInfo(
+            features=[*dataset.feature_info.features, weight_feature],
+            target_feature_name=dataset.feature_info.target_feature_name,
+        )
+        weighted_dataset = Dataset(dataset.tabular.assign(count=counts), feature_info)
+        weighted_dataset.validate()
+
+        evaluator = Evaluator()
+        session = Session(weighted_dataset)
+        expanded_session = Session(expanded_dataset)
+        while True:
+            result = evaluator.evaluate_session(session)
+            expanded_result = evaluator.evaluate_session(expanded_session)
+            if not isinstance(result, Continue):
+                assert result == expanded_result
+                break
+            assert isinstance(expanded_result, Continue)
+            assert result.feature == expanded_result.feature
+            assert result.threshold == expanded_result.threshold
+            assert result.information_gain == pytest.approx(expanded_result.information_gain, abs=1e-12)
+            if result.threshold is None:
+                category = dataset.get_categories(result.feature.name)[0]
+                constraint: Constraint = EqConstraint(feature=result.feature, value=category)
+            else:
+                constraint = LtConstraint(feature=result.feature, value=result.threshold)
+            session.add_constraint(constraint)
+            expanded_session.add_constraint(constraint)
+
+    def test_evaluator_sample_weight_invalid(self, house_dataset: Dataset) -> None:
+        weight_feature = Feature(
+            name="count",
+            type={"name": "numeric", "type": {"name": "ratio"}},
+            purpose={
+                "name": "evaluation",
+                "type": {"name": "sample_weight"},
+            },
+        )
+        feature_info = FeatureInfo(
+            features=[*house_dataset.feature_info.features, weight_feature],
+            target_feature_name=house_dataset.feature_info.target_feature_name,
+        )
+        counts = ["1"] * house_dataset.n_samples
+        counts[2], counts[5] = "-1", "many"
+        with pytest.raises(DatasetValidationError) as exc_info:
+            Dataset(house_dataset.tabular.assign(count=counts), feature_info).validate()
+        assert exc_info.value.invalid_values[0].rows.tolist() == [2, 5]
+
+    def test_evaluator_bitmap_index(self, evaluation_dataset: EvaluationDataset) -> None:
+        dataset = evaluation_dataset.dataset
+        evaluator = Evaluator(use_bitmap_index=True)
+        unindexed_evaluator = Evaluator(use_bitmap_index=False)
+        constraints: list[Constraint] = []
+        while True:
+            result = evaluator.evaluate(dataset, constraints)
+            assert result == unindexed_evaluator.evaluate(dataset, constraints)
+            if not isinstance(result, Continue):
+                break
+            if result.threshold is None:
+                category = dataset.get_categories(result.feature.name)[-1]
+                constraints.append(EqConstraint(feature=result.feature, value=category))
+            else:
+                constraints.append(GtConstraint(feature=result.feature, value=result.threshold))
+
+    def test_evaluator_missing_values(self) -> None:
+        dataset = load_evaluation_dataset("latitude").dataset
+        gender, age = dataset.tabular["gender"].astype(object), dataset.tabular["age"].astype(np.float64)
+        gender[[0, 3]], age[[1, 4]] = None, np.nan
+        missing_dataset = Dataset(dataset.tabular.assign(gender=gender, age=age), dataset.feature_info)
+        missing_dataset.validate()
+
+        for feature_name in ["gender", "age"]:
+            feature = missing_dataset.get_feature(feature_name)
+            rows = np.flatnonzero(missing_dataset.tabular[feature_name].notna())
+            known_dataset = missing_dataset.take(rows)
+            splits = []
+            for use_bitmap_index in [True, False]:
+                evaluator = Evaluator(use_bitmap_index=use_bitmap_index)
+                all_rows = np.arange(missing_dataset.n_samples)
+                targets = evaluator._get_targets(missing_dataset, all_rows)
+                splits.extend(evaluator._compute_splits(missing_dataset, [feature], all_rows, targets))
+            known_targets = Evaluator._get_targets(known_dataset, np.arange(known_dataset.n_samples))
+            known_split = Evaluator().compute_split(
+                feature, Evaluator.get_split_column(known_dataset, feature), known_targets
+            )
+            known_fraction = rows.shape[0] / missing_dataset.n_samples
+            for split in splits:
+                assert split.information_gain == pytest.approx(known_fraction * known_split.information_gain)
+                assert split.threshold == known_split.threshold
+
+        report = Simulator(evaluator=Evaluator(lookahead_depth=2)).simulate(missing_dataset)
+        assert report.n_respondents == missing_dataset.n_samples
+
+    @pytest.mark.parametrize("weighted", [False, True])
+    def test_evaluator_sparse_contingency(self, weighted: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+        rng = np.random.default_rng(0)
+        n_rows, n_categories, n_targets = 300, 1000, 40
+        codes = rng.integers(-1, n_categories, n_rows)
+        column = np.where(rng.random(n_rows) < 0.1, np.nan, rng.integers(0, 200, n_rows).astype(np.float64))
+        weights = rng.integers(1, 5, n_rows).astype(np.float64) if weighted else None
+        targets = Targets(codes=rng.integers(0, n_targets, n_rows), n_categories=n_targets, weights=weights)
+        categorical_feature = Feature(
+            name="category",
+            type={
+                "name": "categorical",
+                "type": {"name": "multiclass"},
+                "categories": [str(category) for category in range(n_categories)],
+            },
+            purpose={"name": "training"},
+        )
+        numeric_feature = Feature(
+            name="number", type={"name": "numeric", "type": {"name": "ratio"}}, purpose={"name": "training"}
+        )
+
+        evaluator = Evaluator()
+        sparse_splits = [
+            evaluator.compute_split(categorical_feature, codes, targets),
+            evaluator.compute_split(numeric_feature, column, targets),
+        ]
+        monkeypatch.setattr("surv.algo.evaluator.DENSE_CONTINGENCY_CELLS_PER_ROW", n_categories * n_targets)
+        dense_splits = [
+            evaluator.compute_split(categorical_feature, codes, targets),
+            evaluator.compute_split(numeric_feature, column, targets),
+        ]
+        for sparse_split, dense_split in zip(sparse_splits, dense_splits, strict=True):
+            assert sparse_split.information_gain == pytest.approx(dense_split.information_gain)
+            assert sparse_split.information_gain > 0
+            assert sparse_split.threshold == dense_split.threshold
+
+    def test_evaluator_lookahead(self) -> None:
+        # The balanced first question is greedy, but asking whether the animal is a fish first saves questions.
+        animals = ["cat", "dog", "bird", "bird", "fish", "fish", "fish"]
+        answers = {
+            "has_fur_or_fins": {"cat": "no", "dog": "yes", "bird": "yes", "fish": "no"},
+            "lives_on_land": {"cat": "yes", "dog": "yes", "bird": "yes", "fish": "no"},
+            "can_fly": {"cat": "no", "dog": "no", "bird": "yes", "fish": "no"},
+        }
+        features = [
+            Feature(
+                name=name,
+                type={
+                    "name": "categorical",
+                    "type": {"name": "binary", "positive_class": "yes"},
+                    "categories": ["yes", "no"],
+                },
+                purpose={"name": "training"},
+            )
+            for name in answers
+        ]
+        target_feature = Feature(
+            name="animal",
+            type={"name": "categorical", "type": {"name": "multiclass"}, "categories": ["cat", "dog", "bird", "fish"]},
+            purpose={"name": "target"},
+        )
+        tabular = pd.DataFrame(
+            {
+                **{name: [answer[animal] for animal in animals] for name, answer in answers.items()},
+                "animal": animals,
+            }
+        )
+        dataset = Dataset(tabular, FeatureInfo(features=[*features, target_feature], target_feature_name="animal"))
+        dataset.validate()
+
+        greedy_result = Evaluator().evaluate(dataset, [])
+        assert isinstance(greedy_result, Continue)
+        assert greedy_result.feature.name == "has_fur_or_fins"
+        assert Evaluator(lookahead_depth=2, lookahead_width=1).evaluate(dataset, []) == greedy_result
+
+        lookahead_evaluator = Evaluator(lookahead_depth=2)
+        lookahead_result = lookahead_evaluator.evaluate(dataset, [])
+        assert isinstance(lookahead_result, Continue)
+        assert lookahead_result.feature.name == "lives_on_land"
+        assert Evaluator(lookahead_depth=3, executor="thread").evaluate(dataset, []) == lookahead_result
+
+        greedy_report = Simulator(Evaluator()).simulate(dataset)
+        lookahead_report = Simulator(lookahead_evaluator).simulate(dataset)
+        assert greedy_report.accuracy == lookahead_report.accuracy == 1.0
+        assert greedy_report.mean_questions == pytest.approx(2.0)
+        assert lookahead_report.mean_questions == pytest.approx(13 / 7)
+
+    def test_evaluator_lookahead_missing_values(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # The children of a question only get the rows with a known value, which here have little entropy left.
+        answers = {
+            "first": ["no", None, "yes", "yes", None, "yes", "no"],
+            "second": ["no", "yes", "yes", None, "no", "no", "yes"],
+            "third": [None, "no", None, "yes", "yes", "yes", None],
+        }
+        features = [
+            Feature(
+                name=name,
+                type={
+                    "name": "categorical",
+                    "type": {"name": "binary", "positive_class": "yes"},
+                    "categories": ["yes", "no"],
+                },
+                purpose={"name": "training"},
+            )
+            for name in answers
+        ]
+        target_feature = Feature(
+            name="target",
+            type={"name": "categorical", "type": {"name": "binary", "positive_class": "1"}, "categories": ["0", "1"]},
+            purpose={"name": "target"},
+        )
+        tabular = pd.DataFrame({**answers, "target": ["1", "0", "1", "0", "1", "1", "1"]})
+        dataset = Dataset(tabular, FeatureInfo(features=[*features, target_feature], target_feature_name="target"))
+        dataset.validate()
+
+        greedy_result = Evaluator().evaluate(dataset, [])
+        assert isinstance(greedy_result, Continue)
+        assert greedy_result.feature.name == "third"
+
+        pruned_result = Evaluator(lookahead_depth=2).evaluate(dataset, [])
+        monkeypatch.setattr(Evaluator, "_get_question_bound", lambda *_: 0.0)
+        unpruned_result = Evaluator(lookahead_depth=2).evaluate(dataset, [])
+        assert isinstance(unpruned_result, Continue)
+        assert unpruned_result.feature.name == "second"
+        assert pruned_result == unpruned_result
+
+    def test_evaluator_lookahead_invalid(self) -> None:
+        with pytest.raises(ValueError, match="Lookahead depth"):
+            Evaluator(lookahead_depth=0)
+        with pytest.raises(ValueError, match="Lookahead width"):
+            Evaluator(lookahead_width=0)
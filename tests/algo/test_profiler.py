@@ -0,0 +1,88 @@
+import json
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Any
+
+import pytest
+from surv.algo.constraints import Constraint, EqConstraint, GtConstraint
+from surv.algo.evaluator import Evaluator
+from surv.algo.profiler import Profiler
+from surv.algo.session import Session
+from surv.dataset.feature_purpose import Training
+
+from tests.algo.conftest import load_evaluation_dataset
+
+
+class TestProfiler:
+    def test_profiler_phases(self) -> None:
+        dataset = load_evaluation_dataset("latitude").dataset
+        profiler = Profiler()
+        evaluator = Evaluator(profiler=profiler)
+        age_feature = dataset.get_feature("age")
+        constraints: list[Constraint] = [GtConstraint(feature=age_feature, value=9.0)]
+        result = evaluator.evaluate(dataset, constraints)
+        assert result == Evaluator().evaluate(dataset, constraints)
+
+        summary = profiler.summarize()
+        assert {"evaluate", "filter", "indexed_constraints", "constraint", "split", "entropy", "selection"} <= set(
+            summary
+        )
+        assert summary["evaluate"].count == 1
+        assert summary["constraint"].allocated_bytes is None
+
+        expected_rows = Evaluator.filter_rows(dataset, constraints)
+        constraint_events = [event for event in profiler.events if event.name == "constraint"]
+        assert [event.attributes["constraint"] for event in constraint_events] == [str(constraints[0])]
+        assert constraint_events[0].attributes["n_rows"] == expected_rows.shape[0]
+        split_events = [event for event in profiler.events if event.name == "split"]
+        constrained_feature_names = {age_feature.name}
+        expected_feature_names = {
+            feature.name
+            for feature in dataset.feature_info.features
+            if isinstance(feature.purpose, Training) and feature.name not in constrained_feature_names
+        }
+        assert {event.attributes["feature"] for event in split_events} == expected_feature_names
+
+    def test_profiler_session_rows(self, tmp_path: Path) -> None:
+        dataset = load_evaluation_dataset("house").dataset
+        profiler = Profiler(trace_allocations=True)
+        session = Session(dataset, profiler=profiler)
+        session.add_constraint(EqConstraint(feature=dataset.get_feature("yard_size"), value="small"))
+        Evaluator(profiler=profiler).evaluate_session(session)
+        profiler.close()
+
+        constraint_event = next(event for event in profiler.events if event.name == "constraint")
+        assert constraint_event.attributes["n_rows"] == session.n_samples
+        assert constraint_event.allocated_bytes is not None
+
+        trace_filepath = tmp_path / "trace.json"
+        profiler.save_trace(trace_filepath)
+        with trace_filepath.open() as file:
+            trace = json.load(file)
+        assert len(trace["traceEvents"]) == len(profiler.events)
+        assert all(event["ph"] == "X" for event in trace["traceEvents"])
+
+        metrics_filepath = tmp_path / "metrics.json"
+        profiler.save_metrics(metrics_filepath)
+        with metrics_filepath.open() as file:
+            metrics = json.load(file)
+        assert metrics["summary"]["evaluate"]["count"] == 1
+        assert len(metrics["events"]) == len(profiler.events)
+
+    def test_profiler_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        dataset = load_evaluation_dataset("latitude").dataset
+        evaluator = Evaluator()
+        assert evaluator.profiler is None
+        assert repr(evaluator) == repr(Evaluator(profiler=Profiler()))
+
+        # Only the phases of the evaluation as a whole ask for a span, never the scoring of each feature.
+        span_names: list[str] = []
+        span = Evaluator._span
+
+        def record_span(self: Evaluator, name: str, **attributes: Any) -> AbstractContextManager[Any]:
+            span_names.append(name)
+            return span(self, name, **attributes)
+
+        monkeypatch.setattr(Evaluator, "_span", record_span)
+        evaluator.evaluate(dataset, [])
+        assert span_names == ["evaluate", "filter", "selection"]
@@ -0,0 +1,42 @@
+from surv.algo.constraints import EqConstraint, InConstraint, SkipConstraint
+from surv.algo.evaluator import Evaluator
+from surv.algo.result import Continue
+from surv.algo.session import Session
+from surv.dataset.dataset import Dataset
+
+
+class TestSession:
+    def test_session_add_constraint(self, house_dataset: Dataset) -> None:
+        evaluator = Evaluator()
+        session = Session(house_dataset)
+        assert session.n_samples == house_dataset.n_samples
+
+        constraints = [
+            EqConstraint(feature=house_dataset.get_feature("yard_size"), value="small"),
+            EqConstraint(feature=house_dataset.get_feature("moldy"), value="no"),
+        ]
+        for constraint in constraints:
+            session.add_constraint(constraint)
+            assert session.rows.tolist() == Evaluator.filter_rows(house_dataset, session.constraints).tolist()
+            assert evaluator.evaluate_session(session) == evaluator.evaluate(house_dataset, session.constraints)
+
+    def test_session_skip_and_in_constraints(self, house_dataset: Dataset) -> None:
+        evaluator = Evaluator()
+        session = Session(house_dataset)
+        yard_size_feature = house_dataset.get_feature("yard_size")
+        session.add_constraint(SkipConstraint(feature=yard_size_feature))
+        assert session.n_samples == house_dataset.n_samples
+        result = evaluator.evaluate_session(session)
+        assert isinstance(result, Continue)
+        assert result.feature.name != "yard_size"
+
+        moldy_values = ("no", "slightly")
+        session.add_constraint(InConstraint(feature=house_dataset.get_feature("moldy"), values=moldy_values))
+        moldy = house_dataset.get_column("moldy")
+        assert session.rows.tolist() == [row for row in range(house_dataset.n_samples) if moldy[row] in moldy_values]
+        assert session.rows.tolist() == Evaluator.filter_rows(house_dataset, session.constraints).tolist()
+        assert evaluator.evaluate_session(session) == evaluator.evaluate(house_dataset, session.constraints)
+
+        missing_constraint = InConstraint(feature=yard_size_feature, values=("huge",))
+        assert Evaluator.filter_rows(house_dataset, [missing_constraint]).tolist() == []
+        assert session.branch(missing_constraint).n_samples == 0
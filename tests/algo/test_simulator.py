@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+from surv.algo.compiler import Compiler
+from surv.algo.evaluator import Evaluator
+from surv.algo.result import Continue, Terminal
+from surv.algo.simulator import Simulator
+from surv.algo.survey_tree import ContinueNode, TerminalNode
+from surv.dataset.dataset import Dataset
+from surv.dataset.feature import Feature
+from surv.dataset.feature_info import FeatureInfo
+from surv.dataset.holdout import split_holdout
+
+from tests.algo.conftest import EvaluationDataset
+
+
+class TestSimulator:
+    def test_simulator_matches_compiler(self, evaluation_dataset: EvaluationDataset) -> None:
+        dataset = evaluation_dataset.dataset
+        survey_tree = Compiler().compile(dataset)
+        predictions, n_questions, _ = Simulator().predict(dataset, dataset)
+
+        target_categories = dataset.get_categories(dataset.feature_info.target_feature_name)
+        for row in range(dataset.n_samples):
+            node = survey_tree.root
+            depth = 0
+            while isinstance(node, ContinueNode):
+                node = node.next(str(dataset.tabular[node.question.feature_name].iloc[row]))
+                depth += 1
+            assert n_questions[row] == depth
+            if isinstance(node, TerminalNode):
+                assert target_categories[predictions[row]] == node.category
+            else:
+                assert predictions[row] == -1
+
+    def test_simulator_report(self, house_dataset: Dataset) -> None:
+        report = Simulator().simulate(house_dataset)
+        assert report.n_respondents == house_dataset.n_samples
+        assert 0 < report.mean_questions <= report.max_questions <= house_dataset.n_training_features
+        assert report.accuracy + report.unknown_rate <= 1.0
+
+        limited_report = Simulator(max_questions=1).simulate(house_dataset)
+        assert limited_report.max_questions == 1
+        assert limited_report.n_evaluations < report.n_evaluations
+
+    def test_simulator_stopping_rule(self, house_dataset: Dataset) -> None:
+        result = Evaluator().evaluate(house_dataset, [])
+        assert isinstance(result, Continue)
+        category = result.most_likely_category
+        assert category is not None
+        assert result.apply_stopping_rule(0, house_dataset.n_training_features, 0.0) is result
+        assert result.apply_stopping_rule(0, 0, 0.0) == Terminal(category=category, posterior=result.posterior)
+
+        # The CLI, the simulator and the compiler predict the most likely category when no question is worth asking.
+        threshold = result.information_gain + 1
+        assert result.apply_stopping_rule(0, house_dataset.n_training_features, threshold) == Terminal(
+            category=category, posterior=result.posterior
+        )
+        predictions, n_questions, _ = Simulator(information_gain_threshold=threshold).predict(
+            house_dataset, house_dataset
+        )
+        target_categories = house_dataset.get_categories(house_dataset.feature_info.target_feature_name)
+        assert predictions.tolist() == [target_categories.index(category)] * house_dataset.n_samples
+        assert n_questions.tolist() == [0] * house_dataset.n_samples
+        assert Compiler(information_gain_threshold=threshold).compile(house_dataset).root == TerminalNode(category)
+
+    def test_simulator_holdout(self, house_dataset: Dataset) -> None:
+        training_rows, holdout_rows = split_holdout(house_dataset, 0.25, seed=1)
+        assert np.intersect1d(training_rows, holdout_rows).shape[0] == 0
+        assert training_rows.shape[0] + holdout_rows.shape[0] == house_dataset.n_samples
+
+        respondents = house_dataset.take(holdout_rows)
+        report = Simulator().simulate(house_dataset.take(training_rows), respondents)
+        assert report.n_respondents == holdout_rows.shape[0]
+
+    def test_simulator_threshold_value(self) -> None:
+        features = [
+            Feature(name="age", type={"name": "numeric", "type": {"name": "ratio"}}, purpose={"name": "training"}),
+            Feature(
+                name="size",
+                type={"name": "categorical", "type": {"name": "multiclass"}, "categories": ["small", "big"]},
+                purpose={"name": "target"},
+            ),
+        ]
+        feature_info = FeatureInfo(features=features, target_feature_name="size")
+        dataset = Dataset(
+            pd.DataFrame({"age": [1.0, 2.0, 3.0, 4.0], "size": ["small", "small", "big", "big"]}), feature_info
+        )
+        respondents = Dataset(pd.DataFrame({"age": [2.5], "size": ["big"]}), feature_info)
+
+        survey_tree = Compiler().compile(dataset)
+        assert isinstance(survey_tree.root, ContinueNode)
+        assert survey_tree.root.threshold == 2.5
+        assert survey_tree.root.next("2.5") == TerminalNode(category="big")
+
+        predictions, n_questions, _ = Simulator().predict(dataset, respondents)
+        assert predictions.tolist() == [1]
+        assert n_questions.tolist() == [1]
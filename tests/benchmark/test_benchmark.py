@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import numpy as np
+from surv.algo.constraints import SkipConstraint
+from surv.algo.result import Continue
+from surv.benchmark.benchmark import Benchmark, BenchmarkReport, get_answer
+from surv.benchmark.synthetic import SyntheticDatasetConfig, write_dataset
+from surv.dataset.dataset import Dataset
+from surv.dataset.feature_types import Categorical
+
+
+class TestBenchmark:
+    def test_write_dataset(self, tmp_path: Path) -> None:
+        config = SyntheticDatasetConfig(n_samples=200, n_categorical_features=3, n_numeric_features=2)
+        tabular_filepath, feature_info_filepath = write_dataset(config, tmp_path)
+        dataset = Dataset.from_files(tabular_filepath, feature_info_filepath)
+        dataset.validate()
+        assert dataset.n_samples == 200
+        assert dataset.n_training_features == 5
+
+    def test_benchmark_report(self, tmp_path: Path) -> None:
+        config = SyntheticDatasetConfig(n_samples=200, n_categorical_features=3, n_numeric_features=1)
+        benchmark = Benchmark(config=config, n_runs=1, constraint_depths=(0, 1), n_sessions=2)
+        report = benchmark.run(tmp_path / "dataset")
+        assert [result.name for result in report.results] == [
+            "load",
+            "validate",
+            "evaluate_depth_0",
+            "evaluate_depth_1",
+            "session",
+        ]
+
+        filepath = tmp_path / "baseline.json"
+        report.save(filepath)
+        baseline = BenchmarkReport.load(filepath)
+        assert baseline == report
+        assert report.compare(baseline) == []
+
+        slower_results = [r.model_copy(update={"min_seconds": r.min_seconds * 2}) for r in report.results]
+        slower_report = report.model_copy(update={"results": slower_results})
+        regressions = slower_report.compare(baseline, tolerance=0.5)
+        assert {regression.name for regression in regressions} == {result.name for result in report.results}
+        assert all(regression.metric == "min_seconds" for regression in regressions)
+
+    def test_get_answer_missing_values(self, tmp_path: Path) -> None:
+        config = SyntheticDatasetConfig(n_samples=50, n_categorical_features=1, n_numeric_features=1)
+        tabular_filepath, feature_info_filepath = write_dataset(config, tmp_path)
+        dataset = Dataset.from_files(tabular_filepath, feature_info_filepath)
+        tabular = dataset.tabular.copy()
+        for feature in dataset.feature_info.training_features:
+            if isinstance(feature.type, Categorical):
+                tabular[feature.name] = tabular[feature.name].astype(object)
+            tabular.loc[0, feature.name] = np.nan
+        dataset = Dataset(tabular, dataset.feature_info)
+        dataset.validate()
+
+        for feature in dataset.feature_info.training_features:
+            result = Continue(feature=feature, information_gain=1.0, threshold=0.0)
+            if isinstance(feature.type, Categorical):
+                result = Continue(feature=feature, information_gain=1.0)
+            assert get_answer(dataset, 0, result) == SkipConstraint(feature=feature)
+            assert not isinstance(get_answer(dataset, 1, result), SkipConstraint)
@@ -0,0 +1,36 @@
+import numpy as np
+from surv.dataset.bitmap_index import BitmapIndex
+
+
+class TestBitmapIndex:
+    def test_bitmap_index_rows(self) -> None:
+        rng = np.random.default_rng(0)
+        codes = rng.integers(3, size=130)
+        bitmap_index = BitmapIndex({"color": codes}, {"color": ["red", "green", "blue"]}, n_samples=130)
+        assert bitmap_index.n_words == 3
+
+        rows = np.flatnonzero(rng.random(130) < 0.3)
+        assert np.array_equal(bitmap_index.mask_to_rows(bitmap_index.rows_to_mask(rows)), rows)
+        for code in range(3):
+            bitmap = bitmap_index.get_bitmaps("color")[code]
+            assert np.array_equal(bitmap_index.mask_to_rows(bitmap), np.flatnonzero(codes == code))
+
+    def test_bitmap_index_count(self) -> None:
+        rng = np.random.default_rng(1)
+        codes = rng.integers(4, size=1000)
+        target_codes = rng.integers(3, size=1000)
+        bitmap_index = BitmapIndex(
+            {"color": codes, "size": target_codes},
+            {"color": ["a", "b", "c", "d"], "size": ["s", "m", "l"]},
+            n_samples=1000,
+        )
+        rows = np.flatnonzero(rng.random(1000) < 0.5)
+        target_bitmaps = bitmap_index.get_bitmaps("size") & bitmap_index.rows_to_mask(rows)
+        contingency = bitmap_index.count(bitmap_index.get_bitmaps("color"), target_bitmaps)
+        expected = np.bincount(codes[rows] * 3 + target_codes[rows], minlength=12).reshape(4, 3)
+        assert np.array_equal(contingency, expected)
+
+    def test_bitmap_index_many_categories(self) -> None:
+        categories = [str(i) for i in range(100)]
+        bitmap_index = BitmapIndex({"id": np.arange(100)}, {"id": categories}, n_samples=100)
+        assert not bitmap_index.is_indexed("id")
@@ -0,0 +1,197 @@
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+from surv.benchmark.synthetic import SyntheticDatasetConfig, write_dataset
+from surv.dataset.dataset import MISSING_CODE, Dataset
+from surv.dataset.feature import Feature
+from surv.dataset.feature_info import FeatureInfo
+from surv.dataset.patterns import merge_patterns
+from surv.dataset.validation_error import DatasetValidationError
+
+
+def get_feature_info(numeric_alias: bool = False) -> FeatureInfo:
+    return FeatureInfo(
+        features=[
+            {
+                "name": "color",
+                "type": {
+                    "name": "categorical",
+                    "categories": ["red", "blue"],
+                    "type": {"name": "multiclass"},
+                    "numeric_alias": numeric_alias,
+                },
+                "purpose": {"name": "training"},
+            },
+            {
+                "name": "size",
+                "type": {
+                    "name": "categorical",
+                    "categories": ["small", "big"],
+                    "type": {"name": "multiclass"},
+                    "numeric_alias": numeric_alias,
+                },
+                "purpose": {"name": "target"},
+            },
+        ],
+        target_feature_name="size",
+    )
+
+
+class TestDataset:
+    def test_validate(self) -> None:
+        tabular = pd.DataFrame({"color": ["red", "green", "blue", "pink"], "size": ["small", "big", "huge", "big"]})
+        dataset = Dataset(tabular, get_feature_info())
+        with pytest.raises(DatasetValidationError) as exc_info:
+            dataset.validate()
+
+        invalid_values = exc_info.value.invalid_values
+        assert [v.feature_name for v in invalid_values] == ["color", "size"]
+        assert invalid_values[0].rows.tolist() == [1, 3]
+        assert invalid_values[0].values.tolist() == ["green", "pink"]
+        assert invalid_values[1].rows.tolist() == [2]
+        assert invalid_values[1].values.tolist() == ["huge"]
+
+    def test_apply_aliases(self) -> None:
+        feature_info = get_feature_info(numeric_alias=True)
+        tabular = Dataset.apply_aliases(feature_info, pd.DataFrame({"color": [1, 2, 2], "size": [2, 1, 1]}))
+        dataset = Dataset(tabular, feature_info)
+        dataset.validate()
+        color = dataset.get_column("color")
+        assert isinstance(color, np.ndarray)
+        assert color.tolist() == ["red", "blue", "blue"]
+        assert dataset.get_codes("size").tolist() == [1, 0, 0]
+
+    def test_apply_aliases_invalid(self) -> None:
+        feature_info = get_feature_info(numeric_alias=True)
+        with pytest.raises(DatasetValidationError) as exc_info:
+            Dataset.apply_aliases(feature_info, pd.DataFrame({"color": [1, 3, 0], "size": [2, 1, 1.5]}))
+
+        invalid_values = exc_info.value.invalid_values
+        assert [v.feature_name for v in invalid_values] == ["color", "size"]
+        assert invalid_values[0].rows.tolist() == [1, 2]
+        assert invalid_values[1].rows.tolist() == [2]
+
+    def test_from_files_streaming_invalid(self, tmp_path: Path) -> None:
+        tabular_filepath = tmp_path / "tabular.csv"
+        feature_info_filepath = tmp_path / "features.json"
+        tabular = pd.DataFrame({"color": ["red", "green", "blue", "red", "pink"], "size": ["small"] * 5})
+        tabular.to_csv(tabular_filepath, index=False)
+        feature_info_filepath.write_text(get_feature_info().model_dump_json())
+
+        with pytest.raises(DatasetValidationError) as exc_info:
+            Dataset.from_files_streaming(tabular_filepath, feature_info_filepath, chunk_size=2)
+
+        invalid_values = exc_info.value.invalid_values
+        assert [v.feature_name for v in invalid_values] == ["color"]
+        assert invalid_values[0].rows.tolist() == [1, 4]
+        assert invalid_values[0].values.tolist() == ["green", "pink"]
+
+    def test_from_files_streaming_sample_weight(self, tmp_path: Path) -> None:
+        tabular_filepath = tmp_path / "tabular.csv"
+        feature_info_filepath = tmp_path / "features.json"
+        feature_info = get_feature_info()
+        feature_info.features.append(
+            Feature(
+                name="count",
+                type={"name": "numeric", "type": {"name": "ratio"}},
+                purpose={"name": "evaluation", "type": {"name": "sample_weight"}},
+            )
+        )
+        tabular = pd.DataFrame(
+            {
+                "color": ["red", "blue", "red", "red", "blue"],
+                "size": ["small", "big", "small", "big", "big"],
+                "count": [1, 2, 3, 4, 5],
+            }
+        )
+        tabular.to_csv(tabular_filepath, index=False)
+        feature_info_filepath.write_text(feature_info.model_dump_json())
+
+        dataset = Dataset.from_files_streaming(tabular_filepath, feature_info_filepath, chunk_size=2)
+        dataset.validate()
+        patterns = zip(dataset.get_column("color"), dataset.get_column("size"), strict=True)
+        weights = dict(zip(patterns, dataset.weights, strict=True))
+        assert weights == {("red", "small"): 4.0, ("blue", "big"): 7.0, ("red", "big"): 4.0}
+
+    def test_from_files_streaming_unique_rows(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        config = SyntheticDatasetConfig(n_samples=2000, n_categorical_features=1, n_numeric_features=2)
+        tabular_filepath, feature_info_filepath = write_dataset(config, tmp_path)
+        merge_calls = []
+
+        def count_merge_patterns(*args: Any) -> tuple[pd.DataFrame, np.ndarray]:
+            merge_calls.append(args)
+            return merge_patterns(*args)
+
+        monkeypatch.setattr("surv.dataset.dataset.merge_patterns", count_merge_patterns)
+        dataset = Dataset.from_files_streaming(tabular_filepath, feature_info_filepath, chunk_size=50)
+        assert dataset.n_samples == Dataset.from_files(tabular_filepath, feature_info_filepath).compress().n_samples
+        # Merging on every one of the 40 chunks would be quadratic, merges double in size instead.
+        assert len(merge_calls) <= 8
+
+    def test_from_files_lazy(self, tmp_path: Path) -> None:
+        tabular_filepath = tmp_path / "tabular.csv"
+        feature_info_filepath = tmp_path / "features.json"
+        feature_info = get_feature_info()
+        feature_info.features[1:1] = [
+            Feature(name="comment", type={"name": "text"}, purpose={"name": "metadata"}),
+            Feature(
+                name="source",
+                type={"name": "categorical", "categories": ["web", "phone"], "type": {"name": "multiclass"}},
+                purpose={"name": "metadata"},
+            ),
+        ]
+        tabular = pd.DataFrame(
+            {
+                "color": ["red", "blue", "red", "blue"],
+                "comment": ["nice", "too long", "", "ok"],
+                "source": ["web", "phone", "phone", "mail"],
+                "size": ["small", "big", "small", "big"],
+            }
+        )
+        tabular.to_csv(tabular_filepath, index=False)
+        feature_info_filepath.write_text(feature_info.model_dump_json())
+
+        dataset = Dataset.from_files(tabular_filepath, feature_info_filepath, lazy=True)
+        eager_dataset = Dataset.from_files(tabular_filepath, feature_info_filepath)
+        assert list(dataset.tabular.columns) == ["color", "size"]
+        assert dataset.deferred_feature_names == ["comment", "source"]
+        assert dataset.n_features == eager_dataset.n_features == 4
+        assert dataset.fingerprint == eager_dataset.fingerprint
+        dataset.validate()
+
+        taken_dataset = dataset.take(np.array([3, 1]))
+        assert taken_dataset.get_column("comment").tolist() == ["ok", "too long"]
+        assert list(taken_dataset.tabular.columns) == ["color", "comment", "size"]
+        assert dataset.get_column("comment").tolist() == eager_dataset.get_column("comment").tolist()
+
+        with pytest.raises(DatasetValidationError) as exc_info:
+            dataset.get_codes("source")
+        assert exc_info.value.invalid_values[0].rows.tolist() == [3]
+        assert list(dataset.tabular.columns) == list(eager_dataset.tabular.columns)
+        assert dataset.deferred_feature_names == []
+
+    @pytest.mark.parametrize("numeric_alias", [False, True])
+    def test_missing_values(self, tmp_path: Path, numeric_alias: bool) -> None:
+        tabular_filepath = tmp_path / "tabular.csv"
+        feature_info_filepath = tmp_path / "features.json"
+        colors = ["1", "", "2", ""] if numeric_alias else ["red", "", "blue", ""]
+        sizes = ["1", "2", "1", "2"] if numeric_alias else ["small", "big", "small", "big"]
+        tabular_filepath.write_text("color,size\n" + "".join(f"{c},{s}\n" for c, s in zip(colors, sizes, strict=True)))
+        feature_info_filepath.write_text(get_feature_info(numeric_alias).model_dump_json())
+
+        dataset = Dataset.from_files(tabular_filepath, feature_info_filepath)
+        dataset.validate()
+        assert dataset.get_codes("color").tolist() == [0, MISSING_CODE, 1, MISSING_CODE]
+        streamed_dataset = Dataset.from_files_streaming(tabular_filepath, feature_info_filepath, chunk_size=2)
+        streamed_dataset.validate()
+        assert sorted(streamed_dataset.get_codes("color").tolist()) == [MISSING_CODE, 0, 1]
+
+        sizes[2] = ""
+        tabular_filepath.write_text("color,size\n" + "".join(f"{c},{s}\n" for c, s in zip(colors, sizes, strict=True)))
+        with pytest.raises(DatasetValidationError) as exc_info:
+            Dataset.from_files(tabular_filepath, feature_info_filepath).validate()
+        assert [v.feature_name for v in exc_info.value.invalid_values] == ["size"]
+        assert exc_info.value.invalid_values[0].rows.tolist() == [2]
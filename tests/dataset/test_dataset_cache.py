@@ -0,0 +1,118 @@
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from surv.algo.compiler import Compiler
+from surv.dataset.dataset import INVALID_CODE, MISSING_CODE, Dataset
+from surv.dataset.dataset_cache import DatasetCache
+from surv.dataset.validation_error import DatasetValidationError
+
+DATA_DIRPATH = Path(__file__).parent.parent / "algo" / "data"
+
+
+class TestDatasetCache:
+    def test_dataset_cache_round_trip(self, tmp_path: Path) -> None:
+        for dataset_name in ["house", "latitude"]:
+            dataset_dirpath = DATA_DIRPATH / dataset_name
+            tabular_filepath = dataset_dirpath / "tabular.csv"
+            feature_info_filepath = dataset_dirpath / "features.json"
+            dataset = Dataset.from_files(tabular_filepath, feature_info_filepath)
+
+            dataset_cache = DatasetCache(tmp_path / dataset_name)
+            assert dataset_cache.load(tabular_filepath, feature_info_filepath) is None
+            dataset_cache.save(dataset, tabular_filepath, feature_info_filepath)
+            cached_dataset = dataset_cache.load(tabular_filepath, feature_info_filepath)
+            assert cached_dataset is not None
+
+            cached_dataset.validate()
+            assert cached_dataset.fingerprint == dataset.fingerprint
+            assert cached_dataset.categories == dataset.categories
+            for feature_name, codes in dataset.codes.items():
+                assert np.array_equal(cached_dataset.get_codes(feature_name), codes)
+            assert Compiler().compile(cached_dataset) == Compiler().compile(dataset)
+
+    def test_dataset_cache_outdated(self, tmp_path: Path) -> None:
+        dataset_dirpath = tmp_path / "house"
+        shutil.copytree(DATA_DIRPATH / "house", dataset_dirpath)
+        tabular_filepath = dataset_dirpath / "tabular.csv"
+        feature_info_filepath = dataset_dirpath / "features.json"
+
+        dataset_cache = DatasetCache(dataset_dirpath / ".cache")
+        dataset = dataset_cache.load_or_build(tabular_filepath, feature_info_filepath)
+        assert dataset_cache.load(tabular_filepath, feature_info_filepath) is not None
+
+        tabular_filepath.write_text(tabular_filepath.read_text().rstrip("\n") + "\nO,no,no,big,expensive\n")
+        assert dataset_cache.load(tabular_filepath, feature_info_filepath) is None
+        reloaded_dataset = dataset_cache.load_or_build(tabular_filepath, feature_info_filepath)
+        assert reloaded_dataset.n_samples == dataset.n_samples + 1
+
+    def test_dataset_cache_invalid(self, tmp_path: Path) -> None:
+        dataset_dirpath = tmp_path / "house"
+        shutil.copytree(DATA_DIRPATH / "house", dataset_dirpath)
+        tabular_filepath = dataset_dirpath / "tabular.csv"
+        feature_info_filepath = dataset_dirpath / "features.json"
+        tabular_filepath.write_text(tabular_filepath.read_text().rstrip("\n") + "\nO,no,,huge,expensive\n")
+
+        dataset_cache = DatasetCache(dataset_dirpath / ".cache")
+        for _ in range(2):
+            with pytest.raises(DatasetValidationError) as exc_info:
+                dataset_cache.load_or_build(tabular_filepath, feature_info_filepath)
+            assert [invalid_values.feature_name for invalid_values in exc_info.value.invalid_values] == ["yard_size"]
+            assert dataset_cache.load(tabular_filepath, feature_info_filepath) is None
+
+        dataset = Dataset.from_files(tabular_filepath, feature_info_filepath)
+        assert dataset.get_codes("moldy")[-1] == MISSING_CODE
+        assert dataset.get_codes("yard_size")[-1] == INVALID_CODE
+
+    def test_dataset_cache_text_columns(self, tmp_path: Path) -> None:
+        dataset_dirpath = tmp_path / "house"
+        shutil.copytree(DATA_DIRPATH / "house", dataset_dirpath, ignore=shutil.ignore_patterns(".cache"))
+        tabular_filepath = dataset_dirpath / "tabular.csv"
+        feature_info_filepath = dataset_dirpath / "features.json"
+        long_address = "P" * 10_000
+        tabular_filepath.write_text(
+            tabular_filepath.read_text().rstrip("\n") + f"\n,no,no,big,expensive\n{long_address},no,no,big,cheap\n"
+        )
+
+        dataset_cache = DatasetCache(dataset_dirpath / ".cache")
+        dataset = dataset_cache.load_or_build(tabular_filepath, feature_info_filepath)
+        dataset_cache.save(dataset, tabular_filepath, feature_info_filepath)
+        assert [path.name for path in dataset_dirpath.iterdir() if path.name.startswith(".")] == [".cache"]
+
+        cached_dataset = dataset_cache.load(tabular_filepath, feature_info_filepath)
+        assert cached_dataset is not None
+        addresses = cached_dataset.get_column("address")
+        assert addresses.dtype == dataset.get_column("address").dtype
+        assert pd.isna(addresses[-2])
+        assert addresses[-1] == long_address
+        assert addresses[:-2].tolist() == dataset.get_column("address")[:-2].tolist()
+        assert max(path.stat().st_size for path in dataset_cache.cache_dirpath.glob("*/text-codes-*.npy")) < 1000
+
+    def test_dataset_cache_replaced_while_loading(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        dataset_dirpath = DATA_DIRPATH / "house"
+        tabular_filepath = dataset_dirpath / "tabular.csv"
+        feature_info_filepath = dataset_dirpath / "features.json"
+        dataset = Dataset.from_files(tabular_filepath, feature_info_filepath)
+        dataset_cache = DatasetCache(tmp_path / "house")
+        dataset_cache.save(dataset, tabular_filepath, feature_info_filepath)
+
+        # Another process saves the cache again after the metadata was read but before the columns are loaded.
+        load_array = DatasetCache._load_array
+        n_saves = 0
+
+        def load_array_after_save(dirpath: Path, filename: str) -> np.ndarray:
+            nonlocal n_saves
+            if n_saves == 0:
+                n_saves += 1
+                dataset_cache.save(dataset, tabular_filepath, feature_info_filepath)
+            return load_array(dirpath, filename)
+
+        monkeypatch.setattr(DatasetCache, "_load_array", staticmethod(load_array_after_save))
+        cached_dataset = dataset_cache.load(tabular_filepath, feature_info_filepath)
+        assert n_saves == 1
+        assert cached_dataset is not None
+        for feature_name, codes in dataset.codes.items():
+            assert np.array_equal(cached_dataset.get_codes(feature_name), codes)
+        assert len(list(dataset_cache.cache_dirpath.iterdir())) == 2
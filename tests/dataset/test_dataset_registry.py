@@ -0,0 +1,75 @@
+import shutil
+from functools import partial
+from pathlib import Path
+
+import pytest
+from surv.dataset.dataset import Dataset
+from surv.dataset.dataset_registry import DatasetRegistry
+
+DATA_DIRPATH = Path(__file__).parent.parent / "algo" / "data"
+
+
+def load_dataset(data_dirpath: Path, dataset_name: str) -> Dataset:
+    dataset_dirpath = data_dirpath / dataset_name
+    return Dataset.from_files(dataset_dirpath / "tabular.csv", dataset_dirpath / "features.json")
+
+
+class TestDatasetRegistry:
+    def test_dataset_registry_get(self, tmp_path: Path) -> None:
+        shutil.copytree(DATA_DIRPATH, tmp_path, dirs_exist_ok=True)
+        (tmp_path / "empty").mkdir()
+        registry = DatasetRegistry(tmp_path, partial(load_dataset, tmp_path))
+        assert registry.discover() == ["house", "latitude"]
+
+        dataset = registry.get("house")
+        assert registry.get("house") is dataset
+        assert registry.stats.misses == 1
+        assert registry.stats.hits == 1
+        assert registry.memory_bytes == DatasetRegistry.estimate_memory(dataset) > 0
+
+        for dataset_name in ["empty", "missing", "../house"]:
+            with pytest.raises(FileNotFoundError):
+                registry.get(dataset_name)
+
+    def test_dataset_registry_eviction(self, tmp_path: Path) -> None:
+        shutil.copytree(DATA_DIRPATH, tmp_path, dirs_exist_ok=True)
+        house_memory_bytes = DatasetRegistry.estimate_memory(load_dataset(tmp_path, "house"))
+        latitude_memory_bytes = DatasetRegistry.estimate_memory(load_dataset(tmp_path, "latitude"))
+        max_memory_bytes = house_memory_bytes + latitude_memory_bytes - 1
+        registry = DatasetRegistry(tmp_path, partial(load_dataset, tmp_path), max_memory_bytes=max_memory_bytes)
+
+        registry.get("house")
+        registry.get("latitude")
+        assert registry.loaded_dataset_names == ["latitude"]
+        assert registry.stats.evictions == 1
+
+        registry.get("house")
+        assert registry.loaded_dataset_names == ["house"]
+        assert registry.stats.misses == 3
+
+        registry.evict("house")
+        assert registry.loaded_dataset_names == []
+
+    def test_dataset_registry_reload(self, tmp_path: Path) -> None:
+        shutil.copytree(DATA_DIRPATH, tmp_path, dirs_exist_ok=True)
+        registry = DatasetRegistry(tmp_path, partial(load_dataset, tmp_path), reload_interval=0.0)
+        dataset = registry.get("house")
+        assert registry.get("house") is dataset
+
+        tabular_filepath = tmp_path / "house" / "tabular.csv"
+        lines = tabular_filepath.read_text().splitlines(keepends=True)
+        tabular_filepath.write_text("".join(lines[:-1]))
+        reloaded_dataset = registry.get("house")
+        assert reloaded_dataset is not dataset
+        assert reloaded_dataset.n_samples == dataset.n_samples - 1
+        assert registry.stats.reloads == 1
+
+        # A dataset that fails to load keeps being served from memory until it is fixed.
+        feature_info_filepath = tmp_path / "house" / "features.json"
+        feature_info_filepath.write_text("{")
+        assert registry.get("house") is reloaded_dataset
+        assert registry.stats.reloads == 1
+
+        shutil.copy(DATA_DIRPATH / "house" / "features.json", feature_info_filepath)
+        assert registry.get("house") is not reloaded_dataset
+        assert registry.stats.reloads == 2
@@ -0,0 +1,52 @@
+import pytest
+from pydantic import ValidationError
+from surv.dataset.feature import Feature
+from surv.dataset.feature_info import FeatureInfo
+from surv.dataset.feature_purpose import Grouping, Identifier
+
+
+def get_features() -> list[Feature]:
+    return [
+        Feature(name="id", type={"name": "text"}, purpose={"name": "identifier"}),
+        Feature(
+            name="color",
+            type={"name": "categorical", "categories": ["red", "blue"], "type": {"name": "multiclass"}},
+            purpose={"name": "training"},
+        ),
+        Feature(name="height", type={"name": "numeric", "type": {"name": "ratio"}}, purpose={"name": "training"}),
+        Feature(
+            name="count",
+            type={"name": "numeric", "type": {"name": "ratio"}},
+            purpose={"name": "evaluation", "type": {"name": "sample_weight"}},
+        ),
+        Feature(
+            name="size",
+            type={"name": "categorical", "categories": ["small", "big"], "type": {"name": "multiclass"}},
+            purpose={"name": "target"},
+        ),
+    ]
+
+
+class TestFeatureInfo:
+    def test_feature_info_indexes(self) -> None:
+        feature_info = FeatureInfo(features=get_features(), target_feature_name="size")
+        assert feature_info.get_feature("height").name == "height"
+        assert feature_info.has_feature("color")
+        assert not feature_info.has_feature("weight")
+        assert [feature.name for feature in feature_info.training_features] == ["color", "height"]
+        assert [feature.name for feature in feature_info.get_features(Identifier)] == ["id"]
+        assert feature_info.get_features(Grouping) == ()
+        assert feature_info.target_feature.name == "size"
+        assert feature_info.sample_weight_feature is not None
+        assert feature_info.sample_weight_feature.name == "count"
+        with pytest.raises(ValueError, match="not found"):
+            feature_info.get_feature("weight")
+
+    def test_feature_info_invalid(self) -> None:
+        features = get_features()
+        with pytest.raises(ValidationError, match="Duplicate feature name 'color'"):
+            FeatureInfo(features=[*features, features[1]], target_feature_name="size")
+        with pytest.raises(ValidationError, match="at most one sample weight feature"):
+            FeatureInfo(
+                features=[*features, features[3].model_copy(update={"name": "weight"})], target_feature_name="size"
+            )
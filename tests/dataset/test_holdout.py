@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+from surv.dataset.dataset import Dataset
+from surv.dataset.feature_info import FeatureInfo
+from surv.dataset.holdout import split_holdout
+
+
+def get_feature_info() -> FeatureInfo:
+    return FeatureInfo(
+        features=[
+            {
+                "name": "subject",
+                "type": {"name": "text"},
+                "purpose": {"name": "grouping", "type": {"name": "subject_wise"}},
+            },
+            {
+                "name": "site",
+                "type": {"name": "text"},
+                "purpose": {"name": "grouping", "type": {"name": "stratification"}},
+            },
+            {
+                "name": "size",
+                "type": {"name": "categorical", "categories": ["small", "big"], "type": {"name": "multiclass"}},
+                "purpose": {"name": "target"},
+            },
+        ],
+        target_feature_name="size",
+    )
+
+
+class TestHoldout:
+    def test_split_holdout_grouping(self) -> None:
+        subjects = np.repeat(np.arange(20), 3)
+        tabular = pd.DataFrame(
+            {
+                "subject": [f"s{subject}" for subject in subjects],
+                "site": ["a" if subject < 10 else "b" for subject in subjects],
+                "size": ["small"] * subjects.shape[0],
+            }
+        )
+        dataset = Dataset(tabular, get_feature_info())
+        training_rows, holdout_rows = split_holdout(dataset, 0.2, seed=3)
+
+        training_subjects = set(subjects[training_rows])
+        holdout_subjects = set(subjects[holdout_rows])
+        assert not training_subjects & holdout_subjects
+        assert len(holdout_subjects) == 4
+        assert sorted(tabular["site"].iloc[holdout_rows].value_counts().tolist()) == [6, 6]
@@ -0,0 +1,197 @@
+import asyncio
+import json
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from surv.algo.evaluator import Evaluator
+from surv.algo.result import Result
+from surv.algo.session import Session
+from surv.dataset.dataset import Dataset
+from surv.dataset.dataset_registry import DatasetRegistry
+from surv.service.http_server import LocalSurveyClient, SurveyHttpServer
+from surv.service.survey_service import SurveyService
+
+DATA_DIRPATH = Path(__file__).parent.parent / "algo" / "data"
+
+
+def load_dataset(dataset_name: str) -> Dataset:
+    dataset_dirpath = DATA_DIRPATH / dataset_name
+    return Dataset.from_files(dataset_dirpath / "tabular.csv", dataset_dirpath / "features.json")
+
+
+def create_dataset_loader() -> Callable[[str], Dataset]:
+    return DatasetRegistry(DATA_DIRPATH, load_dataset).get
+
+
+@dataclass
+class CountingEvaluator(Evaluator):
+    n_evaluations: int = field(default=0, repr=False)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def evaluate_session(self, session: Session) -> Result:
+        with self.lock:
+            self.n_evaluations += 1
+        return super().evaluate_session(session)
+
+
+async def run_survey(client: LocalSurveyClient, answers: dict[str, str]) -> dict:
+    response = await client.request("POST", "/sessions", {"dataset_name": "house"})
+    assert response.status == 201
+    state = response.body
+    while state["status"] == "question":
+        session_id = state["session_id"]
+        answer = answers[state["feature_name"]]
+        response = await client.request("POST", f"/sessions/{session_id}/answers", {"answer": answer})
+        assert response.status == 200
+        state = response.body
+    return state
+
+
+class TestSurveyService:
+    def test_survey_service_session(self) -> None:
+        async def run() -> None:
+            service = SurveyService(dataset_loader=create_dataset_loader())
+            client = LocalSurveyClient(service)
+            state = await run_survey(client, {"yard_size": "none", "garage": "yes", "moldy": "very"})
+            assert state == {
+                "session_id": state["session_id"],
+                "n_answers": 1,
+                "posterior": {"cheap": 1.0, "expensive": 0.0},
+                "status": "terminal",
+                "category": "cheap",
+            }
+
+            response = await client.request("GET", f"/sessions/{state['session_id']}/question")
+            assert response.body == state
+            response = await client.request("POST", f"/sessions/{state['session_id']}/answers", {"answer": "yes"})
+            assert response.status == 409
+            response = await client.request("DELETE", f"/sessions/{state['session_id']}")
+            assert response.status == 200
+            assert service.n_sessions == 0
+            service.close()
+
+        asyncio.run(run())
+
+    def test_survey_service_stopping_rule(self) -> None:
+        async def run() -> None:
+            service = SurveyService(dataset_loader=create_dataset_loader(), information_gain_threshold=10.0)
+            client = LocalSurveyClient(service)
+            state = (await client.request("POST", "/sessions", {"dataset_name": "house"})).body
+            assert state["status"] == "terminal"
+            assert state["category"] == max(state["posterior"], key=state["posterior"].__getitem__)
+            path = f"/sessions/{state['session_id']}/answers"
+            assert (await client.request("POST", path, {"answer": "none"})).status == 409
+            service.close()
+
+        asyncio.run(run())
+
+    def test_survey_service_posterior_copy(self) -> None:
+        async def run() -> None:
+            service = SurveyService(dataset_loader=create_dataset_loader())
+            state = await service.start_session("house")
+            posterior = dict(state["posterior"])
+            state["posterior"].clear()
+            assert (await service.start_session("house"))["posterior"] == posterior
+            assert service.cache_stats.hits == 1
+            service.close()
+
+        asyncio.run(run())
+
+    def test_survey_service_errors(self) -> None:
+        async def run() -> None:
+            service = SurveyService(dataset_loader=create_dataset_loader())
+            client = LocalSurveyClient(service)
+            assert (await client.request("POST", "/sessions", {"dataset_name": "missing"})).status == 404
+            assert (await client.request("POST", "/sessions", {"dataset_name": "../house"})).status == 400
+            assert (await client.request("GET", "/sessions/abc/question")).status == 404
+            assert (await client.request("GET", "/unknown")).status == 404
+
+            response = await client.request("POST", "/sessions", {"dataset_name": "house"})
+            session_id = response.body["session_id"]
+            response = await client.request("POST", f"/sessions/{session_id}/answers", {"answer": "huge"})
+            assert response.status == 400
+            assert (await client.request("POST", f"/sessions/{session_id}/answers", {})).status == 400
+            response = await client.request("POST", f"/sessions/{session_id}/answers", {"answer": ["small", 1]})
+            assert response.status == 400
+            response = await client.request("POST", f"/sessions/{session_id}/answers", {"answer": []})
+            assert response.status == 400
+            service.close()
+
+        asyncio.run(run())
+
+    def test_survey_service_skip_and_multiple_answers(self) -> None:
+        async def run() -> None:
+            service = SurveyService(dataset_loader=create_dataset_loader())
+            client = LocalSurveyClient(service)
+            response = await client.request("POST", "/sessions", {"dataset_name": "house"})
+            state = response.body
+            assert state["feature_name"] == "yard_size"
+
+            path = f"/sessions/{state['session_id']}/answers"
+            state = (await client.request("POST", path, {"answer": None})).body
+            assert state["status"] == "question"
+            assert state["n_answers"] == 1
+            assert state["feature_name"] != "yard_size"
+
+            response = await client.request("POST", path, {"answer": ["no", "slightly"]})
+            assert response.status == 200
+            assert response.body["n_answers"] == 2
+            service.close()
+
+        asyncio.run(run())
+
+    def test_survey_service_concurrent_sessions(self) -> None:
+        async def run() -> None:
+            evaluator = CountingEvaluator()
+            service = SurveyService(dataset_loader=create_dataset_loader(), evaluator=evaluator, n_workers=4)
+            client = LocalSurveyClient(service)
+            answers = [
+                {"yard_size": "none", "garage": "yes", "moldy": "very"},
+                {"yard_size": "small", "garage": "no", "moldy": "no"},
+                {"yard_size": "big", "garage": "yes", "moldy": "slightly"},
+            ]
+            states = await asyncio.gather(*[run_survey(client, answers[i % len(answers)]) for i in range(300)])
+            assert service.n_sessions == 300
+            assert evaluator.n_evaluations == 6
+            for i, state in enumerate(states):
+                assert {key: value for key, value in state.items() if key != "session_id"} == {
+                    key: value for key, value in states[i % len(answers)].items() if key != "session_id"
+                }
+            service.close()
+
+        asyncio.run(run())
+
+    def test_survey_http_server(self) -> None:
+        async def request(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, path: str, body: dict
+        ) -> dict:
+            content = json.dumps(body).encode()
+            writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(content)}\r\n\r\n".encode() + content)
+            await writer.drain()
+            headers = {}
+            status_line = await reader.readline()
+            while (line := await reader.readline()) != b"\r\n":
+                name, _, value = line.decode().partition(":")
+                headers[name.strip().lower()] = value.strip()
+            assert status_line.startswith(b"HTTP/1.1 2")
+            return json.loads(await reader.readexactly(int(headers["content-length"])))
+
+        async def run() -> None:
+            service = SurveyService(dataset_loader=create_dataset_loader())
+            server = SurveyHttpServer(service, port=0)
+            await server.start()
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            state = await request(reader, writer, "POST", "/sessions", {"dataset_name": "house"})
+            assert state["status"] == "question"
+            state = await request(
+                reader, writer, "POST", f"/sessions/{state['session_id']}/answers", {"answer": "none"}
+            )
+            assert state["status"] == "terminal"
+            writer.close()
+            await writer.wait_closed()
+            await server.stop()
+            service.close()
+
+        asyncio.run(run())
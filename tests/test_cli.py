@@ -0,0 +1,74 @@
+import asyncio
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+from surv.algo.compiler import Compiler
+from surv.algo.evaluator import Evaluator
+from surv.algo.simulator import Simulator
+from surv.algo.survey_tree import ContinueNode, TerminalNode
+from surv.cli import main
+from surv.service.http_server import LocalSurveyClient
+from surv.service.survey_service import SurveyService
+
+from tests.algo.conftest import load_evaluation_dataset
+from tests.service.test_survey_service import DATA_DIRPATH, create_dataset_loader, run_survey
+
+# Answers that leave two cheap houses and one expensive house, which no remaining question can tell apart.
+NO_GAIN_ANSWERS = {"yard_size": "small", "moldy": "no", "garage": "yes"}
+
+
+def set_up_data(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    shutil.copytree(DATA_DIRPATH / "house", tmp_path / "house", ignore=shutil.ignore_patterns(".cache"))
+    monkeypatch.setenv("SURV_DATA_DIRPATH", str(tmp_path))
+    monkeypatch.setenv("SURV_INFORMATION_GAIN_THRESHOLD", "0")
+    monkeypatch.setenv("SURV_USE_DATASET_CACHE", "false")
+
+
+class TestCli:
+    def test_run_no_gain_leaf(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        set_up_data(tmp_path, monkeypatch)
+        cli_input = "".join(f"{answer}\n" for answer in [*NO_GAIN_ANSWERS.values(), "cheap"])
+        result = CliRunner().invoke(main, ["run", "house"], input=cli_input)
+        assert result.exit_code == 0, result.output
+        assert "most likely your category is cheap (67%)" in result.output
+
+    def test_run_interrupted(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        set_up_data(tmp_path, monkeypatch)
+        closed_evaluators: list[Evaluator] = []
+
+        def close(evaluator: Evaluator) -> None:
+            closed_evaluators.append(evaluator)
+
+        monkeypatch.setattr(Evaluator, "close", close)
+        # The input ends before the survey does, which click reports as an abort.
+        result = CliRunner().invoke(main, ["run", "house"], input="small\n")
+        assert result.exit_code == 1
+        assert len(closed_evaluators) == 1
+
+    def test_runners_agree_on_no_gain_leaf(self) -> None:
+        dataset = load_evaluation_dataset("house").dataset
+        target_categories = dataset.get_categories(dataset.feature_info.target_feature_name)
+
+        # Respondent C answers like the no gain leaf.
+        predictions, n_questions, _ = Simulator().predict(dataset, dataset.take(np.array([2])))
+        assert target_categories[predictions[0]] == "cheap"
+        assert n_questions[0] == len(NO_GAIN_ANSWERS)
+
+        node = Compiler().compile(dataset).root
+        while isinstance(node, ContinueNode):
+            node = node.next(NO_GAIN_ANSWERS[node.question.feature_name])
+        assert node == TerminalNode(category="cheap")
+
+        async def run() -> dict:
+            service = SurveyService(dataset_loader=create_dataset_loader())
+            state = await run_survey(LocalSurveyClient(service), NO_GAIN_ANSWERS)
+            service.close()
+            return state
+
+        state = asyncio.run(run())
+        assert state["status"] == "terminal"
+        assert state["category"] == "cheap"
+        assert state["n_answers"] == len(NO_GAIN_ANSWERS)